@@ -0,0 +1,140 @@
+"""
+Event loop lag during bulk uploads.
+
+Starts a local aiohttp server posing as the files endpoint, then uploads `--files` local files of `--size` bytes,
+`--concurrency` at a time, while a ticker measures how late the event loop wakes it up. Two modes are compared:
+
+    pool:    User.create_file, local files are read in chunks in User.io_executor
+    aiohttp: the file object itself is the form field (the previous User.create_file), aiohttp reads it in the
+             loop's default executor
+
+Usage:
+    python benchmarks/upload_loop_lag.py --files 200 --size 4000000 --concurrency 20
+"""
+
+# Standard library imports
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Related third party imports
+
+from aiohttp import BodyPartReader, web
+
+# Local application/library specific imports
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pyaww import User  # noqa: E402
+
+USERNAME = "bench"
+TICK = 0.005
+
+
+async def _start_server() -> tuple[web.AppRunner, str]:
+    async def upload(request: web.Request) -> web.Response:
+        reader = await request.multipart()
+
+        async for part in reader:
+            assert isinstance(part, BodyPartReader)
+
+            while await part.read_chunk():
+                pass
+
+        return web.json_response({"status": "OK"}, status=201)
+
+    app = web.Application(client_max_size=1 << 34)
+    app.router.add_post(f"/api/v0/user/{USERNAME}/files/path/{{path:.*}}", upload)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def _ticker(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def _run(mode: str, paths: list[str], concurrency: int) -> dict[str, float]:
+    runner, url = await _start_server()
+    user = User(USERNAME, "x" * 40)
+    user.request_url = url
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload(path: str) -> None:
+        async with semaphore:
+            with open(path, "rb") as f:
+                if mode == "pool":
+                    await user.create_file(
+                        f"/home/{USERNAME}/{os.path.basename(path)}", f
+                    )
+                else:
+                    await user.request(
+                        "POST",
+                        f"/api/v0/user/{USERNAME}/files/path/home/{USERNAME}/x",
+                        return_json=True,
+                        data={"content": f},
+                    )
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    started = time.perf_counter()
+
+    try:
+        await asyncio.gather(*(upload(path) for path in paths))
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await ticker
+        await user.session.close()
+        await runner.cleanup()
+
+    lags.sort()
+    return {
+        "seconds": elapsed,
+        "lag_p50_ms": statistics.median(lags) * 1000,
+        "lag_p99_ms": lags[int(len(lags) * 0.99) - 1] * 1000,
+        "lag_max_ms": lags[-1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[1])
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--size", type=int, default=4_000_000, help="bytes per file")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mode", choices=["pool", "aiohttp", "both"], default="both")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+
+        for index in range(args.files):
+            paths.append(os.path.join(directory, f"file{index}.bin"))
+
+            with open(paths[-1], "wb") as f:
+                f.write(os.urandom(args.size))
+
+        for mode in ["pool", "aiohttp"] if args.mode == "both" else [args.mode]:
+            result = asyncio.run(_run(mode, paths, args.concurrency))
+            print(
+                f"{mode:>7}: {result['seconds']:.2f}s, loop lag p50 {result['lag_p50_ms']:.1f}ms "
+                f"p99 {result['lag_p99_ms']:.1f}ms max {result['lag_max_ms']:.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,98 @@
-from pyaww.user import (
-    AlwaysOnTask,
-    Console,
-    File,
-    SchedTask,
-    User,
-    WebApp,
-    Cache,
-)
-
-from .static_file import StaticFile
-from .static_header import StaticHeader
-
-from .errors import *
+"""
+Attributes of the package are imported lazily (PEP 562), `import pyaww` alone does not import aiohttp. The submodule
+defining an attribute is imported on first access.
+"""
+
+# Standard library imports
+
+import importlib
+
+from typing import TYPE_CHECKING, Any
+
 from .types import *
 
 __version__ = "1.0.0"
+
+_LAZY_ATTRIBUTES = {
+    "User": ".user",
+    "Console": ".console",
+    "CommandResult": ".console",
+    "File": ".file",
+    "SchedTask": ".sched_task",
+    "AlwaysOnTask": ".always_on_task",
+    "WebApp": ".webapp",
+    "SyncUser": ".sync",
+    "StaticFile": ".static_file",
+    "StaticHeader": ".static_header",
+    "Watcher": ".watch",
+    "WatchEvent": ".watch",
+    "Cache": ".utils.cache",
+    "TTLCache": ".utils.cache",
+    "ThreadSafeCache": ".utils.cache",
+    "RequestMetrics": ".utils.metrics",
+    "RequestRecord": ".utils.metrics",
+    "RequestHook": ".utils.hooks",
+    "RequestContext": ".utils.hooks",
+    "OpenTelemetryHook": ".utils.tracing",
+    "CircuitBreaker": ".utils.breaker",
+    "CircuitBreakers": ".utils.breaker",
+    "PriorityScheduler": ".utils.scheduler",
+    "HedgingPolicy": ".utils.hedging",
+    "IdentityMap": ".utils.identity",
+    "UnitOfWork": ".utils.tracking",
+    "FileContentCache": ".utils.content_cache",
+    "StaticTree": ".utils.static_planner",
+    "StaticPlan": ".utils.static_planner",
+    "PythonAnywhereError": ".errors",
+    "InvalidInfo": ".errors",
+    "NotFound": ".errors",
+    "ConsoleLimit": ".errors",
+    "RequestTimeout": ".errors",
+    "CircuitOpen": ".errors",
+    "ERRORS_DICT": ".errors",
+    "STATUS_ERRORS": ".errors",
+    "build_error": ".errors",
+    "raise_error": ".errors",
+}
+
+__all__ = [*_LAZY_ATTRIBUTES, "__version__"]
+
+if TYPE_CHECKING:
+    from .user import User
+    from .console import Console, CommandResult
+    from .file import File
+    from .sched_task import SchedTask
+    from .always_on_task import AlwaysOnTask
+    from .webapp import WebApp
+    from .sync import SyncUser
+    from .static_file import StaticFile
+    from .static_header import StaticHeader
+    from .watch import Watcher, WatchEvent
+    from .utils.cache import Cache, TTLCache, ThreadSafeCache
+    from .utils.metrics import RequestMetrics, RequestRecord
+    from .utils.hooks import RequestHook, RequestContext
+    from .utils.tracing import OpenTelemetryHook
+    from .utils.breaker import CircuitBreaker, CircuitBreakers
+    from .utils.scheduler import PriorityScheduler
+    from .utils.hedging import HedgingPolicy
+    from .utils.identity import IdentityMap
+    from .utils.tracking import UnitOfWork
+    from .utils.content_cache import FileContentCache
+    from .utils.static_planner import StaticTree, StaticPlan
+    from .errors import *
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
@@ -4,11 +4,13 @@ from typing import TYPE_CHECKING, Optional, Any
 
 # Local application/library specific imports
 
+from .utils.tracking import Tracked
+
 if TYPE_CHECKING:
     from .user import User
 
 
-class AlwaysOnTask:
+class AlwaysOnTask(Tracked):
     """
     Implements AlwaysOnTask endpoints.
 
@@ -20,9 +22,12 @@ class AlwaysOnTask:
     description: str
     ...
 
+    _tracked_fields = ("command", "description", "enabled")
+
     def __init__(self, resp: dict, user: "User") -> None:
         vars(self).update(resp)
         self._user = user
+        self._mark_clean()
 
     async def restart(self) -> None:
         """Restart an always_on task."""
@@ -31,6 +36,7 @@ class AlwaysOnTask:
     async def delete(self) -> None:
         """Delete the task."""
         await self._user.request("DELETE", self.url)
+        await self._user.cache.pop("always_on_task", id_=self.id)
 
     async def update(
         self,
@@ -42,7 +48,8 @@ class AlwaysOnTask:
         enabled: Optional[bool] = None,
     ) -> None:
         """
-        Updates the task. All times are in UTC.
+        Updates the task. All times are in UTC. Only fields that differ from the server's are sent, within
+        User.unit_of_work the fields are sent when the block exits.
 
         Examples:
             >>> user = User(...)
@@ -64,8 +71,15 @@ class AlwaysOnTask:
         if enabled is not None:
             data["enabled"] = enabled
 
+        await self._update(data)
+
+    async def _patch(self, data: dict[str, Any]) -> None:
         await self._user.request("PATCH", self.url, data=data)
         vars(self).update(data)
+        self._mark_clean(*data)
+
+        await self._user.cache.set("always_on_task", object_=self)
+        await self._user.cache.invalidate("always_on_task")
 
     def __str__(self):
         return self.url
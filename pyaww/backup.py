@@ -0,0 +1,222 @@
+# Standard library imports
+
+import asyncio
+import datetime
+
+from typing import TYPE_CHECKING, Any, Awaitable
+
+# Local application/library specific imports
+
+from .utils.cache import _record
+
+if TYPE_CHECKING:
+    from .user import User
+    from .webapp import WebApp
+
+__all__ = ("EXPORT_VERSION", "RESTORE_KINDS", "export_account", "restore_account")
+
+EXPORT_VERSION = 1
+
+RESTORE_KINDS = (
+    "settings",
+    "webapps",
+    "static_files",
+    "static_headers",
+    "sched_tasks",
+    "always_on_tasks",
+)
+
+_WEBAPP_SETTINGS = (
+    "source_directory",
+    "virtualenv_path",
+    "force_https",
+    "password_protection_enabled",
+    "password_protection_username",
+    "password_protection_password",
+)
+
+
+def _python_version(version: str) -> str:
+    """Exported webapps carry their python version as "3.9", creating one takes "python39"."""
+    if version.startswith("python"):
+        return version
+
+    return "python" + version.replace(".", "")
+
+
+def _domain(user: "User") -> str:
+    """Default domain of the webapp of an account."""
+    return f"{user.username}.{'eu.' if user.from_eu else ''}pythonanywhere.com"
+
+
+async def _export_webapp(webapp: "WebApp") -> dict[str, Any]:
+    static_files, static_headers, ssl = await asyncio.gather(
+        webapp.static_files(), webapp.static_headers(), webapp.get_ssl_info()
+    )
+
+    return {
+        **_record(webapp),
+        "static_files": [_record(static_file) for static_file in static_files],
+        "static_headers": static_headers,
+        "ssl": ssl,
+    }
+
+
+async def export_account(user: "User") -> dict[str, Any]:
+    """Gather the configuration of an account into a JSON serializable document, see User.export."""
+    webapps, sched_tasks, always_on_tasks, python_versions, system_image = (
+        await asyncio.gather(
+            user.webapps(),
+            user._fetch_sched_tasks(),
+            user._fetch_always_on_tasks(),
+            user.python_versions(),
+            user.get_system_image(),
+        )
+    )
+
+    return {
+        "version": EXPORT_VERSION,
+        "exported": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "username": user.username,
+        "domain": _domain(user),
+        "system_image": system_image.get("system_image"),
+        "python_versions": {
+            key: value
+            for versions in python_versions
+            for key, value in versions.items()
+        },
+        "webapps": list(await asyncio.gather(*map(_export_webapp, webapps))),
+        "sched_tasks": [_record(task) for task in sched_tasks],
+        "always_on_tasks": [_record(task) for task in always_on_tasks],
+    }
+
+
+async def restore_account(
+    user: "User", document: dict[str, Any]
+) -> dict[str, dict[str, Any]]:
+    """Recreate the configuration of an exported document on an account, see User.restore."""
+    if document.get("version") != EXPORT_VERSION:
+        raise ValueError(
+            f"Unsupported export version {document.get('version')!r}, "
+            f"expected {EXPORT_VERSION}."
+        )
+
+    old_home, new_home = f"/home/{document['username']}/", f"/home/{user.username}/"
+    report: dict[str, dict[str, Any]] = {
+        kind: {"created": 0, "failed": []} for kind in RESTORE_KINDS
+    }
+
+    def rebase(value: Any) -> Any:
+        """Point paths of the exported account to the home directory of this one."""
+        return value.replace(old_home, new_home) if isinstance(value, str) else value
+
+    async def create(creations: list[tuple[str, str, Awaitable]]) -> None:
+        """Run (kind, name, creation) concurrently and report them, a failure does not stop or hide the others."""
+        results = await asyncio.gather(
+            *(creation for _, _, creation in creations), return_exceptions=True
+        )
+
+        for (kind, name, _), result in zip(creations, results):
+            if isinstance(result, BaseException):
+                report[kind]["failed"].append((name, result))
+            else:
+                report[kind]["created"] += 1
+
+    async def restore_webapp(exported: dict[str, Any]) -> None:
+        domain_name = exported["domain_name"]
+
+        if domain_name == document["domain"]:
+            domain_name = _domain(user)
+
+        settings = {
+            key: rebase(exported[key])
+            for key in _WEBAPP_SETTINGS
+            if exported.get(key) is not None
+        }
+        mappings = [
+            ("static_files", mapping["url"], mapping)
+            for mapping in exported["static_files"]
+        ] + [
+            ("static_headers", f"{header['url']} {header['name']}", header)
+            for header in exported["static_headers"]
+        ]
+
+        try:
+            webapp = await user.create_webapp(
+                domain_name, _python_version(exported["python_version"])
+            )
+
+            if settings:
+                await webapp.update(**settings)
+        except BaseException as e:  # its mappings cannot be restored either
+            for kind, name, _ in mappings:
+                report[kind]["failed"].append((name, e))
+            raise
+
+        # mappings depend on the webapp, the single reload on all of them
+        await create(
+            [
+                (
+                    kind,
+                    name,
+                    (
+                        webapp.create_static_file(
+                            rebase(mapping["path"]), mapping["url"]
+                        )
+                        if kind == "static_files"
+                        else webapp.create_static_header(
+                            mapping["url"], mapping["name"], mapping["value"]
+                        )
+                    ),
+                )
+                for kind, name, mapping in mappings
+            ]
+        )
+        await webapp.restart()
+
+    # the python versions available to everything else depend on the system image
+    if document["system_image"]:
+        system_image = user.set_system_image(document["system_image"])
+        await create([("settings", "system_image", system_image)])
+
+    creations: list[tuple[str, str, Awaitable]] = []
+
+    for key, version in document["python_versions"].items():
+        command = key[len("default_") : -len("_version")]
+        creations.append(("settings", key, user.set_python_version(version, command)))
+
+    for task in document["sched_tasks"]:
+        command = rebase(task["command"])
+        creations.append(
+            (
+                "sched_tasks",
+                command,
+                user.create_sched_task(
+                    command,
+                    task["minute"],
+                    task["hour"],
+                    task["interval"],
+                    task["enabled"],
+                    task.get("description") or "",
+                ),
+            )
+        )
+
+    for task in document["always_on_tasks"]:
+        command = rebase(task["command"])
+        creations.append(
+            (
+                "always_on_tasks",
+                command,
+                user.create_always_on_task(
+                    command, task.get("description") or "", task["enabled"]
+                ),
+            )
+        )
+
+    for exported in document["webapps"]:
+        creations.append(("webapps", exported["domain_name"], restore_webapp(exported)))
+
+    await create(creations)
+
+    return report
@@ -0,0 +1,258 @@
+"""
+Command line interface of the API wrapper, run as `pyaww` or `python -m pyaww`.
+
+Credentials are read from the PYAWW_USERNAME and PYAWW_TOKEN environment variables (PYAWW_EU=1 for European
+accounts). List results are kept in a snapshot file for --max-age seconds, so repeated invocations (cron jobs...) start
+without a request. Only what a subcommand needs is imported, a snapshot hit does not import aiohttp at all.
+"""
+
+# Standard library imports
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+# Local application/library specific imports
+
+from .utils.cache import _record
+
+if TYPE_CHECKING:
+    from .user import User
+
+SNAPSHOT_VERSION = 1
+
+
+def _snapshot_path(username: str, from_eu: bool) -> str:
+    """Snapshot file of an account, in $PYAWW_CACHE_DIR or the user cache directory."""
+    directory = os.environ.get("PYAWW_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pyaww"
+    )
+
+    return os.path.join(directory, f"{username}{'-eu' if from_eu else ''}.json")
+
+
+class Snapshot:
+    """List results of previous invocations, keyed by subcommand, stored as JSON."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        self.entries: dict[str, dict[str, Any]] = (
+            data.get("entries", {}) if data.get("version") == SNAPSHOT_VERSION else {}
+        )
+
+    def get(self, key: str, max_age: float) -> Optional[Any]:
+        """Records stored under key, None if there are none younger than max_age seconds."""
+        entry = self.entries.get(key)
+
+        if entry is None or time.time() - entry["time"] > max_age:
+            return None
+
+        return entry["records"]
+
+    def set(self, key: str, records: Any) -> None:
+        self.entries[key] = {"time": time.time(), "records": records}
+
+    def save(self) -> None:
+        """Write the snapshot, atomically so concurrent invocations never read half of it."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "entries": self.entries}, f)
+
+        os.replace(temporary, self.path)
+
+
+def _run(args: argparse.Namespace, func: Callable[["User"], Awaitable[Any]]) -> Any:
+    """Run func with a pyaww.User for the credentials, the session is closed afterwards."""
+    import asyncio
+
+    from .user import User
+
+    async def runner() -> Any:
+        async with User(args.username, args.token, from_eu=args.eu) as user:
+            return await func(user)
+
+    return asyncio.run(runner())
+
+
+def _listing(
+    args: argparse.Namespace, key: str, fetch: Callable[["User"], Awaitable[Any]]
+) -> Any:
+    """Records of a list subcommand, from the snapshot if they are recent enough."""
+    snapshot = Snapshot(_snapshot_path(args.username, args.eu))
+    records = None if args.refresh else snapshot.get(key, args.max_age)
+
+    if records is None:
+        records = _run(args, fetch)
+        snapshot.set(key, records)
+        snapshot.save()
+
+    return records
+
+
+def _print(args: argparse.Namespace, records: Any, *rows: list[Any]) -> None:
+    if args.json:
+        print(json.dumps(records, indent=2))
+        return
+
+    for row in rows:
+        print("\t".join(str(column) for column in row))
+
+
+def consoles(args: argparse.Namespace) -> int:
+    async def fetch(user: "User") -> list[dict[str, Any]]:
+        return [_record(console) for console in await user.consoles()]
+
+    records = _listing(args, "consoles", fetch)
+    _print(
+        args,
+        records,
+        *(
+            [console["id"], console["name"], console["executable"]]
+            for console in records
+        ),
+    )
+
+    return 0
+
+
+def tasks(args: argparse.Namespace) -> int:
+    async def fetch(user: "User") -> dict[str, list[dict[str, Any]]]:
+        import asyncio
+
+        scheduled, always_on = await asyncio.gather(
+            user.scheduled_tasks(), user.always_on_tasks()
+        )
+
+        return {
+            "scheduled": [_record(task) for task in scheduled],
+            "always_on": [_record(task) for task in always_on],
+        }
+
+    records = _listing(args, "tasks", fetch)
+    _print(
+        args,
+        records,
+        *(
+            ["scheduled", task["id"], task.get("printable_time", ""), task["command"]]
+            for task in records["scheduled"]
+        ),
+        *(
+            ["always_on", task["id"], task.get("enabled", ""), task["command"]]
+            for task in records["always_on"]
+        ),
+    )
+
+    return 0
+
+
+def webapps(args: argparse.Namespace) -> int:
+    async def fetch(user: "User") -> list[dict[str, Any]]:
+        return [_record(webapp) for webapp in await user.webapps()]
+
+    records = _listing(args, "webapps", fetch)
+    _print(
+        args,
+        records,
+        *([webapp["domain_name"], webapp["python_version"]] for webapp in records),
+    )
+
+    return 0
+
+
+def upload(args: argparse.Namespace) -> int:
+    async def send(user: "User") -> None:
+        with open(args.local, "rb") as f:
+            await user.create_file(args.remote, f)  # type: ignore
+
+    _run(args, send)
+
+    return 0
+
+
+def reload(args: argparse.Namespace) -> int:
+    async def send(user: "User") -> None:
+        from .webapp import WebApp
+
+        # restarting only needs the domain name, no need to request the webapp first
+        await WebApp(
+            {"user": args.username, "domain_name": args.domain_name}, user
+        ).restart()
+
+    _run(args, send)
+
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pyaww",
+        description="PythonAnywhere from the command line. Credentials are read from PYAWW_USERNAME and "
+        "PYAWW_TOKEN (set PYAWW_EU=1 for European accounts).",
+    )
+    parser.add_argument("--json", action="store_true", help="print the records as JSON")
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=30.0,
+        help="seconds a snapshotted list stays usable (default: 30)",
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="ignore the snapshot, always request"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("consoles", help="list personal consoles").set_defaults(
+        func=consoles
+    )
+    subparsers.add_parser(
+        "tasks", help="list scheduled and always_on tasks"
+    ).set_defaults(func=tasks)
+    subparsers.add_parser("webapps", help="list webapps").set_defaults(func=webapps)
+
+    upload_parser = subparsers.add_parser("upload", help="upload a local file")
+    upload_parser.add_argument("local", help="path of the local file")
+    upload_parser.add_argument("remote", help="path to upload it to")
+    upload_parser.set_defaults(func=upload)
+
+    reload_parser = subparsers.add_parser("reload", help="reload a webapp")
+    reload_parser.add_argument("domain_name", help="domain name of the webapp")
+    reload_parser.set_defaults(func=reload)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point of the command line interface, returns the exit code."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    args.username = os.environ.get("PYAWW_USERNAME")
+    args.token = os.environ.get("PYAWW_TOKEN")
+    args.eu = os.environ.get("PYAWW_EU", "") not in ("", "0")
+
+    if not args.username or not args.token:
+        parser.error("PYAWW_USERNAME and PYAWW_TOKEN must be set")
+
+    try:
+        return args.func(args)
+    except Exception as e:
+        from .errors import PythonAnywhereError
+
+        if not isinstance(e, (PythonAnywhereError, OSError)):
+            raise
+
+        print(f"pyaww: error: {e}", file=sys.stderr)
+        return 1
@@ -1,13 +1,31 @@
 # Standard library imports
 
-from typing import TYPE_CHECKING, Any
+import asyncio
+import re
+import time
+import uuid
+
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple, Optional
 
 # Local application/library specific imports
 
+from .errors import RequestTimeout
+
 if TYPE_CHECKING:
     from .user import User
 
 
+class CommandResult(NamedTuple):
+    """
+    Outcome of a command ran with Console.run. PythonAnywhere only keeps the latest output of a console, output and
+    exit_code are None when the end of the command scrolled out of it (its output may lack its beginning otherwise).
+    """
+
+    command: str
+    output: Optional[str]
+    exit_code: Optional[int]
+
+
 class Console:
     """
     Implements Console endpoints.
@@ -48,11 +66,138 @@ class Console:
             "POST",
             "/api/v0" + self.console_url + f"send_input/",
             data={"input": inp + end},
+            priority="interactive",
         )
         outs = await self.outputs()
 
         return outs.split("\r")[-2].strip()
 
+    async def run(self, command: str, timeout: float = 60.0) -> CommandResult:
+        """
+        Run a shell command and wait for it to finish. Console must be a started bash console.
+
+        The command is wrapped between two echoed markers, the latter carrying its exit status, and the console output
+        is polled (with growing intervals) until the end marker appears.
+
+        Args:
+            command (str): single line command, it must not read from the standard input
+            timeout (float): seconds to wait for the command to finish
+
+        Examples:
+            >>> user = User(...)
+            >>> console = await user.get_console_by_id(...)
+            >>> result = await console.run("ls ~/mysite")
+            >>> result.exit_code, result.output.splitlines()
+
+        Returns:
+            CommandResult: the command, its output (standard output and error) and its exit code
+
+        Raises:
+            RequestTimeout: if the command did not finish within timeout
+        """
+        return (await self.run_many([command], timeout))[0]
+
+    async def run_many(
+        self, commands: Iterable[str], timeout: float = 60.0
+    ) -> list[CommandResult]:
+        """
+        Run shell commands one after another, sent as a single input. Waiting for them takes a few requests, not two
+        per command. A failing command does not stop the following ones.
+
+        Args:
+            commands (Iterable[str]): single line commands, see Console.run
+            timeout (float): seconds to wait for all of them to finish
+
+        Examples:
+            >>> user = User(...)
+            >>> console = await user.get_console_by_id(...)
+            >>> for result in await console.run_many(["mkdir -p ~/logs", "ls ~/logs"]):
+            >>>     print(result.command, result.exit_code)
+
+        Returns:
+            list[CommandResult]: results in the order of commands
+
+        Raises:
+            RequestTimeout: if the commands did not finish within timeout
+        """
+        commands = list(commands)
+        token = uuid.uuid4().hex
+
+        if not commands:
+            return []
+
+        # the markers are split by quotes, the terminal echo of the input does not match them
+        lines = [
+            f'echo "pyaww-start""-{token}-{i}"; {command}; echo "pyaww-end""-{token}-{i} $?"'
+            for i, command in enumerate(commands)
+        ]
+
+        await self._user.request(
+            "POST",
+            "/api/v0" + self.console_url + "send_input/",
+            data={"input": "\n".join(lines) + "\n"},
+            priority="interactive",
+        )
+
+        outs = await self._wait_for(
+            rf"pyaww-end-{token}-{len(commands) - 1} \d+", timeout
+        )
+        outs = outs.replace("\r\n", "\n")
+        results = []
+        position = (
+            0  # end of the previous end marker, or of the dropped part of the output
+        )
+
+        for i, command in enumerate(commands):
+            end = re.compile(rf"pyaww-end-{token}-{i} (\d+)").search(outs, position)
+
+            if end is None:  # scrolled out of the output PythonAnywhere keeps
+                results.append(CommandResult(command, None, None))
+                continue
+
+            start_marker = f"pyaww-start-{token}-{i}\n"
+            start = outs.find(start_marker, position, end.start())
+
+            if start != -1:
+                begin = start + len(start_marker)
+            else:  # the output starts within this command, maybe within its start marker
+                begin = position + next(
+                    (
+                        size
+                        for size in range(len(start_marker) - 1, 0, -1)
+                        if outs.startswith(start_marker[-size:], position)
+                    ),
+                    0,
+                )
+
+            results.append(
+                CommandResult(
+                    command, outs[begin : end.start()].rstrip("\n"), int(end.group(1))
+                )
+            )
+            position = end.end()
+
+        return results
+
+    async def _wait_for(self, pattern: str, timeout: float) -> str:
+        """Poll the output, with growing intervals, until pattern matches it. Returns the output."""
+        expires = time.monotonic() + timeout
+        interval = 0.25
+
+        while True:
+            outs = await self.outputs()
+
+            if re.search(pattern, outs):
+                return outs
+
+            if time.monotonic() >= expires:
+                raise RequestTimeout(
+                    f"Console {self.id} did not print {pattern!r} within {timeout} seconds."
+                )
+
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 2.0)
+
     async def delete(self) -> None:
         """Delete the console."""
         await self._user.request("DELETE", "/api/v0" + self.console_url)
@@ -62,7 +207,10 @@ class Console:
     async def outputs(self) -> str:
         """Return all outputs in the console."""
         resp = await self._user.request(
-            "GET", "/api/v0" + self.console_url + "get_latest_output/", return_json=True
+            "GET",
+            "/api/v0" + self.console_url + "get_latest_output/",
+            return_json=True,
+            priority="interactive",
         )
 
         return resp["output"]
@@ -1,17 +1,55 @@
 # Standard library imports
 
-from typing import NoReturn
+import asyncio
+import datetime
+import email.utils
+
+from typing import NoReturn, Optional, Union
+
+__all__ = (
+    "PythonAnywhereError",
+    "InvalidInfo",
+    "NotFound",
+    "ConsoleLimit",
+    "RequestTimeout",
+    "CircuitOpen",
+    "ERRORS_DICT",
+    "STATUS_ERRORS",
+    "build_error",
+    "raise_error",
+)
 
 
 class PythonAnywhereError(Exception):
-    """A base exception, nothing special to it, used everywhere."""
+    """
+    A base exception, used everywhere. Besides the message, it carries the context of the failed request (when there
+    was one): status code, route template, method, Retry-After (in seconds) and request id.
+    """
+
+    def __init__(
+        self,
+        message: str = "",
+        *,
+        status: Optional[int] = None,
+        route: Optional[str] = None,
+        method: Optional[str] = None,
+        retry_after: Optional[float] = None,
+        request_id: Optional[str] = None,
+    ) -> None:
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.route = route
+        self.method = method
+        self.retry_after = retry_after
+        self.request_id = request_id
 
 
 class InvalidInfo(PythonAnywhereError):
     """Exception for handling invalid tokens."""
 
-    def __init__(self, message: str, code: int) -> None:
-        super().__init__(message)
+    def __init__(self, message: str, code: Optional[int] = None, **context) -> None:
+        super().__init__(message, status=code, **context)
         self.code = code
 
 
@@ -23,25 +61,108 @@ class ConsoleLimit(InvalidInfo):
     """Exception for handling 429's raised by having more then 2 consoles on a free plan"""
 
 
-ERRORS_DICT: dict[tuple[int, str], PythonAnywhereError] = {
-    (401, "Invalid token."): InvalidInfo(
+class RequestTimeout(PythonAnywhereError, asyncio.TimeoutError):
+    """Exception for requests that ran out of time, either their own timeout or an enclosing User.deadline."""
+
+
+class CircuitOpen(PythonAnywhereError):
+    """Exception for requests refused without being sent because the circuit breaker of their route is open."""
+
+
+# Known (status code, API message) pairs and the exception class + message they are raised as
+ERRORS_DICT: dict[tuple[int, str], tuple[type[InvalidInfo], str]] = {
+    (401, "Invalid token."): (
+        InvalidInfo,
         "Bad token provided, please check it at https://www.pythonanywhere.com/account/#api_token",
-        401,
     ),
-    (404, "Not found."): NotFound("Not found.", 404),
-    (429, "Console limit reached."): ConsoleLimit("Console limit reached.", 429),
+    (404, "Not found."): (NotFound, "Not found."),
+    (429, "Console limit reached."): (ConsoleLimit, "Console limit reached."),
+}
+
+# Fallback for messages that are not in ERRORS_DICT
+STATUS_ERRORS: dict[int, type[InvalidInfo]] = {
+    401: InvalidInfo,
+    404: NotFound,
 }
 
 
-def raise_error(data: tuple[int, str]) -> NoReturn:
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
     """
-    Raise an appropriate error based on the response
+    Parse a Retry-After header, which is either an amount of seconds or an HTTP date.
 
     Args:
-        data (tuple[Any]): data for the error
+        value (Optional[str]): header value
+
+    Returns:
+        Optional[float]: seconds to wait, None if the header is missing or malformed
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(
+        (date - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0
+    )
+
+
+def build_error(
+    data: tuple[int, str],
+    *,
+    route: Optional[str] = None,
+    method: Optional[str] = None,
+    retry_after: Optional[Union[str, float]] = None,
+    request_id: Optional[str] = None,
+) -> PythonAnywhereError:
     """
+    Build a new exception instance appropriate for the response.
+
+    Args:
+        data (tuple[int, str]): status code and message of the response
+        route (Optional[str]): route template of the request
+        method (Optional[str]): method of the request
+        retry_after (Optional[Union[str, float]]): Retry-After header (or already parsed seconds)
+        request_id (Optional[str]): request id reported by the server
+
+    Returns:
+        PythonAnywhereError: exception to be raised
+    """
+    status, message = data
+
+    if isinstance(retry_after, str):
+        retry_after = parse_retry_after(retry_after)
+
+    context = {
+        "route": route,
+        "method": method,
+        "retry_after": retry_after,
+        "request_id": request_id,
+    }
 
     if data in ERRORS_DICT:
-        raise ERRORS_DICT[data]
+        error_class, message = ERRORS_DICT[data]
+        return error_class(message, status, **context)
+
+    if status in STATUS_ERRORS:
+        return STATUS_ERRORS[status](message, status, **context)
+
+    return PythonAnywhereError(message, status=status, **context)
 
-    raise PythonAnywhereError(data[1])
+
+def raise_error(data: tuple[int, str], **context) -> NoReturn:
+    """
+    Raise an appropriate error based on the response. A new exception instance is created every time.
+
+    Args:
+        data (tuple[Any]): data for the error
+        **context: request context, see build_error
+    """
+    raise build_error(data, **context)
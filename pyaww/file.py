@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, TextIO
 
 # Local application/library specific imports
 
-from .errors import PythonAnywhereError
+from .errors import PythonAnywhereError, NotFound
 
 if TYPE_CHECKING:
     from .user import User
@@ -34,6 +34,8 @@ class File:
             return_json=True,
             data={"path": self.path},
         )
+        await self._user.cache.set_sharing(self.path, True)
+
         return resp["url"]
 
     async def unshare(self) -> None:
@@ -43,32 +45,63 @@ class File:
             f"/api/v0/user/{self._user.username}/files/sharing/?path={self.path}",
             return_json=True,
         )
+        await self._user.cache.set_sharing(self.path, False)
 
     async def is_shared(self) -> bool:
-        """Function to check sharing status of the file."""
+        """Function to check sharing status of the file. The status is cached for a few seconds, see Cache.sharing."""
+        shared = await self._user.cache.sharing(self.path)
+
+        if shared is not None:
+            return shared
+
         try:
             await self._user.request(
                 "GET",
                 f"/api/v0/user/{self._user.username}/files/sharing/?path={self.path}",
                 return_json=True,
             )
-            return True
+            shared = True
+        except NotFound:
+            shared = False
         except PythonAnywhereError:
             return False
 
+        await self._user.cache.set_sharing(self.path, shared)
+
+        return shared
+
     async def delete(self) -> None:
         """Delete the file."""
         await self._user.request(
             "DELETE", f"/api/v0/user/{self._user.username}/files/path/{self.path}"
         )
+        await self._user.cache.set_sharing(self.path, None)
+
+        if self._user.content_cache is not None:
+            await self._user.content_cache.discard(self._user, self.path)
 
     async def read(self) -> str:
-        """Read the files content."""
+        """Read the files content, from the disk if the user has a content cache (see pyaww.FileContentCache)."""
+        content_cache = self._user.content_cache
+        version = None
+
+        if content_cache is not None:
+            version = content_cache.version(self._user, self.path)
+            content = await content_cache.get(self._user, self.path)
+
+            if content is not None:
+                return content
+
         resp = await self._user.request(
             "GET", f"/api/v0/user/{self._user.username}/files/path{self.path}"
         )
 
-        return await resp.text()
+        content = await resp.text()
+
+        if content_cache is not None:
+            await content_cache.put(self._user, self.path, content, version)
+
+        return content
 
     async def update(self, content: TextIO) -> None:
         """
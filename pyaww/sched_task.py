@@ -1,14 +1,16 @@
 # Standard library imports
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 # Local application/library specific imports
 
+from .utils.tracking import Tracked
+
 if TYPE_CHECKING:
     from .user import User
 
 
-class SchedTask:
+class SchedTask(Tracked):
     """
     Implements ScheduledTask endpoints.
 
@@ -30,9 +32,19 @@ class SchedTask:
     can_enable: bool
     description: str
 
+    _tracked_fields = (
+        "command",
+        "enabled",
+        "interval",
+        "hour",
+        "minute",
+        "description",
+    )
+
     def __init__(self, resp: dict, user: "User") -> None:
         vars(self).update(resp)
         self._user = user
+        self._mark_clean()
 
     async def delete(self) -> None:
         """Delete the task."""
@@ -48,7 +60,8 @@ class SchedTask:
         description: Optional[str] = None,
     ) -> None:
         """
-        Updates the task. All times are in UTC.
+        Updates the task. All times are in UTC. Only fields that differ from the server's are sent, within
+        User.unit_of_work the fields are sent when the block exits.
 
         Examples:
             >>> user = User(...)
@@ -68,10 +81,15 @@ class SchedTask:
         if description is not None:
             data["description"] = description
 
+        await self._update(data)
+
+    async def _patch(self, data: dict[str, Any]) -> None:
         await self._user.request("PATCH", self.url, data=data)
         vars(self).update(data)
+        self._mark_clean(*data)
 
         await self._user.cache.set("sched_task", object_=self)
+        await self._user.cache.invalidate("sched_task")
 
     def __str__(self):
         return self.url
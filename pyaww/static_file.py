@@ -1,6 +1,6 @@
 # Standard library imports
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 # Local application/library specific imports
 
@@ -21,8 +21,27 @@ class StaticFile(StaticHeader):
     url: str
     path: str
 
+    _tracked_fields = ("url", "path")
+
     def __init__(self, resp: dict, webapp: "WebApp"):
         super().__init__(resp, webapp)
         self._webapp = webapp
         vars(self).update(resp)
         self._url = f"/api/v0/user/{self._webapp.user}/webapps/{self._webapp.domain_name}/static_files/{self.id}/"
+        self._mark_clean()
+
+    async def update(  # type: ignore[override]
+        self, url: Optional[str] = None, path: Optional[str] = None
+    ) -> None:
+        """
+        Update the static file. Webapp restart required. Only fields that differ from the server's are sent, within
+        User.unit_of_work the fields are sent when the block exits.
+        """
+        data = {}
+
+        if url is not None:
+            data["url"] = url
+        if path is not None:
+            data["path"] = path
+
+        await self._update(data)
@@ -4,11 +4,13 @@ from typing import TYPE_CHECKING, Optional, Any
 
 # Local library/library specific imports
 
+from .utils.tracking import Tracked
+
 if TYPE_CHECKING:
     from .webapp import WebApp
 
 
-class StaticHeader:
+class StaticHeader(Tracked):
     """Implements StaticHeader endpoints."""
 
     id: int
@@ -16,10 +18,13 @@ class StaticHeader:
     name: str
     value: dict
 
+    _tracked_fields = ("url", "name", "value")
+
     def __init__(self, resp: dict, webapp: "WebApp") -> None:
         self._webapp = webapp
         vars(self).update(resp)
         self._url = f"/api/v0/user/{self._webapp.user}/webapps/{self._webapp.domain_name}/static_headers/{self.id}/"
+        self._mark_clean()
 
     async def delete(self) -> None:
         """Delete the static header. Webapp restart required."""
@@ -31,7 +36,10 @@ class StaticHeader:
         name: Optional[str] = None,
         value: Optional[Any] = None,
     ) -> None:
-        """Update the static header. Webapp restart required."""
+        """
+        Update the static header. Webapp restart required. Only fields that differ from the server's are sent, within
+        User.unit_of_work the fields are sent when the block exits.
+        """
         data = {}
 
         if url is not None:
@@ -41,8 +49,12 @@ class StaticHeader:
         if value is not None:
             data["value"] = value
 
+        await self._update(data)
+
+    async def _patch(self, data: dict[str, Any]) -> None:
         await self._webapp.userclass.request("PATCH", self._url, data=data)
         vars(self).update(data)
+        self._mark_clean(*data)
 
     def __str__(self):
         return self.url
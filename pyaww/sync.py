@@ -0,0 +1,265 @@
+# Standard library imports
+
+import asyncio
+import contextlib
+import functools
+import inspect
+import threading
+import weakref
+
+from typing import Any, Callable, Coroutine, Iterable, Iterator, Optional, TypeVar
+
+# Related third party imports
+
+import aiohttp
+
+# Local application/library specific imports
+
+from .user import User
+from .utils import Cache
+from .utils.tracking import UnitOfWork, _unit_of_work
+from .watch import WATCH_KINDS, WatchEvent
+
+T = TypeVar("T")
+
+# responses of SyncUser.stream, whose bodies are read with coroutines too
+_PROXIED_TYPES = (aiohttp.ClientResponse, aiohttp.StreamReader)
+
+
+@functools.lru_cache(maxsize=None)
+def _is_async_model(cls: type) -> bool:
+    """Whether instances of cls are pyaww objects exposing coroutine methods and thus need a proxy."""
+    if not cls.__module__.startswith("pyaww."):
+        return False
+
+    return any(
+        inspect.iscoroutinefunction(attr) or inspect.isasyncgenfunction(attr)
+        for attr in vars(cls).values()
+    ) or any(_is_async_model(base) for base in cls.__bases__ if base is not object)
+
+
+class _SyncProxy:
+    """
+    Synchronous view of a pyaww object living in the SyncUser event loop. Coroutine methods block until they are done,
+    async generator methods return ordinary generators and returned pyaww objects are proxied as well, by a single
+    proxy per object. Proxies passed as arguments are unwrapped. Attribute reads and writes go straight to the wrapped
+    object, other objects (e.g. the aiohttp session) are returned as they are.
+    """
+
+    __slots__ = ("_obj", "_runner", "__weakref__")
+
+    def __init__(self, obj: Any, runner: "SyncUser") -> None:
+        object.__setattr__(self, "_obj", obj)
+        object.__setattr__(self, "_runner", runner)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._obj, name)
+
+        if inspect.iscoroutinefunction(attr):
+            return self._runner._blocking(attr)
+        if inspect.isasyncgenfunction(attr):
+            return self._runner._iterating(attr)
+
+        return self._runner._wrap(attr)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._obj, name, value)
+
+    def __str__(self) -> str:
+        return str(self._obj)
+
+    def __repr__(self) -> str:
+        return f"<sync {self._obj!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return self._obj == getattr(other, "_obj", other)
+
+    def __hash__(self) -> int:
+        return id(self._obj)
+
+
+class SyncUser(_SyncProxy):
+    """
+    Synchronous facade of pyaww.User for code that can not use `await` (cron scripts, WSGI views...).
+
+    A single event loop runs in a background thread for the lifetime of the instance, so the aiohttp session (and its
+    pooled connections) and the cache are reused between calls, unlike wrapping each call in asyncio.run. Every
+    coroutine of User and the objects it returns (Console, WebApp, File...) can be called directly. watch returns an
+    ordinary generator, stream and unit_of_work are used with `with` instead of `async with`.
+
+    Examples:
+        >>> user = SyncUser("username", "token")
+        >>> for console in user.consoles():
+        >>>     print(console.send_input("echo hi"))
+        >>> user.close()
+
+        >>> with SyncUser("username", "token") as user:
+        >>>     user.get_cpu_info()
+    """
+
+    def __init__(
+        self,
+        username: str,
+        auth: str,
+        from_eu: bool = False,
+        cache: Optional[Cache] = None,
+    ) -> None:
+        """
+        Args:
+            username (str): Username of the account
+            auth (str): API token of the account
+            from_eu (bool): Whether you are from europe or not, because European accounts API URL is different
+            cache (Optional[Cache]): cache to use, see pyaww.User
+        """
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name="pyaww-sync-loop", daemon=True
+        )
+        thread.start()
+
+        object.__setattr__(self, "_loop", loop)
+        object.__setattr__(self, "_thread", thread)
+        # keyed by id(): models define __eq__ without __hash__, a live proxy keeps its object (and id) alive
+        object.__setattr__(self, "_proxies", weakref.WeakValueDictionary())
+
+        async def create() -> User:
+            # asyncio primitives of older Python versions bind to the loop they are created in
+            return User(username, auth, from_eu=from_eu, cache=cache)
+
+        try:
+            user = self._run(create())
+        except BaseException:
+            self._stop()
+            raise
+
+        super().__init__(user, self)
+
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine in the background loop and block until it is done."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _wrap(self, value: Any) -> Any:
+        """Proxy pyaww objects (also inside lists), leave anything else untouched."""
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if inspect.isclass(value) or not (
+            _is_async_model(type(value)) or isinstance(value, _PROXIED_TYPES)
+        ):
+            return value
+
+        if value is self._obj:
+            return self
+
+        proxy = self._proxies.get(id(value))
+
+        if proxy is None:
+            proxy = self._proxies[id(value)] = _SyncProxy(value, self)
+
+        return proxy
+
+    @staticmethod
+    def _unwrap(value: Any) -> Any:
+        """The wrapped objects of proxies (also inside lists), for arguments."""
+        if isinstance(value, list):
+            return [SyncUser._unwrap(item) for item in value]
+        if isinstance(value, _SyncProxy):
+            return value._obj
+
+        return value
+
+    def _blocking(self, func: Callable[..., Coroutine]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            args = tuple(map(self._unwrap, args))
+            kwargs = {key: self._unwrap(value) for key, value in kwargs.items()}
+
+            return self._wrap(self._run(func(*args, **kwargs)))
+
+        return wrapper
+
+    def _iterating(self, func: Callable[..., Any]) -> Callable[..., Iterator]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Iterator:
+            agen = func(
+                *map(self._unwrap, args),
+                **{key: self._unwrap(value) for key, value in kwargs.items()},
+            )
+
+            try:
+                while True:
+                    try:
+                        yield self._wrap(self._run(agen.__anext__()))
+                    except StopAsyncIteration:
+                        return
+            finally:
+                if not self._loop.is_closed():  # also when the generator is abandoned
+                    self._run(agen.aclose())
+
+        return wrapper
+
+    def watch(self, kinds: Iterable[str] = WATCH_KINDS) -> Iterator[WatchEvent]:
+        """Blocking version of User.watch, close the generator (or stop iterating) to unsubscribe."""
+        with contextlib.closing(
+            self._iterating(self._obj.watcher.subscribe)(kinds)
+        ) as events:
+            for event in events:
+                yield event._replace(object=self._wrap(event.object))
+
+    @contextlib.contextmanager
+    def stream(self, method: str, url: str, **kwargs: Any) -> Iterator[Any]:
+        """
+        Blocking version of User.stream. The response and its `content` are proxied, their coroutines (read, json,
+        content.read...) block until they are done.
+
+        Examples:
+            >>> with user.stream("GET", f"/api/v0/user/{user.username}/files/path/home/...") as resp:
+            >>>     while chunk := resp.content.read(65536):
+            >>>         ...
+        """
+        manager = self._obj.stream(method, url, **kwargs)
+        resp = self._run(manager.__aenter__())
+
+        try:
+            yield self._wrap(resp)
+        except BaseException as e:
+            if not self._run(manager.__aexit__(type(e), e, e.__traceback__)):
+                raise
+        else:
+            self._run(manager.__aexit__(None, None, None))
+
+    @contextlib.contextmanager
+    def unit_of_work(self) -> Iterator[Any]:
+        """
+        Blocking version of User.unit_of_work. The unit is active in the calling thread, the calls made from it run
+        in a copy of its context.
+        """
+        unit = UnitOfWork()
+        token = _unit_of_work.set(unit)
+
+        try:
+            yield self._wrap(unit)
+        finally:
+            _unit_of_work.reset(token)
+
+        self._run(unit.flush())
+
+    def _stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def close(self) -> None:
+        """Close the aiohttp session, shut User.io_executor down and stop the background event loop."""
+        if self._loop.is_closed():
+            return
+
+        try:
+            self._run(self._obj.__aexit__(None, None, None))
+        finally:
+            self._stop()
+
+    def __enter__(self) -> "SyncUser":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -1,9 +1,25 @@
 # Standard library imports
 
 import asyncio
+import contextlib
 import json
-
-from typing import AsyncIterator, Optional, TextIO, Union, Any
+import os
+import shlex
+import tempfile
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    ContextManager,
+    IO,
+    Iterable,
+    Optional,
+    Union,
+    Any,
+)
 
 # Related third party imports
 
@@ -16,27 +32,86 @@ from .file import File
 from .sched_task import SchedTask
 from .always_on_task import AlwaysOnTask
 from .webapp import WebApp
-from .errors import raise_error
-from .utils import Cache
+from .watch import Watcher, WatchEvent, WATCH_KINDS
+from .backup import export_account, restore_account
+from .errors import (
+    raise_error,
+    CircuitOpen,
+    ConsoleLimit,
+    NotFound,
+    PythonAnywhereError,
+    RequestTimeout,
+)
+from .utils.cache import _record
+from .utils.deadlines import deadline, remaining_time
+from .utils import (
+    BatchLoader,
+    Cache,
+    CircuitBreakers,
+    FileContentCache,
+    HedgingPolicy,
+    IdentityMap,
+    pack_tree,
+    unpack_tree,
+    BlockingReader,
+    PriorityScheduler,
+    priority,
+    RequestMetrics,
+    RequestHook,
+    RequestContext,
+    dispatch_hooks,
+    file_payload,
+    route_template,
+    UnitOfWork,
+)
 
 
 async def _parse_json(
-    resp: aiohttp.ClientResponse, return_json: bool
+    resp: aiohttp.ClientResponse, return_json: bool, ctx: RequestContext
 ) -> Union[dict, aiohttp.ClientResponse]:
-    """Parse the JSON and raise errors."""
+    """Parse the JSON and raise errors, every error is a new instance carrying the request context."""
     if not return_json:
         return resp
 
-    jsoned = await resp.json(content_type=None)
+    try:
+        jsoned = await resp.json(content_type=None)
+    except ValueError:
+        if resp.status < 400:
+            raise
+
+        # e.g. the HTML page of a 502 from a proxy, still an error of the request
+        raise_error(
+            (resp.status, resp.reason or "Error response without JSON."),
+            route=ctx.route,
+            method=ctx.method,
+            retry_after=resp.headers.get("Retry-After"),
+            request_id=resp.headers.get("X-Request-Id"),
+        )
 
     if jsoned:
         for key in ("detail", "error", "error_message", "non_field_errors"):
             if key in jsoned:
-                raise_error((resp.status, jsoned[key]))
+                raise_error(
+                    (resp.status, jsoned[key]),
+                    route=ctx.route,
+                    method=ctx.method,
+                    retry_after=resp.headers.get("Retry-After"),
+                    request_id=resp.headers.get("X-Request-Id"),
+                )
 
     return jsoned
 
 
+def _write_file(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=60, sock_connect=15)
+
+
 class User:
     """
     The brain of the operation. All modules are connected to this class in one way or another.
@@ -59,22 +134,50 @@ class User:
         auth: str,
         async_session: aiohttp.ClientSession = None,
         from_eu: bool = False,
+        cache: Optional[Cache] = None,
+        timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+        hedging: Optional[HedgingPolicy] = None,
+        content_cache: Optional[FileContentCache] = None,
     ) -> None:
         """
         Args:
             username (str): Username of the account
             auth (str): API token of the account
             from_eu (bool): Whether you are from europe or not, because European accounts API URL is different
+            cache (Optional[Cache]): cache to use, pass a pyaww.ThreadSafeCache to share one between threads
+            timeout (aiohttp.ClientTimeout): default timeout of every request, see also User.deadline
+            hedging (Optional[HedgingPolicy]): enables hedging of GET requests, see pyaww.HedgingPolicy
+            content_cache (Optional[FileContentCache]): on-disk cache for File.read, see pyaww.FileContentCache
         """
         self.use_cache = True
-        self.cache = Cache()
+        self.cache = cache if cache is not None else Cache()
+        self.metrics = RequestMetrics()
+        self.breakers = CircuitBreakers()
+        self.hooks: list[RequestHook] = [self.metrics, self.breakers]
+
+        self.hedging = hedging
+        if hedging is not None:
+            self.hooks.append(hedging)
+
+        self.identity = IdentityMap()
+        self.content_cache = content_cache
+        self.loaders: dict[str, BatchLoader] = {
+            "console": BatchLoader(self._fetch_console, self._fetch_consoles),
+            "sched_task": BatchLoader(self._fetch_sched_task, self._fetch_sched_tasks),
+            "always_on_task": BatchLoader(
+                self._fetch_always_on_task, self._fetch_always_on_tasks
+            ),
+        }
 
         self.from_eu = from_eu
         self.username = username
         self.token = auth
 
         self.session = async_session
-        self.sem = asyncio.Semaphore(10)
+        self.timeout = timeout
+        self.scheduler = PriorityScheduler(10)
+        self.io_executor = ThreadPoolExecutor(4, thread_name_prefix="pyaww-io")
+        self.watcher = Watcher(self)
         self.lock = asyncio.Lock()
 
         self.headers = {"Authorization": f"Token {self.token}"}
@@ -87,22 +190,380 @@ class User:
         if len(self.token) != 40:
             raise_error((401, "Invalid token."))
 
-    async def request(
-        self, method: str, url: str, return_json: bool = False, **kwargs
-    ) -> Any:
-        """Request function for the module"""
+    def _own(self, cached: Any) -> Any:
+        """
+        Objects read from a cache shared with other users (see pyaww.ThreadSafeCache) may be bound to another user,
+        whose session lives in another event loop. They are resolved again as objects of this user.
+        """
+        if isinstance(cached, list):
+            return [self._own(object_) for object_ in cached]
+
+        if cached is None or cached._user is self:
+            return cached
+
+        object_ = self.identity.resolve(type(cached), _record(cached), self)
+
+        if getattr(cached, "stale", False):
+            object_.stale = True
+
+        return object_
+
+    def _timeout(
+        self, timeout: Optional[Union[float, aiohttp.ClientTimeout]]
+    ) -> aiohttp.ClientTimeout:
+        """The timeout for a request, a per-call one must be positive (aiohttp takes 0 for no timeout at all)."""
+        if timeout is None:
+            return self.timeout
+
+        if not isinstance(timeout, aiohttp.ClientTimeout):
+            timeout = aiohttp.ClientTimeout(total=timeout)
+
+        if timeout.total is not None and timeout.total <= 0:
+            raise ValueError(f"Timeout must be positive, got {timeout.total}.")
 
+        return timeout
+
+    @staticmethod
+    def _shorten(
+        timeout: aiohttp.ClientTimeout, remaining: float
+    ) -> aiohttp.ClientTimeout:
+        """The timeout shortened to the (positive) time left until the active deadline."""
+        if timeout.total is not None and timeout.total <= remaining:
+            return timeout
+
+        return aiohttp.ClientTimeout(
+            total=remaining,
+            connect=timeout.connect,
+            sock_read=timeout.sock_read,
+            sock_connect=timeout.sock_connect,
+        )
+
+    @contextlib.asynccontextmanager
+    async def _send(
+        self,
+        ctx: RequestContext,
+        timeout: Optional[Union[float, aiohttp.ClientTimeout]] = None,
+        priority: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Send the request of ctx while holding a request slot of the given priority lane, the response is released on
+        exit.
+
+        Waiting for the slot counts towards the active deadline. Once cancelled, the slot is freed and the connection
+        closed right away.
+        """
         if not self.session:
             self.session = aiohttp.ClientSession()
 
-        async with self.sem:
-            resp = await self.session.request(
-                method=method,
-                url=self.request_url + url,
+        client_timeout = self._timeout(timeout)
+        remaining = remaining_time()
+
+        try:
+            if remaining is not None and remaining <= 0:
+                raise asyncio.TimeoutError
+            await asyncio.wait_for(self.scheduler.acquire(priority), remaining)
+        except asyncio.TimeoutError:
+            raise RequestTimeout(
+                "Deadline exceeded while waiting for a request slot.",
+                route=ctx.route,
+                method=ctx.method,
+            ) from None
+
+        try:
+            ctx.queue_time = time.perf_counter() - ctx.started
+            remaining = remaining_time()
+
+            if remaining is not None:
+                if remaining <= 0:  # the slot came too late
+                    raise RequestTimeout(
+                        "Deadline exceeded while waiting for a request slot.",
+                        route=ctx.route,
+                        method=ctx.method,
+                    )
+
+                client_timeout = self._shorten(client_timeout, remaining)
+
+            ctx.sent = True
+
+            async with self.session.request(
+                method=ctx.method,
+                url=self.request_url + ctx.url,
                 headers=self.headers,
+                timeout=client_timeout,
                 **kwargs,
+            ) as resp:
+                ctx.status = resp.status
+                yield resp
+        except asyncio.TimeoutError as e:
+            if isinstance(e, RequestTimeout):
+                raise
+
+            raise RequestTimeout(
+                "Request timed out.",
+                status=ctx.status,
+                route=ctx.route,
+                method=ctx.method,
+            ) from e
+        finally:
+            self.scheduler.release()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        return_json: bool = False,
+        hedge: bool = True,
+        **kwargs,
+    ) -> Any:
+        """
+        Request function for the module. Every call goes through the registered hooks (see User.add_hook), which is
+        also how calls are recorded in User.metrics.
+
+        The response body is always read and the connection returned to the pool before this returns, with
+        return_json=False the (already read) aiohttp.ClientResponse is returned. Use User.stream to consume a body
+        incrementally.
+
+        A `timeout` keyword (seconds or aiohttp.ClientTimeout, ValueError if not positive) overrides User.timeout for
+        this call, an active User.deadline shortens either. Running out of time raises pyaww.RequestTimeout.
+
+        A `priority` keyword picks the lane of User.scheduler ("interactive", "default" or "bulk"), overriding an
+        active User.priority block.
+
+        GET requests are hedged if User.hedging is set (see pyaww.HedgingPolicy), pass hedge=False to opt out.
+        """
+        ctx = RequestContext(method, url, route_template(url, self.username))
+
+        try:
+            await dispatch_hooks(self.hooks, "before_request", ctx)
+
+            if self.hedging is not None and method == "GET" and hedge:
+                result = await self._hedged(ctx, return_json, **kwargs)
+            else:
+                result = await self._attempt(ctx, return_json, **kwargs)
+        except BaseException as e:  # cancellations too, hooks may hold resources
+            ctx.latency = time.perf_counter() - ctx.started - ctx.queue_time
+            ctx.error = e
+
+            await dispatch_hooks(self.hooks, "on_error", ctx, e)
+            raise
+
+        ctx.latency = time.perf_counter() - ctx.started - ctx.queue_time
+        ctx.decode_time = ctx.latency - ctx.network_time
+
+        await dispatch_hooks(self.hooks, "after_request", ctx)
+        return result
+
+    async def _attempt(self, ctx: RequestContext, return_json: bool, **kwargs) -> Any:
+        """Send the request of ctx once, read and parse the response."""
+        async with self._send(ctx, **kwargs) as resp:
+            ctx.size = len(await resp.read())
+            ctx.network_time = time.perf_counter() - ctx.started - ctx.queue_time
+
+            return await _parse_json(resp, return_json, ctx)
+
+    async def _hedged(self, ctx: RequestContext, return_json: bool, **kwargs) -> Any:
+        """
+        Send the request of ctx, and a second identical one if the first is slower than the hedging delay of its
+        route. The first successful response wins and the other request is cancelled.
+        """
+        hedging = self.hedging
+        delay = None if hedging is None else hedging.delay(ctx.route)
+        first = asyncio.ensure_future(self._attempt(ctx, return_json, **kwargs))
+        pending = {first}
+
+        try:
+            if delay is None:
+                return await first
+
+            done, pending = await asyncio.wait(pending, timeout=delay)
+
+            if done or hedging is None or not hedging.acquire():
+                return await first
+
+            hedge_ctx = RequestContext(ctx.method, ctx.url, ctx.route)
+            second = asyncio.ensure_future(
+                self._attempt(hedge_ctx, return_json, **kwargs)
             )
-            return await _parse_json(resp, return_json)
+            pending.add(second)
+            ctx.retries += 1
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # both may finish in the same wakeup, a success wins over a failure
+                succeeded = [task for task in done if task.exception() is None]
+
+                if succeeded:
+                    winner = succeeded[0]
+                elif not pending:
+                    winner = done.pop()
+                else:
+                    continue  # the faster one failed, wait for the other
+
+                if winner is second:
+                    for slot in (
+                        "status",
+                        "size",
+                        "queue_time",
+                        "network_time",
+                        "sent",
+                    ):
+                        setattr(ctx, slot, getattr(hedge_ctx, slot))
+
+                return winner.result()
+        finally:  # asyncio.wait does not cancel the tasks it waits for
+            for task in pending:
+                task.cancel()
+
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self, method: str, url: str, **kwargs
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Raw access to a response whose body is consumed incrementally. The request slot is held and the connection
+        released (back to the pool if the body was fully read) when the block exits.
+
+        Args:
+            method (str): HTTP method
+            url (str): URL without the host, e.g. /api/v0/user/{username}/files/path/...
+            **kwargs: passed to aiohttp.ClientSession.request
+
+        Examples:
+            >>> user = User(...)
+            >>> async with user.stream("GET", f"/api/v0/user/{user.username}/files/path/home/...") as resp:
+            >>>     async for chunk in resp.content.iter_chunked(65536):
+            >>>         ...
+        """
+        ctx = RequestContext(method, url, route_template(url, self.username))
+
+        try:
+            await dispatch_hooks(self.hooks, "before_request", ctx)
+
+            async with self._send(ctx, **kwargs) as resp:
+                ctx.network_time = time.perf_counter() - ctx.started - ctx.queue_time
+                yield resp
+        except BaseException as e:  # cancellations too, hooks may hold resources
+            ctx.latency = time.perf_counter() - ctx.started - ctx.queue_time
+            ctx.error = e
+
+            await dispatch_hooks(self.hooks, "on_error", ctx, e)
+            raise
+
+        ctx.latency = time.perf_counter() - ctx.started - ctx.queue_time
+        ctx.network_time = ctx.latency
+        ctx.size = resp.content_length or 0
+
+        await dispatch_hooks(self.hooks, "after_request", ctx)
+
+    @staticmethod
+    def priority(lane: str) -> ContextManager[None]:
+        """
+        Send every request made within the block in the given lane of User.scheduler. Latency sensitive calls should
+        use "interactive", background jobs "bulk".
+
+        Args:
+            lane (str): "interactive", "default" or "bulk"
+
+        Examples:
+            >>> user = User(...)
+            >>> with user.priority("bulk"):
+            >>>     await asyncio.gather(*(user.create_file(path, f) for path, f in files))
+        """
+        return priority(lane)
+
+    @staticmethod
+    def deadline(seconds: float) -> ContextManager[None]:
+        """
+        Bound every request made within the block, including the ones made by composite operations such as
+        `listdir(recursive=True)` or `create_webapp`, to finish within `seconds`.
+
+        Args:
+            seconds (float): time budget for the whole block
+
+        Examples:
+            >>> user = User(...)
+            >>> with user.deadline(10):
+            >>>     await user.create_webapp('username.pythonanywhere.com', 'python39')
+        """
+        return deadline(seconds)
+
+    @staticmethod
+    def unit_of_work() -> UnitOfWork:
+        """
+        Collect the changes made to tasks, webapps, static files and headers within the block and send them on exit,
+        one minimal PATCH request per changed object, concurrently. See pyaww.UnitOfWork.
+
+        Examples:
+            >>> user = User(...)
+            >>> async with user.unit_of_work():
+            >>>     task = await user.get_sched_task_by_id(...)
+            >>>     task.command = 'cd'
+            >>>     await webapp.update(force_https=True)
+        """
+        return UnitOfWork()
+
+    def watch(
+        self, kinds: Iterable[str] = WATCH_KINDS
+    ) -> AsyncGenerator[WatchEvent, None]:
+        """
+        Iterate over the created, updated and deleted consoles, tasks and webapps of the account. Collections are
+        polled often right after a change and less and less while idle, subscribers share the polls (see
+        User.watcher, pyaww.Watcher). The first poll only records the current state.
+
+        Args:
+            kinds (Iterable[str]): collections to watch, among "console", "sched_task", "always_on_task", "webapp"
+
+        Examples:
+            >>> user = User(...)
+            >>> async for event in user.watch(["sched_task"]):
+            >>>     print(event.type, event.id, event.object.command)
+
+        Returns:
+            AsyncGenerator[WatchEvent, None]: endless stream of events, stop iterating (or aclose it) to unsubscribe
+        """
+        return self.watcher.subscribe(kinds)
+
+    def add_hook(self, hook: RequestHook) -> None:
+        """
+        Register a request hook, hooks are called in the order they were added.
+
+        Args:
+            hook (RequestHook): hook to be registered (see pyaww.RequestHook)
+
+        Examples:
+            >>> user = User(...)
+            >>> user.add_hook(pyaww.OpenTelemetryHook())
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: RequestHook) -> None:
+        """Unregister a request hook."""
+        self.hooks.remove(hook)
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the request and cache metrics.
+
+        Returns:
+            dict: `requests` (see pyaww.RequestMetrics.snapshot), `cache` (see pyaww.Cache.stats), `breakers`
+            (see pyaww.CircuitBreakers.states), `scheduler` (see pyaww.PriorityScheduler.stats) and `identity`
+            (see pyaww.IdentityMap.stats)
+        """
+        return {
+            "requests": self.metrics.snapshot(),
+            "cache": self.cache.stats(),
+            "breakers": self.breakers.states(),
+            "scheduler": self.scheduler.stats(),
+            "identity": self.identity.stats(),
+        }
+
+    def prometheus(self) -> str:
+        """Return the request and cache metrics in the Prometheus text format."""
+        return self.metrics.prometheus() + self.cache.prometheus()
 
     async def get_cpu_info(self) -> dict:
         """
@@ -124,7 +585,7 @@ class User:
             list[Console]: list of shared consoles
         """
         return [
-            Console(console, self)
+            self.identity.resolve(Console, console, self)
             for console in await self.request(
                 "GET",
                 f"/api/v0/user/{self.username}/consoles/shared_with_you/",
@@ -139,26 +600,67 @@ class User:
         Returns:
             list[Console]: list of shared personal consoles
         """
-        consoles = await self.cache.all("console") or [
-            Console(console, self)
+        consoles = self._own(await self.cache.all("console"))
+
+        if consoles is None:
+            try:
+                consoles = await self._fetch_consoles()
+            except CircuitOpen:
+                consoles = self._own(await self.cache.stale("console"))
+
+                if consoles is None:
+                    raise
+
+        return consoles
+
+    async def _fetch_consoles(self) -> list[Console]:
+        """Request the personal consoles and cache them as the complete list."""
+        generation = self.cache.generation("console")
+        consoles = [
+            self.identity.resolve(Console, console, self)
             for console in await self.request(
                 "GET",
                 f"/api/v0/user/{self.username}/consoles//",
                 return_json=True,
             )
         ]
-        await self.cache.set("console", object_=consoles, allow_all_usage=True)
+        await self.cache.set(
+            "console", object_=consoles, allow_all_usage=True, generation=generation
+        )
 
         return consoles
 
     async def get_console_by_id(self, id_: int) -> Console:
-        """Get a console by its id."""
-        console = await self.cache.get("console", id_=id_) or Console(
-            await self.request(
+        """Get a console by its id. Concurrent lookups are batched, see User.loaders."""
+        console = self._own(await self.cache.get("console", id_=id_))
+
+        if console is None:
+            missing = await self.cache.missing("console", id_)
+
+            if missing is not None:
+                raise missing
+
+            try:
+                console = await self.loaders["console"].load(id_)
+            except CircuitOpen:
+                console = self._own(await self.cache.stale("console", id_=id_))
+
+                if console is None:
+                    raise
+
+        return console
+
+    async def _fetch_console(self, id_: int) -> Console:
+        """Request a single console and cache it, or the fact that it does not exist."""
+        try:
+            resp = await self.request(
                 "GET", f"/api/v0/user/{self.username}/consoles/{id_}", return_json=True
-            ),
-            self,
-        )
+            )
+        except NotFound as e:
+            await self.cache.set_missing("console", id_, e)
+            raise
+
+        console = self.identity.resolve(Console, resp, self)
         await self.cache.set("console", object_=console)
 
         return console
@@ -198,14 +700,16 @@ class User:
             raise_error((429, "Console limit reached."))
 
         # noinspection PyUnboundLocalVariable
-        console = Console(resp, self)
+        console = self.identity.resolve(Console, resp, self)
         await self.cache.set("console", object_=console)
+        await self.cache.invalidate("console")
+        await self.cache.forget_missing("console")
 
         return console
 
     async def listdir(
         self, path: str, recursive: bool = False, only_subdirectories: bool = True
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[Union[str, list[str]]]:
         """
         List dir that crawls into dirs (if recursive is set to true), if not, list files and sub-dirs in a directory.
 
@@ -219,13 +723,10 @@ class User:
             >>> async for await user.listdir('/home/yourname/my_site/', recursive=True)
 
         Returns:
-            AsyncIterator[str]: generator with paths
+            AsyncIterator[Union[str, list[str]]]: generator with paths, the listing of path as a single list if not
+                recursive
         """
-        resp = await self.request(
-            "GET",
-            f"/api/v0/user/{self.username}/files/tree/?path={path}",
-            return_json=True,
-        )
+        resp = await self._fetch_tree(path, priority="bulk" if recursive else None)
 
         if not recursive:
             yield resp
@@ -240,6 +741,15 @@ class User:
                 yield path
                 await asyncio.sleep(0)
 
+    async def _fetch_tree(self, path: str, priority: Optional[str] = None) -> list[str]:
+        """Request the entries of a directory, the subdirectories end with a slash."""
+        return await self.request(
+            "GET",
+            f"/api/v0/user/{self.username}/files/tree/?path={path}",
+            return_json=True,
+            priority=priority,
+        )
+
     async def get_file_by_path(self, path: str) -> File:
         """
         Function to get a file. Does not error if not found.
@@ -252,28 +762,249 @@ class User:
         """
         return File(path, self)
 
-    async def create_file(self, path: str, file: TextIO) -> File:
+    async def create_file(self, path: str, file: IO) -> File:
         """
-        Create or update a file at a path.
+        Create or update a file at a path. The local file is read in chunks in User.io_executor (a small thread
+        pool) while it is being sent, so the event loop never waits on the disk. It is not closed. Binary and UTF-8
+        text files are sent with a Content-Length, other text with chunked transfer encoding (see
+        pyaww.utils.file_payload).
 
         Args:
             path (str): path as to where the file shall be created (must include name + file extension in path)
-            file (TextIO): file to be created / updated
+            file (IO): file to be created / updated, text or binary
 
         Examples:
             >>> user = User(...)
             >>> with open('./grocery_list.txt') as f:
             >>>    await user.create_file('/home/yourname/grocery_list.txt', f)
         """
+        form = aiohttp.FormData()
+        form.add_field(
+            "content",
+            file_payload(file, self.io_executor),
+            filename=os.path.basename(path) or "content",
+        )
+
         await self.request(
             "POST",
             f"/api/v0/user/{self.username}/files/path/{path}",
             return_json=True,
-            data={"content": file},
+            data=form,
         )
 
+        if self.content_cache is not None:
+            await self.content_cache.discard(self, path)
+
         return File(path, self)
 
+    async def upload_tree(
+        self, local_dir: str, remote_dir: str, console: Console, timeout: float = 600.0
+    ) -> int:
+        """
+        Upload a local directory tree with a single request. The tree is packed into a gzip compressed tar archive (in
+        a temporary file, in User.io_executor), uploaded, then extracted into remote_dir by the console and removed.
+        The extracted files are counted before returning, so upload time depends on bytes rather than file count.
+
+        Args:
+            local_dir (str): directory to upload
+            remote_dir (str): directory to extract it into, created if missing
+            console (Console): started bash console to extract the archive with
+            timeout (float): seconds to wait for the extraction
+
+        Examples:
+            >>> user = User(...)
+            >>> console = await user.get_console_by_id(...)
+            >>> await user.upload_tree('./mysite', '/home/yourname/mysite', console)
+
+        Returns:
+            int: amount of files uploaded
+
+        Raises:
+            PythonAnywhereError: if the extraction failed or fewer files than uploaded were extracted
+            RequestTimeout: if the extraction did not finish within timeout
+        """
+        loop = asyncio.get_running_loop()
+        archive = f"/home/{self.username}/.pyaww-upload-{uuid.uuid4().hex}.tar.gz"
+
+        with tempfile.TemporaryFile() as local_archive:
+            count = await loop.run_in_executor(
+                self.io_executor, pack_tree, local_dir, local_archive
+            )
+            local_archive.seek(0)
+
+            await self.create_file(archive, local_archive)  # type: ignore
+
+        quoted_archive, quoted_dir = shlex.quote(archive), shlex.quote(remote_dir)
+
+        try:
+            extracted, listed, _ = await console.run_many(
+                [
+                    f"mkdir -p {quoted_dir} && tar -xzf {quoted_archive} -C {quoted_dir}",
+                    f"tar -tzf {quoted_archive} | grep -v '/$' | (cd {quoted_dir} && "
+                    f'while IFS= read -r f; do [ -f "$f" ] && echo; done) | wc -l',
+                    f"rm -f {quoted_archive}",
+                ],
+                timeout,
+            )
+        except RequestTimeout:
+            raise  # still running, the archive is removed once extracted
+        except Exception:
+            await File(archive, self).delete()
+            raise
+
+        if extracted.exit_code != 0 or int(listed.output or -1) != count:
+            raise PythonAnywhereError(
+                f"Extracting into {remote_dir} failed (tar exited with "
+                f"{extracted.exit_code}), {listed.output} of {count} files were extracted."
+            )
+
+        return count
+
+    async def download_tree(
+        self,
+        remote_dir: str,
+        local_dir: str,
+        console: Optional[Console] = None,
+        timeout: float = 600.0,
+    ) -> int:
+        """
+        Download a remote directory tree. With a console, the tree is packed into a gzip compressed tar archive on
+        PythonAnywhere, downloaded as one stream and extracted (in User.io_executor) while the bytes arrive. Without
+        one, or if the console is refused for the console limit (pyaww.ConsoleLimit), files are listed and downloaded
+        concurrently one by one. No console is created here: consoles created through the API only start once opened
+        in a browser.
+
+        Args:
+            remote_dir (str): directory to download
+            local_dir (str): directory to extract it into, created if missing
+            console (Optional[Console]): started bash console to pack the archive with
+            timeout (float): seconds to wait for the packing
+
+        Examples:
+            >>> user = User(...)
+            >>> console = await user.get_console_by_id(...)
+            >>> await user.download_tree('/home/yourname/mysite', './backup/mysite', console)
+
+        Returns:
+            int: amount of files downloaded
+
+        Raises:
+            PythonAnywhereError: if packing failed or fewer files than packed were extracted
+            RequestTimeout: if packing did not finish within timeout
+        """
+        if console is None:
+            return await self._download_files(remote_dir, local_dir)
+
+        archive = f"/home/{self.username}/.pyaww-download-{uuid.uuid4().hex}.tar.gz"
+        quoted_archive, quoted_dir = shlex.quote(archive), shlex.quote(remote_dir)
+
+        try:
+            packing, listed = await console.run_many(
+                [
+                    f"tar -czf {quoted_archive} "
+                    f"--exclude={shlex.quote(os.path.basename(archive))} -C {quoted_dir} .",
+                    f"tar -tzf {quoted_archive} | grep -vc '/$'",
+                ],
+                timeout,
+            )
+
+            # 1: files changed while being packed, they still were. None: the end scrolled out, tar complained a lot
+            if packing.exit_code is None or packing.exit_code > 1:
+                raise PythonAnywhereError(
+                    f"Packing {remote_dir} failed (tar exited with {packing.exit_code}): "
+                    f"{packing.output}"
+                )
+
+            packed = int(listed.output or -1)
+            count = await self._download_archive(archive, local_dir)
+        except ConsoleLimit:  # no console slot to pack with
+            count = packed = await self._download_files(remote_dir, local_dir)
+        finally:
+            with contextlib.suppress(NotFound):
+                await File(archive, self).delete()
+
+        if count != packed:
+            raise PythonAnywhereError(
+                f"{count} of the {packed} files of {remote_dir} were extracted."
+            )
+
+        return count
+
+    async def _download_archive(self, archive: str, local_dir: str) -> int:
+        """Stream a remote tar archive into unpack_tree, running in User.io_executor."""
+        loop = asyncio.get_running_loop()
+        url = f"/api/v0/user/{self.username}/files/path{archive}"
+
+        async with self.stream("GET", url, priority="bulk") as resp:
+            if resp.status >= 400:
+                raise_error(
+                    (resp.status, resp.reason or ""),
+                    route=route_template(url, self.username),
+                    method="GET",
+                )
+
+            return await loop.run_in_executor(
+                self.io_executor,
+                unpack_tree,
+                BlockingReader(resp.content, loop),
+                local_dir,
+            )
+
+    async def _download_files(self, remote_dir: str, local_dir: str) -> int:
+        """Download the files of a remote tree concurrently, one request each."""
+        loop = asyncio.get_running_loop()
+        remote_dir = remote_dir.rstrip("/") + "/"
+
+        async def download(path: str) -> None:
+            target = os.path.join(local_dir, *path[len(remote_dir) :].split("/"))
+            url = f"/api/v0/user/{self.username}/files/path{path}"
+
+            async with self.stream("GET", url, priority="bulk") as resp:
+                if resp.status >= 400:
+                    raise_error(
+                        (resp.status, resp.reason or ""),
+                        route=route_template(url, self.username),
+                        method="GET",
+                    )
+
+                content = await resp.read()
+
+            await loop.run_in_executor(self.io_executor, _write_file, target, content)
+
+        paths = await self.list_tree(remote_dir)
+        await asyncio.gather(*map(download, paths))
+
+        return len(paths)
+
+    async def list_tree(self, directory: str) -> list[str]:
+        """
+        List the files of a remote directory tree. Unlike listdir, the subdirectories of each level are listed
+        concurrently.
+
+        Args:
+            directory (str): directory to list
+
+        Examples:
+            >>> user = User(...)
+            >>> await user.list_tree('/home/yourname/mysite/static')
+
+        Returns:
+            list[str]: absolute paths of the files
+        """
+
+        async def walk(directory: str) -> list[str]:
+            entries = await self._fetch_tree(directory)
+            files = [entry for entry in entries if not entry.endswith("/")]
+
+            for paths in await asyncio.gather(
+                *(walk(entry) for entry in entries if entry.endswith("/"))
+            ):
+                files.extend(paths)
+
+            return files
+
+        return await walk(directory.rstrip("/") + "/")
+
     async def students(self) -> dict:
         """List students of the user."""
         return await self.request(
@@ -291,32 +1022,101 @@ class User:
 
     async def always_on_tasks(self) -> list[AlwaysOnTask]:
         """Get always on tasks"""
-        always_on = await self.request(
-            "GET", f"/api/v0/user/{self.username}/always_on", return_json=True
+        always_on = self._own(await self.cache.all("always_on_task"))
+
+        if always_on is None:
+            try:
+                always_on = await self._fetch_always_on_tasks()
+            except CircuitOpen:
+                always_on = self._own(await self.cache.stale("always_on_task"))
+
+                if always_on is None:
+                    raise
+
+        return always_on
+
+    async def _fetch_always_on_tasks(self) -> list[AlwaysOnTask]:
+        """Request the always_on tasks and cache them as the complete list."""
+        generation = self.cache.generation("always_on_task")
+        always_on = [
+            self.identity.resolve(AlwaysOnTask, i, self)
+            for i in await self.request(
+                "GET", f"/api/v0/user/{self.username}/always_on", return_json=True
+            )
+        ]
+        await self.cache.set(
+            "always_on_task",
+            object_=always_on,
+            allow_all_usage=True,
+            generation=generation,
         )
 
-        return [AlwaysOnTask(i, self) for i in always_on]
+        return always_on
 
     async def scheduled_tasks(self) -> list[SchedTask]:
         """Get scheduled tasks."""
-        sched_tasks = await self.cache.all("sched_task") or [
-            SchedTask(sched_task, self)
+        sched_tasks = self._own(await self.cache.all("sched_task"))
+
+        if sched_tasks is None:
+            try:
+                sched_tasks = await self._fetch_sched_tasks()
+            except CircuitOpen:
+                sched_tasks = self._own(await self.cache.stale("sched_task"))
+
+                if sched_tasks is None:
+                    raise
+
+        return sched_tasks
+
+    async def _fetch_sched_tasks(self) -> list[SchedTask]:
+        """Request the scheduled tasks and cache them as the complete list."""
+        generation = self.cache.generation("sched_task")
+        sched_tasks = [
+            self.identity.resolve(SchedTask, sched_task, self)
             for sched_task in await self.request(
                 "GET", f"/api/v0/user/{self.username}/schedule/", return_json=True
             )
         ]
-        await self.cache.set("sched_task", object_=sched_tasks, allow_all_usage=True)
+        await self.cache.set(
+            "sched_task",
+            object_=sched_tasks,
+            allow_all_usage=True,
+            generation=generation,
+        )
 
         return sched_tasks
 
     async def get_sched_task_by_id(self, id_: int) -> SchedTask:
-        """Get a scheduled task via it's id."""
-        sched_task = await self.cache.get("sched_task", id_=id_) or SchedTask(
-            await self.request(
+        """Get a scheduled task via it's id. Concurrent lookups are batched, see User.loaders."""
+        sched_task = self._own(await self.cache.get("sched_task", id_=id_))
+
+        if sched_task is None:
+            missing = await self.cache.missing("sched_task", id_)
+
+            if missing is not None:
+                raise missing
+
+            try:
+                sched_task = await self.loaders["sched_task"].load(id_)
+            except CircuitOpen:
+                sched_task = self._own(await self.cache.stale("sched_task", id_=id_))
+
+                if sched_task is None:
+                    raise
+
+        return sched_task
+
+    async def _fetch_sched_task(self, id_: int) -> SchedTask:
+        """Request a single scheduled task and cache it, or the fact that it does not exist."""
+        try:
+            resp = await self.request(
                 "GET", f"/api/v0/user/{self.username}/schedule/{id_}/", return_json=True
-            ),
-            self,
-        )
+            )
+        except NotFound as e:
+            await self.cache.set_missing("sched_task", id_, e)
+            raise
+
+        sched_task = self.identity.resolve(SchedTask, resp, self)
         await self.cache.set("sched_task", object_=sched_task)
 
         return sched_task
@@ -348,7 +1148,8 @@ class User:
         Returns:
             SchedTask
         """
-        sched_task = SchedTask(
+        sched_task = self.identity.resolve(
+            SchedTask,
             await self.request(
                 "POST",
                 f"/api/v0/user/{self.username}/schedule/",
@@ -365,6 +1166,8 @@ class User:
             self,
         )
         await self.cache.set("sched_task", object_=sched_task)
+        await self.cache.invalidate("sched_task")
+        await self.cache.forget_missing("sched_task")
 
         return sched_task
 
@@ -394,34 +1197,66 @@ class User:
             return_json=True,
             data=data,
         )
-        return AlwaysOnTask(resp, self)
+        always_on_task = self.identity.resolve(AlwaysOnTask, resp, self)
+        await self.cache.set("always_on_task", object_=always_on_task)
+        await self.cache.invalidate("always_on_task")
+        await self.cache.forget_missing("always_on_task")
+
+        return always_on_task
 
     async def get_always_on_task_by_id(self, id_: int) -> AlwaysOnTask:
-        """Gets an always_on task."""
-        resp = await self.request(
-            "GET", f"/api/v0/user/{self.username}/always_on/{id_}/", return_json=True
-        )
-        return AlwaysOnTask(resp, self)
+        """Gets an always_on task. Concurrent lookups are batched, see User.loaders."""
+        always_on_task = self._own(await self.cache.get("always_on_task", id_=id_))
 
-    async def python_versions(self) -> list:
-        """Get all 3 ("python3", "python" and "run button") versions."""
-        return [
-            await self.request(
-                "GET",
-                f"/api/v0/user/{self.username}/default_python3_version/",
-                return_json=True,
-            ),
-            await self.request(
-                "GET",
-                f"/api/v0/user/{self.username}/default_python_version/",
-                return_json=True,
-            ),
-            await self.request(
+        if always_on_task is None:
+            missing = await self.cache.missing("always_on_task", id_)
+
+            if missing is not None:
+                raise missing
+
+            try:
+                always_on_task = await self.loaders["always_on_task"].load(id_)
+            except CircuitOpen:
+                always_on_task = self._own(
+                    await self.cache.stale("always_on_task", id_=id_)
+                )
+
+                if always_on_task is None:
+                    raise
+
+        return always_on_task
+
+    async def _fetch_always_on_task(self, id_: int) -> AlwaysOnTask:
+        """Request a single always_on task and cache it, or the fact that it does not exist."""
+        try:
+            resp = await self.request(
                 "GET",
-                f"/api/v0/user/{self.username}/default_save_and_run_python_version/",
+                f"/api/v0/user/{self.username}/always_on/{id_}/",
                 return_json=True,
-            ),
-        ]
+            )
+        except NotFound as e:
+            await self.cache.set_missing("always_on_task", id_, e)
+            raise
+
+        always_on_task = self.identity.resolve(AlwaysOnTask, resp, self)
+        await self.cache.set("always_on_task", object_=always_on_task)
+
+        return always_on_task
+
+    async def python_versions(self) -> list:
+        """Get all 3 ("python3", "python" and "run button") versions, requested concurrently."""
+        return list(
+            await asyncio.gather(
+                *(
+                    self.request(
+                        "GET",
+                        f"/api/v0/user/{self.username}/default_{command}_version/",
+                        return_json=True,
+                    )
+                    for command in ("python3", "python", "save_and_run_python")
+                )
+            )
+        )
 
     async def set_python_version(self, version: float, command: str) -> None:
         """
@@ -466,20 +1301,30 @@ class User:
         )
 
     async def get_webapp_by_domain_name(self, domain_name: str) -> WebApp:
-        """Get a webapp via its domain."""
-        resp = await self.request(
-            "GET",
-            f"/api/v0/user/{self.username}/webapps/{domain_name}/",
-            return_json=True,
-        )
-        return WebApp(resp, self)
+        """Get a webapp via its domain. A domain that was just found missing raises pyaww.NotFound right away."""
+        missing = await self.cache.missing("webapp", domain_name)
+
+        if missing is not None:
+            raise missing
+
+        try:
+            resp = await self.request(
+                "GET",
+                f"/api/v0/user/{self.username}/webapps/{domain_name}/",
+                return_json=True,
+            )
+        except NotFound as e:
+            await self.cache.set_missing("webapp", domain_name, e)
+            raise
+
+        return self.identity.resolve(WebApp, resp, self)
 
     async def webapps(self) -> list[WebApp]:
         """Get webapps for the user."""
         resp = await self.request(
             "GET", f"/api/v0/user/{self.username}/webapps/", return_json=True
         )
-        return [WebApp(i, self) for i in resp]
+        return [self.identity.resolve(WebApp, i, self) for i in resp]
 
     async def create_webapp(self, domain_name: str, python_version: str) -> WebApp:
         """
@@ -504,13 +1349,60 @@ class User:
             return_json=True,
             data=data,
         )  # does not return all the necessary data for pyaww.WebApps init
+        await self.cache.forget_missing("webapp", domain_name)
+
         return await self.get_webapp_by_domain_name(domain_name=domain_name)
 
+    async def export(self) -> dict[str, Any]:
+        """
+        Export the configuration of the account: webapps with their static files, static headers and TLS info,
+        scheduled and always on tasks, default python versions and the system image. Everything is requested
+        concurrently.
+
+        Examples:
+            >>> user = User(...)
+            >>> with open('backup.json', 'w') as f:
+            >>>     json.dump(await user.export(), f)
+
+        Returns:
+            dict[str, Any]: JSON serializable document, versioned by its "version" key
+        """
+        return await export_account(self)
+
+    async def restore(self, document: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        """
+        Recreate an exported configuration on this account. Resources are created, not merged, restore into an account
+        without them. Creations run concurrently, static files and headers once their webapp exists, and each webapp
+        is reloaded once. Paths under the exported home directory and the exported default domain are moved to this
+        account. TLS certificates are not restored, their private keys are not exported.
+
+        Args:
+            document (dict[str, Any]): document returned by User.export
+
+        Examples:
+            >>> user = User(...)
+            >>> with open('backup.json') as f:
+            >>>     await user.restore(json.load(f))
+
+        Returns:
+            dict[str, dict[str, Any]]: by kind (see pyaww.backup.RESTORE_KINDS), the amount of "created" resources and
+                the (name, exception) pairs of the "failed" ones. A failure does not stop the other creations, the
+                static files and headers of a webapp that could not be created fail with its exception.
+
+        Raises:
+            ValueError: if the document has an unsupported version
+        """
+        return await restore_account(self, document)
+
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.session.close()
+        if self.session is not None:
+            await self.session.close()
+
+        # without waiting, a running read may still need the loop (e.g. the BlockingReader of download_tree)
+        self.io_executor.shutdown(wait=False)
 
     def __str__(self):
         return str(self.headers)
@@ -1,2 +1,61 @@
-from pyaww.utils.helper import *
-from pyaww.utils.cache import *
+"""Utilities of the API wrapper, imported lazily (PEP 562) like the attributes of the pyaww package itself."""
+
+# Standard library imports
+
+import importlib
+
+from typing import Any
+
+_LAZY_ATTRIBUTES = {
+    "flatten": ".helper",
+    "route_template": ".helper",
+    "read_chunks": ".helper",
+    "file_payload": ".helper",
+    "pack_tree": ".archive",
+    "unpack_tree": ".archive",
+    "BlockingReader": ".archive",
+    "Cache": ".cache",
+    "TTLCache": ".cache",
+    "ThreadSafeCache": ".cache",
+    "RequestRecord": ".metrics",
+    "RequestMetrics": ".metrics",
+    "prometheus_lines": ".metrics",
+    "RequestContext": ".hooks",
+    "RequestHook": ".hooks",
+    "dispatch_hooks": ".hooks",
+    "OpenTelemetryHook": ".tracing",
+    "BatchLoader": ".loader",
+    "deadline": ".deadlines",
+    "remaining_time": ".deadlines",
+    "CircuitBreaker": ".breaker",
+    "CircuitBreakers": ".breaker",
+    "PriorityScheduler": ".scheduler",
+    "priority": ".scheduler",
+    "current_priority": ".scheduler",
+    "HedgingPolicy": ".hedging",
+    "IdentityMap": ".identity",
+    "Tracked": ".tracking",
+    "UnitOfWork": ".tracking",
+    "FileContentCache": ".content_cache",
+    "StaticTree": ".static_planner",
+    "StaticPlan": ".static_planner",
+    "plan_static_files": ".static_planner",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
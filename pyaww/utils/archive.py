@@ -0,0 +1,121 @@
+"""Archives of local directory trees for the API wrapper"""
+
+# Standard library imports
+
+import asyncio
+import io
+import os
+import tarfile
+
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+if TYPE_CHECKING:
+    import aiohttp
+
+__all__ = ("pack_tree", "unpack_tree", "BlockingReader")
+
+
+def pack_tree(local_dir: str, fileobj: BinaryIO) -> int:
+    """
+    Write a gzip compressed tar archive of a directory tree to a file object, member by member so the archive is
+    never held in memory. Paths are relative to local_dir, symbolic links are archived as the files they point to.
+    Blocking, run it in an executor.
+
+    Args:
+        local_dir (str): directory to pack
+        fileobj (BinaryIO): file object the archive is written to
+
+    Returns:
+        int: amount of regular files packed
+    """
+    count = 0
+
+    with tarfile.open(fileobj=fileobj, mode="w:gz", dereference=True) as tar:
+        for root, dirs, files in os.walk(local_dir):
+            dirs.sort()
+
+            for name in sorted(files):
+                path = os.path.join(root, name)
+
+                if os.path.isfile(path):
+                    tar.add(path, arcname=os.path.relpath(path, local_dir))
+                    count += 1
+
+    return count
+
+
+def unpack_tree(fileobj: BinaryIO, local_dir: str) -> int:
+    """
+    Extract a gzip compressed tar archive read sequentially from a file object, so extraction can start before the
+    whole archive arrived. Only regular files and directories are extracted, and never outside of local_dir.
+    Blocking, run it in an executor.
+
+    Args:
+        fileobj (BinaryIO): file object the archive is read from
+        local_dir (str): directory to extract into, created if missing
+
+    Returns:
+        int: amount of regular files extracted
+
+    Raises:
+        tarfile.TarError: if the archive is corrupted or has a member outside of local_dir
+    """
+    root = os.path.realpath(local_dir)
+    extract_kwargs: dict[str, Any] = (
+        {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+    )
+    count = 0
+
+    os.makedirs(root, exist_ok=True)
+
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            if not (member.isfile() or member.isdir()):
+                continue
+
+            target = os.path.realpath(os.path.join(root, member.name))
+
+            if os.path.commonpath([root, target]) != root:
+                raise tarfile.TarError(f"{member.name!r} is outside of {local_dir}")
+
+            tar.extract(member, root, **extract_kwargs)
+            count += member.isfile()
+
+    return count
+
+
+class BlockingReader(io.RawIOBase):
+    """
+    Blocking, read-only file object over an asyncio stream (such as aiohttp.ClientResponse.content), for a worker
+    thread. Every read waits for the next chunk on the event loop, so the stream is consumed no faster than the
+    thread processes it.
+    """
+
+    def __init__(
+        self, stream: "aiohttp.StreamReader", loop: asyncio.AbstractEventLoop
+    ) -> None:
+        """
+        Args:
+            stream (aiohttp.StreamReader): stream to read, anything with an async readany() method
+            loop (asyncio.AbstractEventLoop): running loop of the stream
+        """
+        super().__init__()
+
+        self._stream = stream
+        self._loop = loop
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:  # type: ignore
+        if not self._buffer:
+            self._buffer = asyncio.run_coroutine_threadsafe(
+                self._stream.readany(), self._loop
+            ).result()
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+
+        return size
@@ -0,0 +1,184 @@
+"""Circuit breaking for the API wrapper"""
+
+# Standard library imports
+
+import asyncio
+import time
+
+from collections import deque
+from typing import Optional
+
+# Related third party imports
+
+import aiohttp
+
+# Local application/library specific imports
+
+from ..errors import CircuitOpen
+from .hooks import RequestContext, RequestHook
+
+__all__ = ("CircuitBreaker", "CircuitBreakers")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of a single route.
+
+    closed: requests go through, outcomes of the last `window_size` requests are tracked. Once at least
+    `minimum_calls` were tracked and the failure rate reaches `failure_rate`, the breaker opens.
+
+    open: requests fail fast with pyaww.CircuitOpen for `reset_timeout` seconds, after which the breaker is half-open.
+
+    half_open: up to `half_open_calls` probe requests go through. A successful probe closes the breaker, a failed one
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        minimum_calls: int = 10,
+        window_size: int = 20,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+    ) -> None:
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, an open breaker turns half-open once reset_timeout passed."""
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probes = 0
+
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        if self.state != self.OPEN:
+            return 0.0
+
+        return self.reset_timeout - (time.monotonic() - self._opened_at)
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now, a half-open breaker counts the request as a probe."""
+        state = self.state
+
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._probes < self.half_open_calls:
+            self._probes += 1
+            return True
+
+        return False
+
+    def record(self, success: bool) -> None:
+        """Record the outcome of a request that was allowed."""
+        if self._state == self.HALF_OPEN:
+            if success:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+
+        self._outcomes.append(success)
+
+        if len(self._outcomes) >= self.minimum_calls:
+            failures = self._outcomes.count(False)
+
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    def cancel(self) -> None:
+        """Give back the probe of an allowed request that was never sent."""
+        if self._state == self.HALF_OPEN and self._probes:
+            self._probes -= 1
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+
+class CircuitBreakers(RequestHook):
+    """
+    Request hook keeping a CircuitBreaker per (method, route template). Server errors (status 500 and above),
+    connection errors and timeouts of sent requests count as failures, cancelled requests as neither (a probe is given
+    back) and anything else as success.
+
+    Every pyaww.User registers one as User.breakers. When a breaker is open, read methods backed by the cache
+    (consoles, get_console_by_id...) return the last known value, marked with `stale = True`, instead of raising.
+    """
+
+    def __init__(self, **breaker_options) -> None:
+        """
+        Args:
+            **breaker_options: options for every CircuitBreaker (failure_rate, minimum_calls...)
+        """
+        self.breaker_options = breaker_options
+        self.breakers: dict[tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, method: str, route: str) -> CircuitBreaker:
+        """Get (or create) the breaker of a route."""
+        key = (method, route)
+
+        if key not in self.breakers:
+            self.breakers[key] = CircuitBreaker(**self.breaker_options)
+
+        return self.breakers[key]
+
+    def states(self) -> dict[str, str]:
+        """State of every breaker, keyed by "METHOD route"."""
+        return {
+            f"{method} {route}": breaker.state
+            for (method, route), breaker in self.breakers.items()
+        }
+
+    def before_request(self, ctx: RequestContext) -> None:
+        breaker = self.get(ctx.method, ctx.route)
+
+        if not breaker.allow():
+            raise CircuitOpen(
+                f"Circuit breaker for {ctx.method} {ctx.route} is open.",
+                route=ctx.route,
+                method=ctx.method,
+                retry_after=breaker.retry_after,
+            )
+
+    def after_request(self, ctx: RequestContext) -> None:
+        self.get(ctx.method, ctx.route).record(ctx.status is None or ctx.status < 500)
+
+    def on_error(self, ctx: RequestContext, error: BaseException) -> None:
+        if isinstance(error, CircuitOpen):
+            return
+
+        breaker = self.get(ctx.method, ctx.route)
+
+        if isinstance(error, asyncio.CancelledError):
+            breaker.cancel()  # neither a success nor a failure, only give the probe back
+            return
+
+        failed = (ctx.status is not None and ctx.status >= 500) or (
+            ctx.sent and isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+        )
+
+        if failed or ctx.sent:
+            breaker.record(not failed)
+        else:
+            breaker.cancel()
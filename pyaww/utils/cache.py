@@ -2,10 +2,17 @@
 
 # Standard library imports
 
+import copy
 import datetime
-import asyncio
+import contextlib
+import json
+import os
+import threading
+import time
+import zlib
 
 from typing import (
+    Callable,
     Optional,
     TYPE_CHECKING,
     Generic,
@@ -14,13 +21,17 @@ from typing import (
     Generator,
     Union,
     Any,
+    ContextManager,
+    Iterable,
 )
 from collections.abc import MutableMapping
 
 # Local application/library specific imports
 
+from .metrics import prometheus_lines
+
 if TYPE_CHECKING:
-    from pyaww import Console, SchedTask
+    from pyaww import Console, SchedTask, AlwaysOnTask, User
 
 KT = TypeVar("KT", bound=Hashable)
 VT = TypeVar("VT")
@@ -36,23 +47,77 @@ def _time(seconds: int) -> datetime.datetime:
     return datetime.datetime.now() + datetime.timedelta(seconds=seconds)
 
 
+SNAPSHOT_MAGIC = b"PYAWWCACHE\x01"
+
+
+def _record(object_: Any) -> dict[str, Any]:
+    """Public fields of a model object, i.e. the API response it was built from."""
+    if isinstance(object_, _LazyRecord):
+        return object_.record
+
+    return {
+        key: value
+        for key, value in vars(object_).items()
+        if not key.startswith("_") and key != "stale"
+    }
+
+
+class _LazyRecord:
+    """A record restored by Cache.load, the model object is only built on first access."""
+
+    __slots__ = ("record", "build")
+
+    def __init__(self, record: dict[str, Any], build: Callable[[dict], Any]) -> None:
+        self.record = record
+        self.build = build
+
+
 class TTLCache(MutableMapping[KT, VT], Generic[KT, VT]):
     """
     TTL (time-to-live) cache for pyaww module. This class is utilised inside pyaww.utils.Cache. Records may expire
     upon interacting with them (__getitem__ and __contains__.)
 
     Ordinary format for the cache instance variable is the submodule initialized class id and the initialized class.
+
+    Lookups through __getitem__ (and thus .get) are counted; a lookup that finds an expired record counts as a stale
+    hit and evicts the record.
+
+    Besides single records, the cache remembers the ids of the last complete list result (the "collection") together
+    with the generation it was fetched in. Any change to the remote collection (creating, updating, deleting) must bump
+    the generation via TTLCache.invalidate, after which the collection is no longer served.
     """
 
     def __init__(self, ttl_time: int = 30):
         self.ttl = ttl_time
         self.cache: dict[KT, tuple[VT, bool, datetime.datetime]] = {}
 
+        self.generation = 0
+        self.collection: Optional[tuple[list[KT], int]] = None
+
+        # last known values, kept past their expiry to be served when the API is unavailable
+        self.last_known: dict[KT, VT] = {}
+        self.last_collection: Optional[list[KT]] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
     def __getitem__(self, item: KT) -> VT:
-        if item not in self:
-            raise KeyError
+        try:
+            value, _, dt = self.cache[item]
+        except KeyError:
+            self.misses += 1
+            raise KeyError(item) from None
 
-        return self.cache[item][0]
+        if _check_if_expired(dt):
+            self.stale_hits += 1
+            self.evictions += 1
+            self.cache.pop(item, None)
+            raise KeyError(item)
+
+        self.hits += 1
+        return self._materialize(item, value)
 
     def __contains__(self, item) -> bool:
         try:
@@ -79,17 +144,145 @@ class TTLCache(MutableMapping[KT, VT], Generic[KT, VT]):
     def __str__(self) -> str:
         return str(self.cache)
 
-    async def natural_values(self) -> list[VT]:
+    def _materialize(self, key: KT, value: Any) -> VT:
+        """Build the object of a record restored by Cache.load, other values are returned as they are."""
+        if not isinstance(value, _LazyRecord):
+            return value
+
+        object_ = value.build(value.record)
+
+        if key in self.cache and self.cache[key][0] is value:
+            self.cache[key] = (object_,) + self.cache[key][1:]  # type: ignore
+        if self.last_known.get(key) is value:
+            self.last_known[key] = object_
+
+        return object_
+
+    def restore(self, key: KT, value: Any, allow_all_usage: bool, ttl: float) -> None:
+        """Set a record that expires in `ttl` seconds, used by Cache.load."""
+        self.cache[key] = (value, allow_all_usage, _time(ttl))  # type: ignore
+        self.last_known[key] = value
+
+    def update_many(self, objects: Iterable[Any], allow_all_usage: bool) -> None:
+        """
+        Set several records in one go, all of them share the same expiry time. Records are keyed by their `id`.
+
+        Args:
+            objects (Iterable[Any]): objects to be set
+            allow_all_usage (bool): see Cache.set
+        """
+        expires = _time(self.ttl)
+        self.cache.update(
+            {object_.id: (object_, allow_all_usage, expires) for object_ in objects}
+        )
+        self.last_known.update({object_.id: object_ for object_ in objects})
+
+    def set_collection(self, objects: list[Any], generation: int) -> None:
+        """
+        Store a complete list result. It only becomes the collection if no change happened since `generation`, the
+        last known values of objects no longer in it are then dropped.
+
+        Args:
+            objects (list[Any]): every object of the remote collection
+            generation (int): TTLCache.generation read before the list was requested
+        """
+        self.update_many(objects, True)
+        self.last_collection = [object_.id for object_ in objects]
+
+        if generation == self.generation:
+            self.collection = (self.last_collection[:], generation)
+            self.last_known = {
+                key: self.last_known[key] for key in self.last_collection
+            }
+
+    def invalidate(self) -> None:
+        """Mark the remote collection as changed, the stored collection will no longer be served."""
+        self.generation += 1
+        self.collection = None
+
+    def expire(self) -> None:
+        """Remove the expired records, lookups only evict the records they find expired."""
+        for key in [
+            key for key, (_, _, dt) in self.cache.items() if _check_if_expired(dt)
+        ]:
+            del self.cache[key]
+            self.evictions += 1
+
+    def discard(self, key: KT) -> None:
+        """Remove a record if it is present."""
+        self.cache.pop(key, None)
+        self.last_known.pop(key, None)
+
+        if self.last_collection is not None and key in self.last_collection:
+            self.last_collection.remove(key)
+
+    def stale(self, key: Optional[KT] = None) -> Optional[Union[VT, list[VT]]]:
+        """
+        Return the last known value of a record (or of the collection if key is None), expired or not.
+
+        Returns:
+            Optional[Union[VT, list[VT]]]: last known value, None if there is none
+        """
+        if key is not None:
+            return self._materialize(key, self.last_known.get(key))
+
+        if self.last_collection is None:
+            return None
+
+        return [
+            self._materialize(key, self.last_known[key]) for key in self.last_collection
+        ]
+
+    def stats(self) -> dict[str, Union[int, float]]:
+        """
+        Return counters and the current state of the cache.
+
+        Returns:
+            dict[str, Union[int, float]]: hits, misses, stale_hits, evictions, size (unexpired records) and mean_age
+            (seconds since unexpired records were set)
+        """
+        now = datetime.datetime.now()
+        ages = [
+            (now - dt).total_seconds() + self.ttl
+            for _, _, dt in self.cache.values()
+            if dt > now
+        ]
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "size": len(ages),
+            "mean_age": sum(ages) / len(ages) if ages else 0.0,
+        }
+
+    async def natural_values(self) -> Optional[list[VT]]:
+        """
+        Return the collection if it is current and none of its records expired.
+
+        Returns:
+            Optional[list[VT]]: objects of the collection, None if there is no usable collection
+        """
+        if self.collection is None or self.collection[1] != self.generation:
+            return None
+
         to_return: list[VT] = []
 
-        for x in self.cache.values():
-            if x[1]:
-                to_return.append(x[0])
+        for key in self.collection[0]:
+            record = self.cache.get(key)
+
+            if record is None or _check_if_expired(record[2]):
+                return None
+
+            to_return.append(self._materialize(key, record[0]))
 
         return to_return
 
 
 class Cache:
+    negative_ttl = 5
+
     def __init__(self):
         """
         Main caching class for the module.
@@ -98,12 +291,27 @@ class Cache:
         instance variable. Alongside each type, an instance variable (format: _type_cache) representing its cache will
         be created with the value being initialized pyaww.TTLCache.
 
-        Anti-race-condition measures are taken into count here via asyncio.Lock().
+        All cache operations are synchronous dict updates, so within a single event loop they can not interleave and no
+        lock is taken. To share a cache between threads (or event loops running in different threads) use
+        pyaww.ThreadSafeCache, which guards every submodule with its own lock.
+
+        Hit / miss counters are kept per submodule, see Cache.stats and Cache.prometheus.
+
+        Besides the objects themselves, the cache keeps short-lived negative entries: lookups that raised
+        pyaww.NotFound (see Cache.missing) and the sharing status of files (see Cache.sharing). They expire after
+        `negative_ttl` seconds and are dropped by the calls that may change them (create_*, share, unshare...).
         """
-        self.lock = asyncio.Lock()
+        self.lock_waits = 0
+        self.lock_wait_time = 0.0
+        self._all_hits: dict[str, int] = {}
+        self._all_misses: dict[str, int] = {}
 
         self._console_cache: TTLCache[int, "Console"] = TTLCache()
         self._sched_task_cache: TTLCache[int, "SchedTask"] = TTLCache()
+        self._always_on_task_cache: TTLCache[int, "AlwaysOnTask"] = TTLCache()
+        self._negative_cache: TTLCache[tuple[Hashable, ...], Any] = TTLCache(
+            self.negative_ttl
+        )
 
         self.use_cache = True
         self.disable_cache_for_identifier = set()
@@ -112,15 +320,30 @@ class Cache:
         self._submodule_dict: dict[str, TTLCache] = {
             "console": self._console_cache,
             "sched_task": self._sched_task_cache,
+            "always_on_task": self._always_on_task_cache,
         }  # PA support 3.10 smh
 
     async def all(self, submodule: str) -> Optional[list[Any]]:
+        """
+        Get the cached list result of a submodule.
+
+        Returns:
+            Optional[list[Any]]: the complete and current list (may be empty), None if it has to be requested
+        """
         type_ = self._submodule_dict[submodule]
 
         if submodule in self.disable_cache_for_module or not self.use_cache:
             return None
 
-        return await type_.natural_values()
+        with self._locked(submodule):
+            values = await type_.natural_values()
+
+        if values is not None:
+            self._all_hits[submodule] = self._all_hits.get(submodule, 0) + 1
+        else:
+            self._all_misses[submodule] = self._all_misses.get(submodule, 0) + 1
+
+        return values
 
     async def get(self, submodule: str, id_: int) -> Optional[Any]:
         type_ = self._submodule_dict[submodule]
@@ -132,19 +355,135 @@ class Cache:
         ):
             return None
 
-        return type_.get(id_, None)
+        with self._locked(submodule):
+            return type_.get(id_, None)
 
     async def pop(self, submodule: str, id_: int) -> None:
         type_ = self._submodule_dict[submodule]
 
-        async with self.lock:
-            type_.pop(id_)
+        with self._locked(submodule):
+            type_.discard(id_)
+            type_.invalidate()
+
+    async def discard(self, submodule: str, id_: int) -> None:
+        """Drop a record known to be gone from the remote collection, the collection itself stays usable."""
+        type_ = self._submodule_dict[submodule]
+
+        with self._locked(submodule):
+            type_.discard(id_)
+
+    async def stale(self, submodule: str, id_: Optional[int] = None) -> Optional[Any]:
+        """
+        Get the last known value of a record, or of the list if id_ is None, even if it expired. The returned objects
+        are marked with `stale = True`. Used to keep serving reads while the API is unavailable.
+
+        Returns:
+            Optional[Any]: the object(s), None if nothing is known (or caching is disabled)
+        """
+        if (
+            submodule in self.disable_cache_for_module
+            or not self.use_cache
+            or id_ in self.disable_cache_for_identifier
+        ):
+            return None
+
+        with self._locked(submodule):
+            value = self._submodule_dict[submodule].stale(id_)
+
+        for object_ in value if isinstance(value, list) else [value]:
+            if object_ is not None:
+                object_.stale = True
+
+        return value
+
+    def _negative_usable(self, kind: str, key: Hashable) -> bool:
+        return (
+            self.use_cache
+            and kind not in self.disable_cache_for_module
+            and key not in self.disable_cache_for_identifier
+        )
+
+    async def missing(self, kind: str, key: Hashable) -> Optional[Exception]:
+        """
+        Get the error of a recent lookup that found nothing.
+
+        Args:
+            kind (str): what was looked up, a submodule or "webapp"
+            key (Hashable): id (or domain name) that was looked up
+
+        Returns:
+            Optional[Exception]: a copy of the pyaww.NotFound raised by the lookup, None if no miss is cached
+
+        Examples:
+            >>> error = await cache.missing("console", id_)
+            >>> if error is not None:
+            >>>     raise error
+        """
+        if not self._negative_usable(kind, key):
+            return None
+
+        with self._locked("negative"):
+            error = self._negative_cache.get(("missing", kind, key))
+
+        return copy.copy(error)
+
+    async def set_missing(self, kind: str, key: Hashable, error: Exception) -> None:
+        """Remember that a lookup found nothing, see Cache.missing."""
+        if not self._negative_usable(kind, key):
+            return
+
+        with self._locked("negative"):
+            self._negative_cache.expire()  # misses of ids that are never looked up again
+            # a copy has no traceback, which would keep the frames of the request alive
+            self._negative_cache[("missing", kind, key)] = (copy.copy(error), False)
+
+    async def forget_missing(self, kind: str, key: Optional[Hashable] = None) -> None:
+        """Drop the cached misses of a key (or of every key if None), call it whenever such an object is created."""
+        with self._locked("negative"):
+            self._negative_cache.expire()
+
+            for entry in list(self._negative_cache):
+                if entry[:2] == ("missing", kind) and key in (None, entry[2]):
+                    del self._negative_cache[entry]
+
+    async def sharing(self, path: str) -> Optional[bool]:
+        """Get the recently seen sharing status of a file, None if it is not cached."""
+        if not self._negative_usable("sharing", path):
+            return None
+
+        with self._locked("negative"):
+            return self._negative_cache.get(("sharing", path))
+
+    async def set_sharing(self, path: str, shared: Optional[bool]) -> None:
+        """Remember the sharing status of a file, None forgets it."""
+        with self._locked("negative"):
+            if shared is None:
+                self._negative_cache.pop(("sharing", path), None)
+            elif self._negative_usable("sharing", path):
+                self._negative_cache[("sharing", path)] = (shared, False)
+
+    def generation(self, submodule: str) -> int:
+        """
+        Current generation of a submodule, read it before requesting a list and pass it to Cache.set.
+
+        Examples:
+            >>> generation = cache.generation("console")
+            >>> consoles = ...  # request the list
+            >>> await cache.set("console", consoles, allow_all_usage=True, generation=generation)
+        """
+        return self._submodule_dict[submodule].generation
+
+    async def invalidate(self, submodule: str) -> None:
+        """Bump the generation of a submodule, call it whenever its remote collection changes."""
+        with self._locked(submodule):
+            self._submodule_dict[submodule].invalidate()
 
     async def set(
         self,
         submodule: str,
         object_: Union[Any, list[Any]],
         allow_all_usage: bool = False,
+        generation: Optional[int] = None,
     ) -> None:
         """
         Set something in the cache.
@@ -152,22 +491,243 @@ class Cache:
         Args:
             submodule (str): cached submodule from the pyaww dir
             object_ (Union[Any, list[Any]): object to set in cache
-            allow_all_usage (bool): if set to true it will appear in the list that Cache.all returns.
+            allow_all_usage (bool): if set to true, object_ is the complete list and becomes what Cache.all returns
+            generation (Optional[int]): Cache.generation read before the list was requested, defaults to the current one
 
         Further explanation on allow_all_usage argument:
             The reason for this argument is because the submodules' cache may be innacurate if the creator method
             (e.g create_console) is called before the list method (e.g consoles) since, creator method will populate the
             cache and list methods cache call statement will not evaluate to None and thus the request won't be called,
             potentionally missing out some API results.
+
+            A list is only served by Cache.all while the generation it was requested in is current. If the collection
+            changed while the list was being requested, its records are still cached but the list itself is not.
+
+        Lists are written in bulk, with a single expiry time for all of their records.
         """
         type_ = self._submodule_dict[submodule]
 
         if submodule in self.disable_cache_for_module or not self.use_cache:
             return
 
-        async with self.lock:
-            if not isinstance(object_, list):
-                object_ = [object_]
+        if not isinstance(object_, list):
+            object_ = [object_]
+
+        with self._locked(submodule):
+            if allow_all_usage:
+                type_.set_collection(
+                    object_, type_.generation if generation is None else generation
+                )
+            else:
+                type_.update_many(object_, allow_all_usage)
+
+    def _locked(self, submodule: str) -> ContextManager:
+        """Context manager guarding a submodule, nothing needs guarding within a single event loop."""
+        return contextlib.nullcontext()
 
-            for object_ in object_:
-                type_[object_.id] = (object_, allow_all_usage)
+    def stats(self) -> dict[str, Any]:
+        """
+        Return a snapshot of the cache statistics.
+
+        Returns:
+            dict[str, Any]: per submodule TTLCache.stats (plus `all_hits` / `all_misses` for Cache.all), the
+            TTLCache.stats of the negative entries and the lock wait statistics
+
+        Examples:
+            >>> user = User(...)
+            >>> user.cache.stats()["console"]["hits"]
+        """
+        stats: dict[str, Any] = {
+            submodule: {
+                **type_.stats(),
+                "all_hits": self._all_hits.get(submodule, 0),
+                "all_misses": self._all_misses.get(submodule, 0),
+            }
+            for submodule, type_ in self._submodule_dict.items()
+        }
+        stats["negative"] = self._negative_cache.stats()
+        stats["lock"] = {
+            "acquisitions": self.lock_waits,
+            "wait_time": self.lock_wait_time,
+        }
+
+        return stats
+
+    def prometheus(self) -> str:
+        """Return Cache.stats in the Prometheus text format."""
+        stats = self.stats()
+        lines = []
+
+        for key, type_, help_ in (
+            ("hits", "counter", "Cache lookups that found a fresh record."),
+            ("misses", "counter", "Cache lookups that found no record."),
+            ("stale_hits", "counter", "Cache lookups that found an expired record."),
+            ("evictions", "counter", "Expired records removed from the cache."),
+            ("all_hits", "counter", "Cache.all calls served from the cache."),
+            (
+                "all_misses",
+                "counter",
+                "Cache.all calls that had to fall back to the API.",
+            ),
+            ("size", "gauge", "Unexpired records in the cache."),
+            ("mean_age", "gauge", "Mean age of unexpired records in seconds."),
+        ):
+            lines += prometheus_lines(
+                f"pyaww_cache_{key}",
+                help_,
+                type_,
+                (
+                    ({"submodule": submodule}, stats[submodule][key])
+                    for submodule in self._submodule_dict
+                ),
+            )
+
+        lines += prometheus_lines(
+            "pyaww_cache_lock_wait_seconds_total",
+            "Time spent waiting for the submodule locks of a ThreadSafeCache.",
+            "counter",
+            [({}, self.lock_wait_time)],
+        )
+
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> int:
+        """
+        Save the unexpired records of every submodule, with their remaining TTL, to a file. Current list results are
+        saved too. The file is zlib compressed JSON behind a magic header and is replaced atomically.
+
+        Args:
+            path (str): file to write
+
+        Returns:
+            int: amount of records saved
+
+        Examples:
+            >>> user.cache.dump("/tmp/pyaww.cache")  # before the process exits
+            >>> user.cache.load("/tmp/pyaww.cache", user)  # in the next one
+        """
+        now = datetime.datetime.now()
+        submodules = {}
+
+        for submodule, type_ in self._submodule_dict.items():
+            with self._locked(submodule):
+                records = [
+                    [_record(value), allow_all_usage, (dt - now).total_seconds()]
+                    for value, allow_all_usage, dt in type_.cache.values()
+                    if dt > now
+                ]
+                collection = (
+                    type_.collection[0]
+                    if type_.collection is not None
+                    and type_.collection[1] == type_.generation
+                    else None
+                )
+
+            submodules[submodule] = {"records": records, "collection": collection}
+
+        payload = json.dumps(
+            {"created": time.time(), "submodules": submodules}, separators=(",", ":")
+        ).encode()
+        temporary = f"{path}.{os.getpid()}.tmp"
+
+        with open(temporary, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + zlib.compress(payload))
+
+        os.replace(temporary, path)
+
+        return sum(len(submodule["records"]) for submodule in submodules.values())
+
+    def load(self, path: str, user: "User") -> int:
+        """
+        Restore the records saved by Cache.dump, minus the time passed since. The model objects are only built (through
+        User.identity) when a record is first accessed.
+
+        Args:
+            path (str): file written by Cache.dump
+            user (User): user the objects belong to
+
+        Returns:
+            int: amount of records restored (expired ones are skipped)
+
+        Raises:
+            ValueError: if the file is not a cache snapshot
+        """
+        from ..always_on_task import AlwaysOnTask
+        from ..console import Console
+        from ..sched_task import SchedTask
+
+        models = {
+            "console": Console,
+            "sched_task": SchedTask,
+            "always_on_task": AlwaysOnTask,
+        }
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError(f"{path} is not a pyaww cache snapshot")
+
+        snapshot = json.loads(zlib.decompress(data[len(SNAPSHOT_MAGIC) :]))
+        elapsed = time.time() - snapshot["created"]
+        restored = 0
+
+        for submodule, saved in snapshot["submodules"].items():
+            type_ = self._submodule_dict.get(submodule)
+
+            if type_ is None or submodule in self.disable_cache_for_module:
+                continue
+
+            def build(record: dict, cls: type = models[submodule]) -> Any:
+                return user.identity.resolve(cls, record, user)
+
+            with self._locked(submodule):
+                for record, allow_all_usage, ttl in saved["records"]:
+                    if ttl - elapsed > 0:
+                        type_.restore(
+                            record["id"],
+                            _LazyRecord(record, build),
+                            allow_all_usage,
+                            ttl - elapsed,
+                        )
+                        restored += 1
+
+                collection = saved["collection"]
+
+                if collection is not None and all(key in type_ for key in collection):
+                    type_.collection = (collection, type_.generation)
+                    type_.last_collection = list(collection)
+
+        return restored
+
+
+class ThreadSafeCache(Cache):
+    """
+    pyaww.Cache that can be shared between threads, for example by several pyaww.User's living in different event
+    loops. Every submodule is guarded by its own threading.Lock so writes to different submodules never contend.
+    The cached objects stay bound to the user that stored them, a user reading them gets its own objects built from
+    their fields (see User._own).
+
+    Examples:
+        >>> cache = ThreadSafeCache()
+        >>> user = User(..., cache=cache)
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self._locks: dict[str, threading.Lock] = {
+            submodule: threading.Lock()
+            for submodule in [*self._submodule_dict, "negative"]
+        }
+
+    @contextlib.contextmanager
+    def _locked(self, submodule: str) -> Generator:
+        """Acquire the submodule lock while accounting the time spent waiting for it."""
+        lock = self._locks[submodule]
+        started = time.perf_counter()
+
+        with lock:
+            self.lock_waits += 1
+            self.lock_wait_time += time.perf_counter() - started
+            yield
@@ -0,0 +1,308 @@
+"""On-disk cache of file contents for the API wrapper"""
+
+# Standard library imports
+
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from pyaww import User
+
+__all__ = ("FileContentCache",)
+
+
+class FileContentCache:
+    """
+    Optional on-disk cache of File.read results, pass it to pyaww.User to enable it.
+
+    Contents are stored (UTF-8 encoded) once per distinct content, in blobs named after their SHA-256, and indexed by
+    (account, path).
+    When the blobs take more than `max_bytes` the least recently read paths are evicted. Blobs of at least
+    `mmap_threshold` bytes are read memory-mapped, in User.io_executor. Contents are stored (and dropped) there too,
+    the lock guarding the index is never held while the disk is written.
+
+    Writes made through the same user (User.create_file, File.update, File.delete) drop the cached content of the path,
+    and a read already in flight then does not store what it got. Changes made elsewhere (the web interface, a console...) are not seen until `max_age` seconds passed, if set.
+
+    Examples:
+        >>> user = User(..., content_cache=FileContentCache("~/.cache/pyaww/files"))
+        >>> file = await user.get_file_by_path('/home/yourname/config.ini')
+        >>> await file.read()  # downloaded
+        >>> await file.read()  # read from the disk
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        mmap_threshold: int = 1024 * 1024,
+        max_age: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            directory (str): directory of the blobs and the index, created if missing
+            max_bytes (int): maximum total size of the blobs
+            mmap_threshold (int): size from which blobs are read memory-mapped in a worker thread
+            max_age (Optional[float]): seconds after which a cached content is downloaded again, None for never
+        """
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self.max_age = max_age
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()  # guards the index, never held during disk I/O
+        self._save_lock = threading.Lock()  # serializes writes of index.json
+        self._versions: dict[str, int] = {}  # times the content of a path was discarded
+        self._changes = 0  # index changes, the saved index must not be older than the last one saved
+        self._saved = 0
+        self._index_path = os.path.join(self.directory, "index.json")
+        os.makedirs(os.path.join(self.directory, "blobs"), exist_ok=True)
+
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                self._index: dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+
+    @staticmethod
+    def _key(user: "User", path: str) -> str:
+        return f"{'eu' if user.from_eu else 'www'}:{user.username}:{path}"
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "blobs", digest[:2], digest)
+
+    def _snapshot(self) -> tuple[int, dict[str, dict]]:
+        """Copy of the index to be saved after the lock is released. The lock must be held."""
+        self._changes += 1
+
+        return self._changes, {key: dict(entry) for key, entry in self._index.items()}
+
+    def _save_index(self, snapshot: tuple[int, dict[str, dict]]) -> None:
+        number, index = snapshot
+        temporary = f"{self._index_path}.{os.getpid()}.tmp"
+
+        with self._save_lock:
+            if number <= self._saved:  # a newer index was saved meanwhile
+                return
+
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+
+            os.replace(temporary, self._index_path)
+            self._saved = number
+
+    def _delete_blobs(self, digests: list[str]) -> None:
+        for digest in digests:
+            try:
+                os.remove(self._blob_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _total_bytes(self) -> int:
+        blobs = {entry["hash"]: entry["size"] for entry in self._index.values()}
+
+        return sum(blobs.values())
+
+    def _remove(self, key: str) -> Optional[dict]:
+        """
+        Drop an index entry, returns it if no other path has the same content: its blob is to be deleted (once the
+        lock is released). The lock must be held.
+        """
+        entry = self._index.pop(key, None)
+
+        if entry is None or any(
+            other["hash"] == entry["hash"] for other in self._index.values()
+        ):
+            return None
+
+        return entry
+
+    def _read_blob(self, digest: str, size: int) -> str:
+        with open(self._blob_path(digest), "rb") as f:
+            if size < self.mmap_threshold or size == 0:
+                return f.read().decode()
+
+            # decoded straight from the mapping, the str is the only copy (f.read().decode() makes two)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, "utf-8")
+
+    async def get(self, user: "User", path: str) -> Optional[str]:
+        """
+        Get the cached content of a path.
+
+        Returns:
+            Optional[str]: the content, None if it is not cached (or too old)
+        """
+        key = self._key(user, path)
+        expired = None
+
+        with self._lock:
+            entry = self._index.get(key)
+
+            if (
+                entry is not None
+                and self.max_age is not None
+                and time.time() - entry["stored"] > self.max_age
+            ):
+                expired = self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+            else:
+                entry["used"] = time.time()
+                self.hits += 1
+
+        if entry is None:
+            if expired is not None:
+                await asyncio.get_running_loop().run_in_executor(
+                    user.io_executor, self._delete_blobs, [expired["hash"]]
+                )
+            return None
+
+        args = (entry["hash"], entry["size"])
+
+        try:
+            if entry["size"] >= self.mmap_threshold:
+                return await asyncio.get_running_loop().run_in_executor(
+                    user.io_executor, self._read_blob, *args
+                )
+
+            return self._read_blob(*args)
+        except FileNotFoundError:  # removed by another process sharing the directory
+            await self.discard(user, path)
+            return None
+
+    def version(self, user: "User", path: str) -> int:
+        """Version of the content of a path, take it before downloading the content and pass it to put."""
+        with self._lock:
+            return self._versions.get(self._key(user, path), 0)
+
+    def _stale(self, key: str, version: Optional[int]) -> bool:
+        """Whether the path was written or deleted while the content was downloaded. The lock must be held."""
+        return version is not None and self._versions.get(key, 0) != version
+
+    def _put(self, key: str, content: bytes, version: Optional[int]) -> None:
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+
+        with self._lock:
+            if self._stale(key, version):
+                return
+
+        # blobs are named after their content, writing one again is harmless
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            temporary = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+            with open(temporary, "wb") as f:
+                f.write(content)
+
+            os.replace(temporary, blob_path)
+
+        removed: list[Optional[dict]] = []
+
+        with self._lock:
+            if self._stale(key, version):
+                if all(entry["hash"] != digest for entry in self._index.values()):
+                    removed.append({"hash": digest})
+                snapshot = None
+            else:
+                if self._index.get(key, {}).get("hash") != digest:
+                    removed.append(self._remove(key))
+
+                now = time.time()
+                self._index[key] = {
+                    "hash": digest,
+                    "size": len(content),
+                    "stored": now,
+                    "used": now,
+                }
+
+                total = self._total_bytes()
+
+                # least recently used first, the entry just stored goes last
+                for old_key in sorted(
+                    self._index, key=lambda k: self._index[k]["used"]
+                ):
+                    if total <= self.max_bytes or old_key == key:
+                        break
+
+                    entry = self._remove(old_key)
+                    self.evictions += 1
+
+                    if entry is not None:
+                        removed.append(entry)
+                        total -= entry["size"]
+
+                snapshot = self._snapshot()
+
+        self._delete_blobs([entry["hash"] for entry in removed if entry is not None])
+
+        if snapshot is not None:
+            self._save_index(snapshot)
+
+    async def put(
+        self, user: "User", path: str, content: str, version: Optional[int] = None
+    ) -> None:
+        """
+        Store the content of a path, in User.io_executor.
+
+        Args:
+            user (User): user the file belongs to
+            path (str): path of the file
+            content (str): content as read
+            version (Optional[int]): result of version from before the download, the content is not stored if the
+                path was discarded since
+        """
+        encoded = content.encode()
+
+        if len(encoded) > self.max_bytes:
+            return
+
+        await asyncio.get_running_loop().run_in_executor(
+            user.io_executor, self._put, self._key(user, path), encoded, version
+        )
+
+    async def discard(self, user: "User", path: str) -> None:
+        """Drop the cached content of a path, called whenever the path is written or deleted."""
+        await asyncio.get_running_loop().run_in_executor(
+            user.io_executor, self._discard, self._key(user, path)
+        )
+
+    def _discard(self, key: str) -> None:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+            if key not in self._index:
+                return
+
+            removed = self._remove(key)
+            snapshot = self._snapshot()
+
+        if removed is not None:
+            self._delete_blobs([removed["hash"]])
+
+        self._save_index(snapshot)
+
+    def stats(self) -> dict[str, int]:
+        """Reads served from the disk (hits), downloaded ones (misses), evicted paths, cached paths and their bytes."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._index),
+                "bytes": self._total_bytes(),
+            }
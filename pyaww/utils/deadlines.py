@@ -0,0 +1,50 @@
+"""Deadlines for the API wrapper"""
+
+# Standard library imports
+
+import contextlib
+import contextvars
+import time
+
+from typing import Iterator, Optional
+
+__all__ = ("deadline", "remaining_time")
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "pyaww_deadline", default=None
+)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Bound every request made within the block (in the current task and the tasks it creates) to finish within
+    `seconds`, including time spent waiting for a request slot. Nested deadlines can only shorten the outer one.
+
+    Args:
+        seconds (float): time budget for the whole block
+
+    Examples:
+        >>> user = User(...)
+        >>> with user.deadline(10):
+        >>>     async for path in user.listdir('/home/yourname/', recursive=True):
+        >>>         ...
+    """
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left until the active deadline (possibly negative), None if there is none."""
+    expires = _deadline.get()
+
+    if expires is None:
+        return None
+
+    return expires - time.monotonic()
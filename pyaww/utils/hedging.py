@@ -0,0 +1,84 @@
+"""Request hedging for the API wrapper"""
+
+# Standard library imports
+
+from collections import deque
+from typing import Optional
+
+# Local application/library specific imports
+
+from .hooks import RequestContext, RequestHook
+
+__all__ = ("HedgingPolicy",)
+
+
+class HedgingPolicy(RequestHook):
+    """
+    Opt-in hedging of idempotent GET requests, pass it to pyaww.User to enable it.
+
+    If a GET has not finished within the observed `percentile` latency of its route, an identical request is sent
+    and whichever finishes first is used, the other one is cancelled. Latencies are learned per route template from
+    the last `window` successful GETs, no hedging happens before `min_samples` of them were seen. Every GET earns
+    `max_hedge_ratio` of a hedge, so at most that share of requests (plus a small burst) is ever duplicated.
+
+    Examples:
+        >>> user = User(..., hedging=HedgingPolicy())
+        >>> await user.get_cpu_info()
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_hedge_ratio: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        burst: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            percentile (float): latency percentile after which a hedge is sent
+            max_hedge_ratio (float): maximum share of GET requests that are hedged
+            min_samples (int): latencies needed for a route before it is hedged
+            window (int): latencies kept per route
+            burst (float): hedges that can be saved up
+        """
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.window = window
+        self.burst = burst
+
+        self.hedges = 0
+        self._budget = 0.0
+        self._latencies: dict[str, deque[float]] = {}
+
+    def delay(self, route: str) -> Optional[float]:
+        """
+        Seconds to wait before hedging a request of the route, None if it should not be hedged (yet). Every call
+        counts as a request towards the hedge budget.
+        """
+        self._budget = min(self._budget + self.max_hedge_ratio, self.burst)
+        latencies = self._latencies.get(route)
+
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+
+        ordered = sorted(latencies)
+        return ordered[int(self.percentile * (len(ordered) - 1))]
+
+    def acquire(self) -> bool:
+        """Take a hedge from the budget, False if there is none left."""
+        if self._budget < 1:
+            return False
+
+        self._budget -= 1
+        self.hedges += 1
+        return True
+
+    def after_request(self, ctx: RequestContext) -> None:
+        if ctx.method != "GET":
+            return
+
+        self._latencies.setdefault(ctx.route, deque(maxlen=self.window)).append(
+            ctx.queue_time + ctx.latency
+        )
@@ -2,7 +2,18 @@
 
 # Standard library imports
 
-from typing import Any, AsyncIterator
+import asyncio
+import codecs
+import io
+import os
+import stat
+
+from concurrent.futures import Executor
+from typing import IO, Any, AsyncIterator, Optional
+
+# Related third party imports
+
+import aiohttp
 
 
 async def flatten(items: Any) -> AsyncIterator:
@@ -25,3 +36,124 @@ async def flatten(items: Any) -> AsyncIterator:
                 yield x
     except TypeError:
         yield items
+
+
+async def read_chunks(
+    file: IO, executor: Optional[Executor] = None, chunk_size: int = 256 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Read a local file in chunks without blocking the event loop, every read runs in the executor. Text is encoded as
+    UTF-8. The file is not closed.
+
+    Args:
+        file (IO): text or binary file object
+        executor (Optional[Executor]): executor to read in, the loop's default executor if None
+        chunk_size (int): characters or bytes per read
+
+    Returns:
+        AsyncIterator[bytes]: the chunks
+    """
+    loop = asyncio.get_running_loop()
+
+    while True:
+        chunk = await loop.run_in_executor(executor, file.read, chunk_size)
+
+        if not chunk:
+            return
+
+        yield chunk.encode() if isinstance(chunk, str) else chunk
+
+
+class _ChunksPayload(aiohttp.payload.AsyncIterablePayload):
+    """Chunks of a local file, of a known size or None."""
+
+    def __init__(self, chunks: AsyncIterator[bytes], size: Optional[int]) -> None:
+        super().__init__(chunks)
+        self._known_size = size
+
+    @property
+    def size(self) -> Optional[int]:
+        return self._known_size
+
+
+def file_payload(
+    file: IO, executor: Optional[Executor] = None
+) -> aiohttp.payload.Payload:
+    """
+    Request payload reading a local file with read_chunks. The remaining size of binary regular files is known, so
+    the request keeps its Content-Length like with aiohttp's own file payloads. UTF-8 text files are sent as the bytes
+    of their underlying buffer, which keeps it too. The size of other text is only known once encoded (as UTF-8), it
+    is sent with chunked transfer encoding instead.
+
+    Args:
+        file (IO): text or binary file object
+        executor (Optional[Executor]): executor to read in, the loop's default executor if None
+
+    Returns:
+        aiohttp.payload.Payload: the payload
+    """
+    size = None
+    source: IO = file
+
+    if (
+        isinstance(file, io.TextIOWrapper)
+        and codecs.lookup(file.encoding).name == "utf-8"
+    ):
+        try:
+            # drops read-ahead, the buffer then starts where the text does
+            file.seek(file.tell())
+            source = file.buffer
+        except (OSError, ValueError):  # not seekable
+            pass
+
+    binary = not isinstance(source, io.TextIOBase)
+
+    if binary:
+        try:
+            status = os.fstat(source.fileno())
+
+            if stat.S_ISREG(status.st_mode):
+                size = status.st_size - source.tell()
+        except (
+            AttributeError,
+            OSError,
+            ValueError,
+        ):  # not a real file, e.g. io.BytesIO
+            pass
+
+    return _ChunksPayload(read_chunks(source, executor), size)
+
+
+# Path segments that are followed by a caller supplied identifier (domain name, student name...) rather than a
+# numeric id, e.g. /webapps/<domain_name>/ or /students/<student>.
+_NAMED_SEGMENTS = {"webapps": "{domain_name}", "students": "{student}"}
+
+
+def route_template(url: str, username: str) -> str:
+    """
+    Turn a concrete API URL into its route template so metrics and hooks can be grouped per endpoint rather than
+    per resource. For example, `/api/v0/user/bob/consoles/5/` becomes `/api/v0/user/{username}/consoles/{id}/`.
+
+    Args:
+        url (str): URL (without the host) that was requested
+        username (str): username of the account, replaced with a placeholder
+
+    Returns:
+        str: templated route, query string stripped
+    """
+    path = url.split("?", 1)[0]
+
+    if "/files/path/" in path:
+        path = path.split("/files/path/", 1)[0] + "/files/path/{path}"
+
+    segments = path.split("/")
+
+    for index, segment in enumerate(segments):
+        if segment == username and segments[index - 1] == "user":
+            segments[index] = "{username}"
+        elif segment.isdigit():
+            segments[index] = "{id}"
+        elif segment and segments[index - 1] in _NAMED_SEGMENTS:
+            segments[index] = _NAMED_SEGMENTS[segments[index - 1]]
+
+    return "/".join(segments)
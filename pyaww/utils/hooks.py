@@ -0,0 +1,108 @@
+"""Request instrumentation hooks for the API wrapper"""
+
+# Standard library imports
+
+import inspect
+import time
+
+from typing import Any, Optional
+
+__all__ = ("RequestContext", "RequestHook", "dispatch_hooks")
+
+
+class RequestContext:
+    """
+    Information about a single pyaww.User.request call, handed to every hook.
+
+    All times are in seconds. `queue_time` is the time spent waiting for a free request slot, `network_time` the time
+    until the response body was received and `decode_time` the time spent parsing JSON. `latency` is network and
+    decoding time combined, queueing excluded. `sent` tells whether the request actually went out.
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "route",
+        "started",
+        "started_ns",
+        "queue_time",
+        "network_time",
+        "decode_time",
+        "latency",
+        "status",
+        "size",
+        "retries",
+        "sent",
+        "error",
+        "extra",
+    )
+
+    def __init__(self, method: str, url: str, route: str) -> None:
+        self.method = method
+        self.url = url
+        self.route = route
+
+        self.started = time.perf_counter()
+        self.started_ns = time.time_ns()
+
+        self.queue_time = 0.0
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        self.latency = 0.0
+
+        self.status: Optional[int] = None
+        self.size = 0
+        self.retries = 0
+        self.sent = False
+        self.error: Optional[BaseException] = None
+        self.extra: dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        return f"<RequestContext {self.method} {self.route} status={self.status}>"
+
+
+class RequestHook:
+    """
+    Base class for request hooks (middleware callbacks), register them with pyaww.User.add_hook.
+
+    Override any of the methods below, they may be ordinary functions or coroutines. An exception raised in
+    before_request aborts the request.
+
+    Examples:
+        >>> class PrintHook(RequestHook):
+        >>>     def after_request(self, ctx):
+        >>>         print(ctx.method, ctx.route, ctx.status, ctx.latency)
+        >>>
+        >>> user = User(...)
+        >>> user.add_hook(PrintHook())
+    """
+
+    def before_request(self, ctx: RequestContext) -> Any:
+        """Called before waiting for a request slot."""
+
+    def after_request(self, ctx: RequestContext) -> Any:
+        """Called once the response has been received and parsed."""
+
+    def on_error(self, ctx: RequestContext, error: BaseException) -> Any:
+        """Called when the request failed, ctx.status is set if a response was received."""
+
+
+async def dispatch_hooks(hooks: list[Any], event: str, *args: Any) -> None:
+    """
+    Call `event` on every hook, awaiting the ones that return an awaitable.
+
+    Args:
+        hooks (list[Any]): hooks to be called
+        event (str): before_request, after_request or on_error
+        *args (Any): arguments for the hook
+    """
+    for hook in hooks:
+        callback = getattr(hook, event, None)
+
+        if callback is None:
+            continue
+
+        result = callback(*args)
+
+        if inspect.isawaitable(result):
+            await result
@@ -0,0 +1,92 @@
+"""Identity map for the API wrapper"""
+
+# Standard library imports
+
+import weakref
+
+from typing import Any, Callable, Hashable, Optional, TypeVar, cast
+
+# Local application/library specific imports
+
+from .tracking import Tracked
+
+__all__ = ("IdentityMap",)
+
+T = TypeVar("T")
+
+
+class IdentityMap:
+    """
+    Weak-valued map of the live model objects of a pyaww.User, keyed by (type, id).
+
+    Models are built through IdentityMap.resolve: if an object of the same type and id is still referenced anywhere,
+    it is updated in place with the new response (losing its `stale` mark, the new values count as the server's)
+    instead of a second object being created. Fields changed locally and not sent yet (see pyaww.UnitOfWork) keep
+    their local value. Objects nobody references any longer drop out of the map on their own.
+
+    Examples:
+        >>> user = User(...)
+        >>> console = await user.get_console_by_id(...)
+        >>> console in await user.consoles()  # the very same object, refreshed
+    """
+
+    def __init__(self) -> None:
+        self._objects: weakref.WeakValueDictionary[tuple[type, Hashable], Any] = (
+            weakref.WeakValueDictionary()
+        )
+
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, cls: type[T], resp: dict, *args: Any) -> T:
+        """
+        Get the live object for a response, creating it if there is none.
+
+        Args:
+            cls (type[T]): model class, constructed as cls(resp, *args)
+            resp (dict): API response describing the object, identified by its "id"
+            *args (Any): further constructor arguments (pyaww.User, pyaww.WebApp...)
+
+        Returns:
+            T: the object, updated with resp
+        """
+        id_ = resp.get("id")
+        build = cast(
+            Callable[..., T], cls
+        )  # models take the response and their parents
+
+        if id_ is None:
+            return build(resp, *args)
+
+        key = (cls, id_)
+        object_: Optional[T] = self._objects.get(key)
+
+        if object_ is None:
+            self.misses += 1
+            object_ = self._objects[key] = build(resp, *args)
+            return object_
+
+        self.hits += 1
+        tracked = object_ if isinstance(object_, Tracked) else None
+        pending = tracked.changes() if tracked is not None else {}
+
+        vars(object_).update(resp)
+        vars(object_).pop("stale", None)
+
+        if tracked is not None:
+            tracked._mark_clean(*resp)
+            # still differs from the refreshed server value
+            vars(tracked).update(pending)
+
+        return object_
+
+    def get(self, cls: type[T], id_: Hashable) -> Optional[T]:
+        """Get the live object of a type and id, None if there is none."""
+        return self._objects.get((cls, id_))
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def stats(self) -> dict[str, int]:
+        """Resolves that found a live object (hits), ones that created it (misses) and live objects (size)."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
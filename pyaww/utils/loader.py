@@ -0,0 +1,145 @@
+"""Batching of by-id lookups for the API wrapper"""
+
+# Standard library imports
+
+import asyncio
+import copy
+
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+# Local application/library specific imports
+
+from .deadlines import _deadline
+from .scheduler import current_priority
+
+__all__ = ("BatchLoader",)
+
+
+class BatchLoader:
+    """
+    DataLoader-style batching of by-id lookups. Lookups requested within the same event loop tick (or within `window`
+    seconds) are collected; if at least `threshold` distinct ids are pending they are satisfied by a single list
+    request, otherwise every id is requested on its own (concurrently).
+
+    Ids missing from the list result are still requested one by one, so a missing id raises the usual
+    pyaww.NotFound.
+
+    Only lookups made under the same deadline and priority (see User.deadline, User.priority) are batched together.
+    A batch is requested in the context of its first lookup, other context variables of the later ones do not apply.
+
+    Examples:
+        >>> user = User(...)
+        >>> consoles = await asyncio.gather(*(user.get_console_by_id(id_) for id_ in ids))  # one request
+    """
+
+    def __init__(
+        self,
+        fetch_one: Callable[[Any], Awaitable[Any]],
+        fetch_all: Callable[[], Awaitable[list[Any]]],
+        threshold: int = 3,
+        window: float = 0.0,
+    ) -> None:
+        """
+        Args:
+            fetch_one (Callable[[Any], Awaitable[Any]]): coroutine function requesting a single object by its id
+            fetch_all (Callable[[], Awaitable[list[Any]]]): coroutine function requesting the whole list
+            threshold (int): minimum amount of pending ids for the list to be requested instead
+            window (float): seconds to wait for more lookups, 0 means until the end of the current loop tick
+        """
+        self.fetch_one = fetch_one
+        self.fetch_all = fetch_all
+        self.threshold = threshold
+        self.window = window
+
+        # pending lookups by the (deadline, priority) they were made under
+        self._pending: dict[
+            tuple[Optional[float], str], dict[Hashable, list[asyncio.Future]]
+        ] = {}
+        # the loop only keeps weak references to tasks
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, id_: Hashable) -> Any:
+        """
+        Get an object by its id, batched with the other lookups of this tick / window.
+
+        Args:
+            id_ (Hashable): id of the object
+
+        Returns:
+            Any: the object
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        scope = (_deadline.get(), current_priority())
+
+        if scope not in self._pending:
+            self._pending[scope] = {}
+
+            # callbacks run in a copy of the current context, so does the task they create
+            if self.window:
+                loop.call_later(self.window, self._dispatch, scope)
+            else:
+                loop.call_soon(self._dispatch, scope)
+
+        self._pending[scope].setdefault(id_, []).append(future)
+
+        return await future
+
+    def _dispatch(self, scope: tuple[Optional[float], str]) -> None:
+        pending = self._pending.pop(scope)
+
+        task = asyncio.ensure_future(self._resolve(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, pending: dict[Hashable, list[asyncio.Future]]) -> None:
+        if len(pending) >= self.threshold:
+            try:
+                objects = {
+                    str(object_.id): object_ for object_ in await self.fetch_all()
+                }
+            # a cancelled batch must not leave its waiters hanging
+            except BaseException as e:
+                for futures in pending.values():
+                    _set_exception(futures, e)
+
+                if isinstance(e, Exception):
+                    return
+                raise
+
+            for id_ in list(pending):
+                if str(id_) in objects:
+                    _set_result(pending.pop(id_), objects[str(id_)])
+
+        await asyncio.gather(
+            *(self._resolve_one(id_, futures) for id_, futures in pending.items())
+        )
+
+    async def _resolve_one(self, id_: Hashable, futures: list[asyncio.Future]) -> None:
+        try:
+            object_ = await self.fetch_one(id_)
+        except BaseException as e:
+            _set_exception(futures, e)
+
+            if not isinstance(e, Exception):
+                raise
+        else:
+            _set_result(futures, object_)
+
+
+def _set_result(futures: list[asyncio.Future], result: Any) -> None:
+    for future in futures:
+        if not future.done():
+            future.set_result(result)
+
+
+def _set_exception(futures: list[asyncio.Future], exception: BaseException) -> None:
+    # every waiter gets its own instance, raising one instance in several tasks chains their tracebacks onto it
+    for index, future in enumerate(futures):
+        if future.done():
+            continue
+
+        if isinstance(exception, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(exception if index == 0 else copy.copy(exception))
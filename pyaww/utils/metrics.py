@@ -0,0 +1,170 @@
+"""Request metrics for the API wrapper"""
+
+# Standard library imports
+
+import time
+
+from collections import deque
+from typing import Any, Iterable, NamedTuple, Optional
+
+# Local application/library specific imports
+
+from .hooks import RequestContext, RequestHook
+
+__all__ = ("RequestRecord", "RequestMetrics", "prometheus_lines")
+
+
+class RequestRecord(NamedTuple):
+    """A single call made through pyaww.User.request"""
+
+    method: str
+    route: str
+    status: Optional[int]
+    latency: float
+    size: int
+    timestamp: float
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_lines(
+    name: str, help_: str, type_: str, samples: Iterable[tuple[dict[str, Any], float]]
+) -> list[str]:
+    """
+    Render one metric family in the Prometheus text exposition format.
+
+    Args:
+        name (str): metric name
+        help_ (str): HELP line for the metric
+        type_ (str): metric type (counter, gauge...)
+        samples (Iterable[tuple[dict[str, Any], float]]): label sets and their values
+
+    Returns:
+        list[str]: lines of the metric family
+    """
+    lines = [f"# HELP {name} {help_}", f"# TYPE {name} {type_}"]
+
+    for labels, value in samples:
+        if not labels:
+            lines.append(f"{name} {value}")
+            continue
+
+        rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+        lines.append(f"{name}{{{rendered}}} {value}")
+
+    return lines
+
+
+class RequestMetrics(RequestHook):
+    """
+    Per-call records and per-route aggregates for pyaww.User.request.
+
+    The latest `max_records` calls are kept as RequestRecord's, aggregates (count, errors, latency and bytes) are kept
+    for every (method, route template) pair for the lifetime of the instance. It is registered as a request hook of
+    every pyaww.User.
+    """
+
+    def __init__(self, max_records: int = 1024) -> None:
+        self.records: deque[RequestRecord] = deque(maxlen=max_records)
+        self._routes: dict[tuple[str, str], dict[str, float]] = {}
+
+    def record(
+        self,
+        method: str,
+        route: str,
+        status: Optional[int],
+        latency: float,
+        size: int,
+    ) -> RequestRecord:
+        """Store a call and update the aggregates of its route."""
+        record = RequestRecord(method, route, status, latency, size, time.time())
+        self.records.append(record)
+
+        aggregate = self._routes.setdefault(
+            (method, route),
+            {
+                "count": 0,
+                "errors": 0,
+                "latency_total": 0.0,
+                "latency_max": 0.0,
+                "bytes": 0,
+            },
+        )
+        aggregate["count"] += 1
+        aggregate["latency_total"] += latency
+        aggregate["latency_max"] = max(aggregate["latency_max"], latency)
+        aggregate["bytes"] += size
+
+        if status is None or status >= 400:
+            aggregate["errors"] += 1
+
+        return record
+
+    def after_request(self, ctx: RequestContext) -> None:
+        self.record(ctx.method, ctx.route, ctx.status, ctx.latency, ctx.size)
+
+    def on_error(self, ctx: RequestContext, error: BaseException) -> None:
+        self.record(ctx.method, ctx.route, ctx.status, ctx.latency, ctx.size)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Return the metrics as plain data.
+
+        Returns:
+            dict[str, Any]: `routes` with the aggregates per "METHOD route" and `records` with the latest calls
+        """
+        routes = {}
+
+        for (method, route), aggregate in self._routes.items():
+            routes[f"{method} {route}"] = {
+                **aggregate,
+                "latency_mean": aggregate["latency_total"] / aggregate["count"],
+            }
+
+        return {
+            "routes": routes,
+            "records": [record._asdict() for record in self.records],
+        }
+
+    def prometheus(self) -> str:
+        """Return the per-route aggregates in the Prometheus text format."""
+        items = [
+            ({"method": method, "route": route}, aggregate)
+            for (method, route), aggregate in self._routes.items()
+        ]
+        lines = [
+            *prometheus_lines(
+                "pyaww_requests_total",
+                "Requests made through pyaww.User.request.",
+                "counter",
+                ((labels, agg["count"]) for labels, agg in items),
+            ),
+            *prometheus_lines(
+                "pyaww_request_errors_total",
+                "Requests that failed or returned a status code of 400 or above.",
+                "counter",
+                ((labels, agg["errors"]) for labels, agg in items),
+            ),
+            *prometheus_lines(
+                "pyaww_request_latency_seconds_total",
+                "Total time spent on requests.",
+                "counter",
+                ((labels, agg["latency_total"]) for labels, agg in items),
+            ),
+            *prometheus_lines(
+                "pyaww_request_latency_seconds_max",
+                "Slowest request observed.",
+                "gauge",
+                ((labels, agg["latency_max"]) for labels, agg in items),
+            ),
+            *prometheus_lines(
+                "pyaww_response_bytes_total",
+                "Bytes received in response bodies.",
+                "counter",
+                ((labels, agg["bytes"]) for labels, agg in items),
+            ),
+        ]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,182 @@
+"""Request scheduling for the API wrapper"""
+
+# Standard library imports
+
+import asyncio
+import contextlib
+import contextvars
+import time
+
+from collections import deque
+from typing import AsyncIterator, Iterator, Optional
+
+__all__ = ("PriorityScheduler", "priority", "current_priority")
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "pyaww_priority", default="default"
+)
+
+
+@contextlib.contextmanager
+def priority(lane: str) -> Iterator[None]:
+    """
+    Send every request made within the block (in the current task and the tasks it creates) in the given lane,
+    unless a request specifies its own.
+
+    Args:
+        lane (str): lane of the scheduler, "interactive", "default" or "bulk" by default
+
+    Examples:
+        >>> user = User(...)
+        >>> with user.priority("bulk"):
+        >>>     await asyncio.gather(*(file.delete() for file in files))
+    """
+    token = _priority.set(lane)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """Lane set by the innermost `priority` block, "default" if there is none."""
+    return _priority.get()
+
+
+class _Lane:
+    __slots__ = ("weight", "waiters", "virtual_time")
+
+    def __init__(self, weight: float) -> None:
+        self.weight = weight
+        self.waiters: deque[tuple[asyncio.Future, float]] = deque()
+        self.virtual_time = 0.0
+
+
+class PriorityScheduler:
+    """
+    Limits concurrent requests like a semaphore but hands out free slots by lane instead of first come first served.
+
+    Lanes share the capacity in proportion to their weights (weighted fair queueing): with the default weights an
+    interactive request waits behind at most a couple of queued bulk requests, while bulk work still gets the
+    capacity nobody else uses. A waiter queued for longer than `max_wait` seconds is served before anybody else,
+    so no lane starves.
+    """
+
+    DEFAULT_WEIGHTS = {"interactive": 8.0, "default": 4.0, "bulk": 1.0}
+
+    def __init__(
+        self,
+        limit: int = 10,
+        weights: Optional[dict[str, float]] = None,
+        max_wait: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            limit (int): maximum amount of concurrent requests
+            weights (Optional[dict[str, float]]): lane names and their weights
+            max_wait (float): seconds after which a waiter is served regardless of its lane
+        """
+        self.limit = limit
+        self.max_wait = max_wait
+        self.lanes = {
+            name: _Lane(weight)
+            for name, weight in (weights or self.DEFAULT_WEIGHTS).items()
+        }
+
+        self.in_use = 0
+
+    def _waiting(self) -> int:
+        return sum(len(lane.waiters) for lane in self.lanes.values())
+
+    async def acquire(self, lane: Optional[str] = None) -> None:
+        """
+        Wait for a free slot.
+
+        Args:
+            lane (Optional[str]): lane to wait in, defaults to pyaww.current_priority()
+        """
+        queue = self.lanes[lane or current_priority()]
+
+        if self.in_use < self.limit and not self._waiting():
+            self.in_use += 1
+            return
+
+        if not queue.waiters:
+            # a lane that was idle does not get credit for the time it did not use
+            queue.virtual_time = max(
+                queue.virtual_time,
+                min(
+                    (
+                        other.virtual_time
+                        for other in self.lanes.values()
+                        if other.waiters
+                    ),
+                    default=queue.virtual_time,
+                ),
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (future, time.monotonic())
+        queue.waiters.append(entry)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # the slot was handed over right before the cancellation
+            else:
+                queue.waiters.remove(entry)
+            raise
+
+    def release(self) -> None:
+        """Free a slot and hand it to the next waiter."""
+        self.in_use -= 1
+        self._wake()
+
+    def _next_lane(self) -> Optional[_Lane]:
+        busy = [lane for lane in self.lanes.values() if lane.waiters]
+
+        if not busy:
+            return None
+
+        oldest = min(busy, key=lambda lane: lane.waiters[0][1])
+
+        if time.monotonic() - oldest.waiters[0][1] >= self.max_wait:
+            return oldest
+
+        return min(busy, key=lambda lane: lane.virtual_time)
+
+    def _wake(self) -> None:
+        while self.in_use < self.limit:
+            lane = self._next_lane()
+
+            if lane is None:
+                return
+
+            future, _ = lane.waiters.popleft()
+
+            if future.done():
+                continue
+
+            lane.virtual_time += 1 / lane.weight
+            self.in_use += 1
+            future.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, lane: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict[str, int]:
+        """Slots in use and waiters per lane."""
+        return {
+            "in_use": self.in_use,
+            **{
+                f"waiting_{name}": len(lane.waiters)
+                for name, lane in self.lanes.items()
+            },
+        }
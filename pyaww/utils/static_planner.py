@@ -0,0 +1,163 @@
+"""Planning of static file mappings for the API wrapper"""
+
+# Standard library imports
+
+import os
+
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from pyaww import User
+
+__all__ = ("StaticTree", "StaticPlan", "plan_static_files", "url_prefix")
+
+
+def url_prefix(url: str) -> str:
+    """Normalize a URL prefix to start and end with a slash."""
+    url = url.strip("/")
+
+    return f"/{url}/" if url else "/"
+
+
+class StaticTree(NamedTuple):
+    """Files of a remote directory, served under a URL prefix"""
+
+    url: str  # e.g. /static/
+    directory: str  # e.g. /home/yourname/mysite/static
+    files: tuple[str, ...]  # "/" separated paths relative to directory
+
+    @classmethod
+    def from_local(cls, url: str, local_dir: str, remote_dir: str) -> "StaticTree":
+        """
+        Layout of a local directory that is (or will be) uploaded to remote_dir, e.g. the result of collectstatic.
+
+        Args:
+            url (str): URL prefix the files are served under
+            local_dir (str): local copy of the directory
+            remote_dir (str): directory on PythonAnywhere
+        """
+        files = []
+
+        for root, dirs, names in os.walk(local_dir):
+            for name in names:
+                relative = os.path.relpath(os.path.join(root, name), local_dir)
+                files.append(relative.replace(os.sep, "/"))
+
+        return cls(url_prefix(url), remote_dir.rstrip("/"), tuple(sorted(files)))
+
+    @classmethod
+    async def from_remote(cls, user: "User", url: str, remote_dir: str) -> "StaticTree":
+        """
+        Layout of a directory on PythonAnywhere, listed with User.list_tree.
+
+        Args:
+            user (User): owner of the directory
+            url (str): URL prefix the files are served under
+            remote_dir (str): directory on PythonAnywhere
+        """
+        remote_dir = remote_dir.rstrip("/")
+        files = [
+            path[len(remote_dir) + 1 :] for path in await user.list_tree(remote_dir)
+        ]
+
+        return cls(url_prefix(url), remote_dir, tuple(sorted(files)))
+
+
+class StaticPlan(NamedTuple):
+    """Changes WebApp.sync_static_files makes to the static file mappings, as (url, path) pairs"""
+
+    create: list[tuple[str, str]]
+    update: list[tuple[str, str]]  # existing url, new path
+    delete: list[tuple[str, str]]
+
+
+def plan_static_files(trees: Iterable[StaticTree]) -> dict[str, str]:
+    """
+    Compute the fewest static file mappings serving every file of the trees at its URL.
+
+    A URL directory is mapped as a whole when all files under it come from one directory with the same layout, that
+    directory is inside one of the trees, and mapping it would not serve a file of the trees at another URL.
+    Otherwise its subdirectories are planned on their own and the files directly in it are mapped one by one.
+
+    Args:
+        trees (Iterable[StaticTree]): served directories, a URL prefix may be shared by several of them
+
+    Examples:
+        >>> plan_static_files([StaticTree("/static/", "/home/yourname/mysite/static", ("css/a.css", "js/b.js"))])
+        {'/static/': '/home/yourname/mysite/static'}
+
+    Returns:
+        dict[str, str]: paths of the mappings by URL
+
+    Raises:
+        ValueError: if two trees serve different files at the same URL
+    """
+    served: dict[str, str] = {}
+    roots = []
+
+    for tree in trees:
+        prefix, directory = url_prefix(tree.url), tree.directory.rstrip("/")
+        roots.append(directory)
+
+        for file in tree.files:
+            url, path = prefix + file, f"{directory}/{file}"
+
+            if served.setdefault(url, path) != path:
+                raise ValueError(f"{url} is served from {served[url]} and {path}.")
+
+    paths = set(served.values())
+
+    def directory_of(node: str, files: dict[str, str]) -> Optional[str]:
+        """The directory node can be mapped to, None if there is none."""
+        directories = set()
+
+        for url, path in files.items():
+            relative = url[len(node) :]
+
+            if not path.endswith("/" + relative):
+                return None
+
+            directories.add(path[: -len(relative) - 1])
+
+        if len(directories) != 1:
+            return None
+
+        directory = directories.pop()
+
+        if not any(
+            directory == root or directory.startswith(root + "/") for root in roots
+        ):
+            return None
+
+        if any(
+            served.get(node + path[len(directory) + 1 :]) != path
+            for path in paths
+            if path.startswith(directory + "/")
+        ):
+            return None
+
+        return directory
+
+    def plan(node: str, files: dict[str, str]) -> dict[str, str]:
+        directory = directory_of(node, files)
+
+        if directory is not None:
+            return {node: directory}
+
+        mappings: dict[str, str] = {}
+        children: dict[str, dict[str, str]] = {}
+
+        for url, path in files.items():
+            head, slash, _ = url[len(node) :].partition("/")
+
+            if slash:
+                children.setdefault(f"{node}{head}/", {})[url] = path
+            else:
+                mappings[url] = path
+
+        for child, child_files in children.items():
+            mappings.update(plan(child, child_files))
+
+        return mappings
+
+    return plan("/", served) if served else {}
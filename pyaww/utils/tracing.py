@@ -0,0 +1,100 @@
+"""OpenTelemetry tracing for the API wrapper"""
+
+# Standard library imports
+
+from typing import Any
+
+# Related third party imports
+
+try:
+    from opentelemetry import trace  # type: ignore[attr-defined]
+except ImportError:  # opentelemetry is an optional dependency
+    trace = None
+
+# Local application/library specific imports
+
+from .hooks import RequestContext, RequestHook
+
+__all__ = ("OpenTelemetryHook",)
+
+
+class OpenTelemetryHook(RequestHook):
+    """
+    Request hook that emits a client span per pyaww.User.request call, with `queue`, `network` and `decode` child
+    spans showing where the time went. If `opentelemetry-api` is not installed the hook does nothing.
+
+    Examples:
+        >>> user = User(...)
+        >>> user.add_hook(OpenTelemetryHook())
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        """
+        Args:
+            tracer (Any): tracer to use, defaults to the "pyaww" tracer of the global tracer provider
+        """
+        if tracer is None and trace is not None:
+            tracer = trace.get_tracer("pyaww")
+
+        self.tracer: Any = tracer
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are being emitted."""
+        return trace is not None and self.tracer is not None
+
+    def before_request(self, ctx: RequestContext) -> None:
+        if trace is None or self.tracer is None:
+            return
+
+        ctx.extra["otel_span"] = self.tracer.start_span(
+            f"{ctx.method} {ctx.route}",
+            kind=trace.SpanKind.CLIENT,
+            start_time=ctx.started_ns,
+            attributes={
+                "http.method": ctx.method,
+                "http.route": ctx.route,
+                "http.url": ctx.url,
+            },
+        )
+
+    def after_request(self, ctx: RequestContext) -> None:
+        self._finish(ctx)
+
+    def on_error(self, ctx: RequestContext, error: BaseException) -> None:
+        span = ctx.extra.get("otel_span")
+
+        if span is not None and trace is not None:
+            span.record_exception(error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+
+        self._finish(ctx)
+
+    def _finish(self, ctx: RequestContext) -> None:
+        """Emit the phase spans and end the request span."""
+        span = ctx.extra.pop("otel_span", None)
+
+        if span is None or trace is None:
+            return
+
+        if ctx.status is not None:
+            span.set_attribute("http.status_code", ctx.status)
+
+        span.set_attribute("http.response_content_length", ctx.size)
+        span.set_attribute("pyaww.retries", ctx.retries)
+
+        parent = trace.set_span_in_context(span)
+        start = ctx.started_ns
+
+        for name, duration in (
+            ("queue", ctx.queue_time),
+            ("network", ctx.network_time),
+            ("decode", ctx.decode_time),
+        ):
+            end = start + int(duration * 1e9)
+            self.tracer.start_span(name, context=parent, start_time=start).end(
+                end_time=end
+            )
+            start = end
+
+        span.end(end_time=start)
@@ -0,0 +1,157 @@
+"""Dirty tracking and units of work for the API wrapper"""
+
+# Standard library imports
+
+import abc
+import asyncio
+import contextvars
+import copy
+
+from typing import Any, Optional
+
+__all__ = ("Tracked", "UnitOfWork")
+
+_MISSING = object()
+
+_unit_of_work: contextvars.ContextVar[Optional["UnitOfWork"]] = contextvars.ContextVar(
+    "pyaww_unit_of_work", default=None
+)
+
+
+class Tracked(abc.ABC):
+    """
+    Mixin for models whose fields can be changed through a PATCH request.
+
+    The values last known to be on the server are kept for every field in `_tracked_fields`, so Tracked.changes can
+    tell which fields were changed locally. Assigning a tracked field within a pyaww.UnitOfWork registers the object
+    with it.
+    """
+
+    _tracked_fields: tuple[str, ...] = ()
+
+    def _mark_clean(self, *fields: str) -> None:
+        """Record the current value of the given fields (all tracked fields by default) as the server's."""
+        clean = vars(self).setdefault("_clean", {})
+
+        for field in fields or self._tracked_fields:
+            if field in self._tracked_fields:
+                clean[field] = copy.deepcopy(vars(self).get(field, _MISSING))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+
+        if name in self._tracked_fields:
+            unit = _unit_of_work.get()
+
+            if unit is not None:
+                unit.register(self)
+
+    def changes(self) -> dict[str, Any]:
+        """Fields changed locally since they were last fetched or saved, with their new values."""
+        clean = vars(self).get("_clean", {})
+
+        return {
+            field: vars(self)[field]
+            for field in self._tracked_fields
+            if field in vars(self) and vars(self)[field] != clean.get(field, _MISSING)
+        }
+
+    @property
+    def dirty(self) -> bool:
+        """Whether any field was changed locally."""
+        return bool(self.changes())
+
+    async def save(self) -> None:
+        """Send the local changes, if any, in a single PATCH request."""
+        changes = self.changes()
+
+        if changes:
+            await self._patch(changes)
+
+    async def _update(self, data: dict[str, Any]) -> None:
+        """
+        Apply an update() call: within a unit of work the fields are only set, otherwise the fields whose value
+        differs from the server's are sent right away.
+        """
+        if _unit_of_work.get() is not None:
+            for field, value in data.items():
+                setattr(self, field, value)
+            return
+
+        clean = vars(self).get("_clean", {})
+        data = {
+            field: value
+            for field, value in data.items()
+            if value != clean.get(field, _MISSING)
+        }
+
+        if data:
+            await self._patch(data)
+
+    @abc.abstractmethod
+    async def _patch(self, data: dict[str, Any]) -> None:
+        """Send a PATCH request with data, then update the object and mark the fields clean."""
+
+
+class UnitOfWork:
+    """
+    Collects the changes made to models within the block and sends them on exit, one PATCH request per changed
+    object, concurrently. Nothing is sent if the block raises.
+
+    Within the block, update() methods only set the fields instead of sending a request. Only changed fields are
+    sent, objects whose fields were set back to the server's values send nothing.
+
+    Examples:
+        >>> user = User(...)
+        >>> async with user.unit_of_work():
+        >>>     for task in await user.scheduled_tasks():
+        >>>         task.hour = 3
+        >>>         task.description = "nightly"
+    """
+
+    def __init__(self) -> None:
+        self.objects: dict[int, Tracked] = {}
+        self._token: Optional[contextvars.Token] = None
+
+    def register(self, object_: Tracked) -> None:
+        """Register a changed object, done automatically when a tracked field is assigned within the block."""
+        self.objects[id(object_)] = object_
+
+    async def flush(self) -> None:
+        """
+        Send the changes collected so far. Every object is sent even if some fail, the first error is raised after
+        and the failed objects stay registered (and dirty).
+        """
+        pending = [
+            (object_, changes)
+            for object_, changes in (
+                (object_, object_.changes()) for object_ in self.objects.values()
+            )
+            if changes
+        ]
+        self.objects.clear()
+
+        results = await asyncio.gather(
+            *(object_._patch(changes) for object_, changes in pending),
+            return_exceptions=True,
+        )
+        errors = []
+
+        for (object_, _), result in zip(pending, results):
+            if isinstance(result, BaseException):
+                self.register(object_)
+                errors.append(result)
+
+        if errors:
+            raise errors[0]
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._token = _unit_of_work.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        if self._token is not None:
+            _unit_of_work.reset(self._token)
+
+        if exc_type is None:
+            await self.flush()
@@ -0,0 +1,199 @@
+# Standard library imports
+
+import asyncio
+import copy
+import hashlib
+import json
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+# Related third party imports
+
+import aiohttp
+
+# Local application/library specific imports
+
+from .errors import PythonAnywhereError
+from .utils.cache import _record
+
+if TYPE_CHECKING:
+    from .user import User
+
+__all__ = ("WatchEvent", "Watcher", "WATCH_KINDS")
+
+WATCH_KINDS = ("console", "sched_task", "always_on_task", "webapp")
+
+
+class WatchEvent(NamedTuple):
+    """A change of an account resource seen by pyaww.Watcher"""
+
+    kind: str  # one of WATCH_KINDS
+    type: str  # created, updated or deleted
+    id: Any
+    object: Any  # the last known object for deleted resources
+
+
+def _fingerprint(object_: Any) -> str:
+    """Hash of the public fields of a model."""
+    return hashlib.blake2b(
+        json.dumps(_record(object_), sort_keys=True, default=str).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+class Watcher:
+    """
+    Polls the collections of an account and fans the changes out to its subscribers, see User.watch.
+
+    There is a single poller per collection however many subscribers watch it, it stops once the last of them leaves.
+    The polling interval of a collection is reset to `min_interval` whenever it changed and grows by `backoff` up to
+    `max_interval` while nothing changes (or the requests fail). Records are compared by a hash of their fields.
+    Other errors stop the poller and are raised to its subscribers.
+
+    Polls go through the list requests of the user, so the cache (and identity map) is refreshed as a side effect,
+    deleted records are dropped from the cache.
+    """
+
+    def __init__(
+        self,
+        user: "User",
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        backoff: float = 1.5,
+    ) -> None:
+        """
+        Args:
+            user (User): user whose account is watched
+            min_interval (float): seconds between polls right after a change
+            max_interval (float): maximum seconds between polls
+            backoff (float): factor the interval grows by after each poll without changes
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+
+        self._user = user
+        self._fetchers: dict[str, Callable] = {
+            "console": user._fetch_consoles,
+            "sched_task": user._fetch_sched_tasks,
+            "always_on_task": user._fetch_always_on_tasks,
+            "webapp": user.webapps,
+        }
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._pollers: dict[str, asyncio.Task] = {}
+        self.intervals: dict[str, float] = {}
+
+    async def subscribe(self, kinds: Iterable[str]) -> AsyncGenerator[WatchEvent, None]:
+        """
+        Iterate over the changes of the given collections, forever. Changes are relative to the first poll made for
+        this watcher, or to the previous poll if another subscriber already watches the collection.
+
+        Raises:
+            Exception: the error that stopped the poller of a collection, other than a failed request
+        """
+        kinds = tuple(kinds)
+        unknown = set(kinds) - set(WATCH_KINDS)
+
+        if unknown:
+            raise ValueError(f"Cannot watch {', '.join(sorted(unknown))}.")
+
+        queue: asyncio.Queue[Union[WatchEvent, BaseException]] = asyncio.Queue()
+
+        for kind in kinds:
+            self._subscribers.setdefault(kind, set()).add(queue)
+
+            if kind not in self._pollers:
+                self._pollers[kind] = asyncio.ensure_future(self._poll(kind))
+
+        try:
+            while True:
+                event = await queue.get()
+
+                if isinstance(event, BaseException):
+                    raise event
+
+                yield event
+        finally:
+            for kind in kinds:
+                self._subscribers[kind].discard(queue)
+
+                if not self._subscribers[kind]:
+                    del self._subscribers[kind]
+                    poller = self._pollers.pop(kind, None)  # None if it failed
+
+                    if poller is not None:
+                        poller.cancel()
+
+    async def _poll(self, kind: str) -> None:
+        """Poll a collection until cancelled, publishing the differences between consecutive polls."""
+        known: Optional[dict[Any, tuple[str, Any]]] = None
+        self.intervals[kind] = self.min_interval
+
+        while True:
+            try:
+                current = {
+                    object_.id: (_fingerprint(object_), object_)
+                    for object_ in await self._fetchers[kind]()
+                }
+            except (
+                PythonAnywhereError,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                ValueError,  # a response that is not JSON
+            ):
+                changed = False
+            except Exception as e:  # a bug rather than a failed request, do not hide it
+                if self._pollers.get(kind) is asyncio.current_task():
+                    del self._pollers[kind]  # the next subscriber starts a new poller
+
+                # every subscriber gets its own instance, raising one in several tasks chains their tracebacks onto it
+                for index, queue in enumerate(self._subscribers.get(kind, ())):
+                    queue.put_nowait(e if index == 0 else copy.copy(e))
+                return
+            else:
+                changed = known is not None and await self._publish(
+                    kind, known, current
+                )
+                known = current
+
+            self.intervals[kind] = (
+                self.min_interval
+                if changed
+                else min(self.intervals[kind] * self.backoff, self.max_interval)
+            )
+
+            await asyncio.sleep(self.intervals[kind])
+
+    async def _publish(
+        self,
+        kind: str,
+        known: dict[Any, tuple[str, Any]],
+        current: dict[Any, tuple[str, Any]],
+    ) -> bool:
+        """Send the events of two polls to the subscribers, returns whether anything changed."""
+        events = [
+            WatchEvent(kind, "created" if id_ not in known else "updated", id_, object_)
+            for id_, (fingerprint, object_) in current.items()
+            if id_ not in known or known[id_][0] != fingerprint
+        ]
+
+        for id_ in known.keys() - current.keys():
+            events.append(WatchEvent(kind, "deleted", id_, known[id_][1]))
+
+            if kind != "webapp":  # webapps are not cached
+                await self._user.cache.discard(kind, id_)
+
+        for queue in self._subscribers.get(kind, ()):
+            for event in events:
+                queue.put_nowait(event)
+
+        return bool(events)
@@ -1,18 +1,27 @@
 # Standard library imports
 
-from typing import TYPE_CHECKING, Any, Optional
+import asyncio
+
+from typing import TYPE_CHECKING, Any, Iterable, Optional
 
 # Local application/library specific imports
 
 from .static_file import StaticFile
 from .static_header import StaticHeader
 from .errors import PythonAnywhereError
+from .utils.tracking import Tracked
+from .utils.static_planner import (
+    StaticPlan,
+    StaticTree,
+    plan_static_files,
+    url_prefix,
+)
 
 if TYPE_CHECKING:
     from .user import User
 
 
-class WebApp:
+class WebApp(Tracked):
     """
     Implements WebApp endpoints.
 
@@ -34,9 +43,20 @@ class WebApp:
     expiry: str
     force_https: bool
 
+    _tracked_fields = (
+        "python_version",
+        "source_directory",
+        "virtualenv_path",
+        "force_https",
+        "password_protection_enabled",
+        "password_protection_username",
+        "password_protection_password",
+    )
+
     def __init__(self, resp: dict, user: "User") -> None:
         self._user: "User" = user
         vars(self).update(resp)
+        self._mark_clean()
 
     async def delete(self) -> None:
         """Deletes the webapp."""
@@ -54,7 +74,10 @@ class WebApp:
         password_protection_username: Optional[str] = None,
         password_protection_password: Optional[str] = None,
     ) -> None:
-        """Updates config of the webapp. Reload required."""
+        """
+        Updates config of the webapp. Reload required. Only fields that differ from the server's are sent, within
+        User.unit_of_work the fields are sent when the block exits.
+        """
         data: dict[str, Any] = {}
 
         if python_version is not None:
@@ -62,22 +85,26 @@ class WebApp:
         if source_directory is not None:
             data["source_directory"] = source_directory
         if virtualenv_path is not None:
-            data["virtualend_path"] = virtualenv_path
+            data["virtualenv_path"] = virtualenv_path
         if force_https is not None:
             data["force_https"] = force_https
         if password_protection_enabled is not None:
             data["password_protection_enabled"] = password_protection_enabled
         if password_protection_password is not None:
-            data["password_protection_pasword"] = password_protection_password
+            data["password_protection_password"] = password_protection_password
         if password_protection_username is not None:
             data["password_protection_username"] = password_protection_username
 
+        await self._update(data)
+
+    async def _patch(self, data: dict[str, Any]) -> None:
         await self._user.request(
             "PATCH",
             f"/api/v0/user/{self.user}/webapps/{self.domain_name}/",
             data=data,
         )
         vars(self).update(data)
+        self._mark_clean(*data)
 
     async def restart(self) -> None:
         """Reloads the webapp."""
@@ -130,7 +157,7 @@ class WebApp:
             f"/api/v0/user/{self.user}/webapps/{self.domain_name}/static_files/",
             return_json=True,
         )
-        return [StaticFile(i, self) for i in resp]
+        return [self._user.identity.resolve(StaticFile, i, self) for i in resp]
 
     async def create_static_file(self, file_path: str, url: str) -> StaticFile:
         """
@@ -150,7 +177,77 @@ class WebApp:
             return_json=True,
             data=data,
         )
-        return StaticFile(resp, self)
+        return self._user.identity.resolve(StaticFile, resp, self)
+
+    async def sync_static_files(
+        self, trees: Iterable[StaticTree], dry_run: bool = False
+    ) -> StaticPlan:
+        """
+        Make the static file mappings under the URL prefixes of the trees serve exactly their files, with as few
+        mappings as possible (see pyaww.utils.plan_static_files). Mappings are created, repointed and deleted
+        concurrently, then the webapp is restarted once if anything changed. Mappings outside of the URL prefixes of
+        the trees are left alone. An existing mapping of a directory URL without its trailing slash (e.g. /static)
+        counts as the mapping of /static/. The changes are sent right away, also within User.unit_of_work, so that
+        the restart serves them.
+
+        Args:
+            trees (Iterable[StaticTree]): served directories, see StaticTree.from_local and StaticTree.from_remote
+            dry_run (bool): only compute the changes
+
+        Examples:
+            >>> user = User(...)
+            >>> webapp = await user.get_webapp_by_domain_name('yourname.pythonanywhere.com')
+            >>> tree = StaticTree.from_local('/static/', './static', '/home/yourname/mysite/static')
+            >>> await webapp.sync_static_files([tree])
+
+        Returns:
+            StaticPlan: the changes, made unless dry_run
+        """
+        trees = list(trees)
+        desired = plan_static_files(trees)
+        prefixes = tuple(url_prefix(tree.url) for tree in trees)
+
+        kept: dict[str, StaticFile] = {}
+        stale: list[StaticFile] = []
+
+        for static_file in await self.static_files():
+            # a directory may be mapped without its trailing slash, e.g. /static
+            url = static_file.url
+
+            if url not in desired:
+                url = url_prefix(url)
+
+            if not url.startswith(prefixes):
+                continue
+
+            if url in desired and url not in kept:
+                kept[url] = static_file
+            else:
+                stale.append(static_file)
+
+        repointed = [
+            (kept[url], path)
+            for url, path in desired.items()
+            if url in kept and kept[url].path.rstrip("/") != path
+        ]
+        plan = StaticPlan(
+            create=[(url, path) for url, path in desired.items() if url not in kept],
+            update=[(static_file.url, path) for static_file, path in repointed],
+            delete=[(static_file.url, static_file.path) for static_file in stale],
+        )
+
+        if dry_run or not any(plan):
+            return plan
+
+        await asyncio.gather(
+            *(self.create_static_file(path, url) for url, path in plan.create),
+            # update() would wait for the end of a unit of work, after the restart
+            *(static_file._patch({"path": path}) for static_file, path in repointed),
+            *(static_file.delete() for static_file in stale),
+        )
+        await self.restart()
+
+        return plan
 
     async def get_static_file_by_id(self, id_: int) -> StaticFile:
         """
@@ -167,7 +264,7 @@ class WebApp:
             f"/api/v0/user/{self.user}/webapps/{self.domain_name}/static_files/{id_}/",
             return_json=True,
         )
-        return StaticFile(resp, self)
+        return self._user.identity.resolve(StaticFile, resp, self)
 
     async def static_headers(self) -> list[dict]:
         """Get webapps static headers."""
@@ -184,7 +281,7 @@ class WebApp:
             f"/api/v0/user/{self.user}/webapps/{self.domain_name}/static_headers/{id_}/",
             return_json=True,
         )
-        return StaticHeader(resp, self)
+        return self._user.identity.resolve(StaticHeader, resp, self)
 
     async def create_static_header(
         self, url: str, name: str, value: dict
@@ -207,7 +304,7 @@ class WebApp:
             return_json=True,
             data=data,
         )
-        return StaticHeader(resp, self)
+        return self._user.identity.resolve(StaticHeader, resp, self)
 
     @property
     def userclass(self):
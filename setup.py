@@ -28,6 +28,8 @@ setuptools.setup(
     ],
     packages=setuptools.find_packages(),
     install_requires=["aiohttp==3.8.1"],
+    extras_require={"tracing": ["opentelemetry-api"]},
+    entry_points={"console_scripts": ["pyaww=pyaww.cli:main"]},
     python_requires=">=3.9",
     license="MIT",
 )
@@ -1,5 +1,6 @@
 # Standard library imports
 
+import re
 from typing import TYPE_CHECKING
 
 # Related third party imports
@@ -19,6 +20,49 @@ async def test_send_input(
     assert isinstance(await started_console.send_input("echo hello!"), str)
 
 
+@pytest.mark.asyncio
+async def test_run(started_console: "Console") -> None:
+    result = await started_console.run("echo hello!")
+
+    assert result.output == "hello!"
+    assert result.exit_code == 0
+
+    results = await started_console.run_many(["true", "false", "echo $((1 + 1))"])
+
+    assert [result.exit_code for result in results] == [0, 1, 0]
+    assert results[-1].output == "2"
+
+
+@pytest.mark.asyncio
+async def test_run_many_scrolled_out() -> None:
+    from pyaww import Console, User
+
+    user = User(username="pyaww", auth="x" * 40)
+    console = Console({"id": 1, "console_url": "/user/pyaww/consoles/1/"}, user)
+    sent = []
+
+    async def request(method, url, data=None, **kwargs):
+        if data is not None:
+            sent.append(data["input"])
+            return None
+
+        # echo every command's markers around its output, keep the latest 300 characters like PythonAnywhere
+        output = "".join(
+            f"pyaww-start-{marker}\r\nout{i}\r\npyaww-end-{marker} {i % 2}\r\n"
+            for i, marker in enumerate(re.findall(r'"pyaww-start""-(\S+)"', sent[0]))
+        )
+        return {"output": output[-300:]}
+
+    user.request = request  # type: ignore
+    results = await console.run_many(f"echo out{i}" for i in range(20))
+
+    assert results[0].output is None and results[0].exit_code is None
+    assert results[-1].output == "out19" and results[-1].exit_code == 1
+    assert all(
+        result.output in (None, f"out{i}") for i, result in enumerate(results)
+    ), "output of another command leaked in"
+
+
 @pytest.mark.asyncio
 async def test_delete(
     client: "User", unstarted_console: "Console"
@@ -1,5 +1,9 @@
 # Standard library imports
 
+import glob
+import hashlib
+import io
+import os
 from typing import TYPE_CHECKING
 
 # Related third party imports
@@ -8,6 +12,8 @@ import pytest
 
 # Local application/library specific imports
 
+from pyaww import FileContentCache, User
+
 if TYPE_CHECKING:
     from pyaww import File
 
@@ -42,6 +48,73 @@ async def test_sharing_status(file: "File") -> None:
     assert await file.is_shared() is False
 
 
+@pytest.mark.asyncio
+async def test_stream(file: "File") -> None:
+    user = file._user
+
+    async with user.stream(
+        "GET", f"/api/v0/user/{user.username}/files/path{file.path}"
+    ) as resp:
+        body = b"".join([chunk async for chunk in resp.content.iter_chunked(4)])
+
+    assert body.decode() == await file.read()
+
+
+@pytest.mark.asyncio
+async def test_content_cache(file: "File", tmp_path) -> None:
+    user = file._user
+    user.content_cache = FileContentCache(str(tmp_path))
+
+    try:
+        content = await file.read()
+        assert await file.read() == content
+        assert user.content_cache.stats()["hits"] == 1
+
+        await file.update(io.StringIO(content + "!"))
+        assert await file.read() == content + "!", "stale content after update"
+    finally:
+        user.content_cache = None
+
+
+@pytest.mark.asyncio
+async def test_content_cache_stale_put(tmp_path) -> None:
+    user = User(username="pyaww", auth="x" * 40)
+    cache = FileContentCache(str(tmp_path))
+    path = "/home/pyaww/a.txt"
+
+    version = cache.version(user, path)  # a read starts downloading
+    await cache.discard(user, path)  # the file is written meanwhile
+    await cache.put(user, path, "old", version)
+    assert await cache.get(user, path) is None, "stored content of before the write"
+
+    await cache.put(user, path, "new", cache.version(user, path))
+    assert await cache.get(user, path) == "new"
+
+
+@pytest.mark.asyncio
+async def test_content_cache_writes_unlocked(tmp_path, monkeypatch) -> None:
+    user = User(username="pyaww", auth="x" * 40)
+    cache = FileContentCache(str(tmp_path))
+    path = "/home/pyaww/a.txt"
+    replace = os.replace
+
+    def discard_meanwhile(source: str, destination: str) -> None:
+        assert cache._lock.acquire(blocking=False), "lock held during disk I/O"
+        cache._lock.release()
+
+        if destination.endswith(hashlib.sha256(b"old").hexdigest()):
+            cache._discard(cache._key(user, path))  # the file is written meanwhile
+
+        replace(source, destination)
+
+    monkeypatch.setattr(os, "replace", discard_meanwhile)
+    await cache.put(user, path, "old", cache.version(user, path))
+
+    assert await cache.get(user, path) is None, "stored content of before the write"
+    assert cache.stats()["bytes"] == 0
+    assert not glob.glob(str(tmp_path / "blobs" / "*" / "*")), "blob left behind"
+
+
 @pytest.mark.asyncio
 async def test_delete(file: "File") -> None:
     assert await file.delete() is None
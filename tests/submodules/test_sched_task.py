@@ -22,6 +22,35 @@ async def test_update(client: "User", scheduled_task: "SchedTask") -> None:
     assert scheduled_task.description == cached.description  # type: ignore
 
 
+@pytest.mark.asyncio
+async def test_unit_of_work(client: "User", scheduled_task: "SchedTask") -> None:
+    async with client.unit_of_work():
+        scheduled_task.description = "C"
+        # unchanged, not sent
+        await scheduled_task.update(hour=scheduled_task.hour)  # type: ignore
+
+        assert scheduled_task.changes() == {"description": "C"}
+
+        await client._fetch_sched_task(scheduled_task.id)  # refreshes the same object
+        assert scheduled_task.changes() == {"description": "C"}, "pending change lost"
+
+    assert not scheduled_task.dirty
+    assert (await client._fetch_sched_task(scheduled_task.id)).description == "C"
+
+
+def test_refresh_keeps_pending_changes() -> None:
+    from pyaww import SchedTask, User
+
+    user = User(username="pyaww", auth="x" * 40)
+    task = user.identity.resolve(SchedTask, {"id": 1, "command": "a", "hour": 1}, user)
+    task.command = "b"
+
+    refreshed = {"id": 1, "command": "a", "hour": 2}
+    assert user.identity.resolve(SchedTask, refreshed, user) is task
+    assert (task.command, task.hour) == ("b", 2)
+    assert task.changes() == {"command": "b"}
+
+
 @pytest.mark.asyncio
 async def test_delete(client: "User", scheduled_task: "SchedTask") -> None:
     await client.cache.set("sched_task", object_=scheduled_task)
@@ -31,6 +31,47 @@ async def test_static_file_delete(static_file: "StaticFile") -> None:
     assert await static_file.delete() is None
 
 
+@pytest.mark.asyncio
+async def test_sync_static_files(webapp: "WebApp") -> None:
+    from pyaww import StaticTree
+
+    directory = f"/home/{webapp.user}/pyaww-sync-static"
+    tree = StaticTree("/pyaww-sync-static/", directory, ("a.css", "b/c.js"))
+
+    assert await webapp.sync_static_files([tree], dry_run=True) == (
+        [("/pyaww-sync-static/", directory)],
+        [],
+        [],
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_static_files_in_unit_of_work() -> None:
+    from pyaww import StaticTree, User, WebApp
+
+    user = User(username="pyaww", auth="x" * 40)
+    webapp = WebApp({"user": "pyaww", "domain_name": "pyaww.pythonanywhere.com"}, user)
+    calls = []
+
+    async def request(method: str, url: str, data=None, **kwargs):
+        calls.append((method, url.rsplit("/", 2)[-2], data))
+
+        if method == "GET":
+            return [{"id": 1, "url": "/static", "path": "/home/pyaww/old"}]
+
+    user.request = request  # type: ignore
+    tree = StaticTree("/static/", "/home/pyaww/new", ("a.css",))
+
+    async with user.unit_of_work():
+        plan = await webapp.sync_static_files([tree])
+
+    assert plan == ([], [("/static", "/home/pyaww/new")], [])
+    assert calls[1:] == [
+        ("PATCH", "1", {"path": "/home/pyaww/new"}),
+        ("POST", "reload", None),
+    ], "mapping repointed after the restart (or deleted and recreated)"
+
+
 @pytest.mark.asyncio
 async def test_get_static_header_by_id(
     static_header: "StaticHeader", webapp: "WebApp"
@@ -0,0 +1,77 @@
+# Standard library imports
+
+import asyncio
+import contextlib
+import copy
+
+from typing import NoReturn
+
+# Related third party imports
+
+import pytest
+
+# Local application/library specific imports
+
+from pyaww import CircuitBreaker, User
+
+
+def test_circuit_breaker_states() -> None:
+    breaker = CircuitBreaker(minimum_calls=2, reset_timeout=0)
+
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record(False)
+    assert (
+        breaker.state == CircuitBreaker.HALF_OPEN
+    )  # reset_timeout of 0 turns it half-open right away
+
+    assert breaker.allow()
+    assert not breaker.allow(), "only one probe is allowed while half-open"
+
+    breaker.record(True)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe() -> None:
+    user = User(username="pyaww", auth="x" * 40)
+    breaker = user.breakers.get("GET", "/api/v0/user/{username}/cpu/")
+    breaker.reset_timeout = 0
+    breaker._open()
+
+    @contextlib.asynccontextmanager
+    async def hanging_send(ctx, **kwargs):
+        ctx.sent = True
+        await asyncio.Event().wait()
+        yield
+
+    user._send = hanging_send  # type: ignore
+    probe = asyncio.ensure_future(user.get_cpu_info())
+    await asyncio.sleep(0.01)
+    probe.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow(), "the cancelled probe was not given back"
+
+
+@pytest.mark.asyncio
+async def test_serve_stale(client: User) -> None:
+    client_seperate = copy.copy(client)
+    consoles = await client_seperate.consoles()
+
+    async def mock_send_func(*args, **kwargs) -> NoReturn:
+        raise AssertionError("request should not have been sent")
+
+    breaker = client_seperate.breakers.get("GET", "/api/v0/user/{username}/consoles//")
+    breaker._open()
+    client_seperate._send = mock_send_func  # type: ignore
+
+    await client_seperate.cache.invalidate("console")
+    stale_consoles = await client_seperate.consoles()
+
+    assert stale_consoles == consoles
+    assert all(getattr(console, "stale", False) for console in stale_consoles)
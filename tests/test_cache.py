@@ -1,7 +1,7 @@
 # Standard library imports
 
 import copy
-from typing import NoReturn, TYPE_CHECKING
+from typing import NoReturn
 
 # Related third party imports
 
@@ -9,8 +9,8 @@ import pytest
 
 # Local application/library specific imports
 
-if TYPE_CHECKING:
-    from pyaww import User
+from pyaww import User, Cache, Console, NotFound, ThreadSafeCache
+from pyaww.utils import TTLCache
 
 
 async def mock_request_func(*args, **kwargs) -> NoReturn:
@@ -44,3 +44,127 @@ async def test_disable_cache_methods(client: "User") -> None:
 
     with pytest.raises(NotImplementedError):
         await client_seperate.consoles()
+
+
+@pytest.mark.asyncio
+async def test_cache_stats(client: "User") -> None:
+    client_seperate = copy.copy(client)
+
+    await client_seperate.consoles()
+    await client_seperate.consoles()  # served from the cache
+
+    stats = client_seperate.cache.stats()
+
+    assert stats["console"]["all_hits"] == 1
+    assert stats["console"]["all_misses"] == 1
+    assert "pyaww_cache_hits" in client_seperate.cache.prometheus()
+
+
+@pytest.mark.asyncio
+async def test_thread_safe_cache(client: "User") -> None:
+    client_seperate = User(
+        username=client.username, auth=client.token, cache=ThreadSafeCache()
+    )
+
+    consoles = await client_seperate.consoles()
+
+    assert await client_seperate.cache.all("console") == consoles
+    assert client_seperate.cache.stats()["lock"]["acquisitions"] > 0
+
+
+@pytest.mark.asyncio
+async def test_cache_generation(client: "User") -> None:
+    client_seperate = copy.copy(client)
+
+    consoles = await client_seperate.consoles()
+    assert await client_seperate.cache.all("console") == consoles
+
+    await client_seperate.cache.invalidate("console")
+    assert await client_seperate.cache.all("console") is None
+
+    generation = client_seperate.cache.generation("console")
+    await client_seperate.cache.invalidate("console")  # changed while "requesting"
+    await client_seperate.cache.set(
+        "console", object_=consoles, allow_all_usage=True, generation=generation
+    )
+    assert await client_seperate.cache.all("console") is None
+
+
+@pytest.mark.asyncio
+async def test_negative_cache(client: "User") -> None:
+    client_seperate = copy.copy(client)
+    client_seperate.cache = Cache()
+
+    with pytest.raises(NotFound):
+        await client_seperate.get_console_by_id(-1)
+
+    client_seperate.request = mock_request_func  # type: ignore
+
+    with pytest.raises(NotFound):
+        await client_seperate.get_console_by_id(-1)  # served by the negative entry
+
+    await client_seperate.cache.forget_missing("console")
+
+    with pytest.raises(NotImplementedError):
+        await client_seperate.get_console_by_id(-1)
+
+
+@pytest.mark.asyncio
+async def test_cache_dump_load(client: "User", tmp_path) -> None:
+    client_seperate = copy.copy(client)
+    consoles = await client_seperate.consoles()
+    client_seperate.cache.dump(str(tmp_path / "cache"))
+
+    restored = copy.copy(client)
+    assert restored.cache.load(str(tmp_path / "cache"), restored) >= len(consoles)
+
+    restored.request = mock_request_func  # type: ignore
+    assert await restored.consoles() == consoles
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_binding() -> None:
+    cache = ThreadSafeCache()
+    user_a = User(username="pyaww", auth="x" * 40, cache=cache)
+    user_b = User(username="pyaww", auth="y" * 40, cache=cache)
+
+    console = Console({"id": 1, "name": "bash"}, user_a)
+    await cache.set("console", object_=[console], allow_all_usage=True)
+
+    consoles = await user_b.consoles()
+
+    assert consoles[0]._user is user_b, "object of another user (and event loop)"
+    assert consoles[0].name == "bash"
+    assert await user_b.get_console_by_id(1) is consoles[0]
+    assert (await user_a.consoles())[0] is console
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_frees_misses() -> None:
+    cache = Cache()
+
+    try:
+        raise NotFound("Not found.", 404)
+    except NotFound as e:
+        await cache.set_missing("console", 1, e)
+
+    error, _, _ = cache._negative_cache.cache[("missing", "console", 1)]
+    assert error.__traceback__ is None, "the frames of the request are kept alive"
+
+    cache._negative_cache.ttl = 0
+    for id_ in range(2, 300):
+        await cache.set_missing("console", id_, NotFound("Not found.", 404))
+    # the first miss has not expired yet, each later one expires before the next is set
+    assert len(cache._negative_cache) == 2, "expired misses are never freed"
+
+
+def test_last_known_pruned() -> None:
+    cache: TTLCache[int, Console] = TTLCache()
+    consoles: list[Console] = []
+
+    for id_ in range(100):
+        consoles = [Console({"id": id_, "name": "bash"}, None)]  # type: ignore
+        cache.set_collection(consoles, cache.generation)
+
+    assert list(cache.last_known) == [99], "values of deleted objects are kept"
+    assert cache.stale() == consoles
@@ -0,0 +1,72 @@
+# Standard library imports
+
+import asyncio
+
+# Related third party imports
+
+import pytest
+
+# Local application/library specific imports
+
+from pyaww import HedgingPolicy, RequestContext, User
+
+
+def _observe(policy: HedgingPolicy, route: str, latency: float) -> None:
+    ctx = RequestContext("GET", route, route)
+    ctx.queue_time, ctx.latency = 0.0, latency
+    policy.after_request(ctx)
+
+
+def test_hedge_delay_and_budget() -> None:
+    policy = HedgingPolicy(percentile=0.9, max_hedge_ratio=0.1, min_samples=10)
+    route = "/api/v0/user/{username}/cpu/"
+
+    for i in range(9):
+        _observe(policy, route, 0.01)
+    assert policy.delay(route) is None, "hedged before min_samples latencies"
+
+    for i in range(11):
+        _observe(policy, route, 0.01 if i < 9 else 1.0)
+    assert policy.delay(route) == 0.01
+
+    granted = sum(policy.acquire() for _ in range(100) if policy.delay(route))
+    assert granted == policy.hedges <= 11, "hedge rate is not capped"
+
+
+@pytest.mark.asyncio
+async def test_hedged_cancellation_and_winner() -> None:
+    policy = HedgingPolicy(max_hedge_ratio=1.0, min_samples=1)
+    user = User(username="pyaww", auth="x" * 40, hedging=policy)
+    route = "/api/v0/user/{username}/cpu/"
+    _observe(policy, route, 0.01)
+    attempts = []
+    gate = asyncio.get_running_loop().create_future()
+
+    async def attempt(ctx: RequestContext, return_json: bool, **kwargs) -> str:
+        attempts.append(asyncio.current_task())
+
+        if len(attempts) == 1:
+            await gate
+            raise ValueError("first attempt failed")
+
+        gate.set_result(None)  # both attempts finish in the same wakeup
+        await gate
+        return "hedge"
+
+    user._attempt = attempt
+    assert await user._hedged(RequestContext("GET", route, route), True) == "hedge"
+
+    async def hang(ctx: RequestContext, return_json: bool, **kwargs) -> None:
+        attempts.append(asyncio.current_task())
+        await asyncio.sleep(60)
+
+    user._attempt = hang
+    call = asyncio.ensure_future(
+        user._hedged(RequestContext("GET", route, route), True)
+    )
+    await asyncio.sleep(0)
+    call.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert attempts[-1].cancelled(), "attempt outlived its cancelled request"
@@ -0,0 +1,43 @@
+# Standard library imports
+
+import subprocess
+import sys
+
+# Related third party imports
+
+import pytest
+
+IMPORT_TIME_BUDGET = 0.1  # seconds
+
+
+def _import_time(module: str) -> float:
+    """Cumulative import time of a module in a fresh interpreter, as measured by -X importtime."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    for line in reversed(stderr.splitlines()):
+        _, cumulative, name = line.split("|")
+
+        if name.strip() == module:
+            return int(cumulative) / 1_000_000
+
+    raise AssertionError(f"{module} was not imported")
+
+
+@pytest.mark.parametrize("module", ["pyaww", "pyaww.cli"])
+def test_import_time_budget(module: str) -> None:
+    assert _import_time(module) < IMPORT_TIME_BUDGET
+
+
+def test_lazy_imports() -> None:
+    code = (
+        "import sys, pyaww, pyaww.cli\n"
+        "assert 'aiohttp' not in sys.modules and 'pyaww.user' not in sys.modules\n"
+        "pyaww.User\n"
+        "assert 'pyaww.user' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
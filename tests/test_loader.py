@@ -0,0 +1,59 @@
+# Standard library imports
+
+import asyncio
+from types import SimpleNamespace
+
+# Related third party imports
+
+import pytest
+
+# Local application/library specific imports
+
+from pyaww.utils import BatchLoader
+from pyaww.utils.scheduler import current_priority, priority
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch() -> None:
+    started = asyncio.Event()
+
+    async def fetch_all() -> list:
+        started.set()
+        await asyncio.sleep(60)
+        return []
+
+    loader = BatchLoader(fetch_all, fetch_all, threshold=2)
+    waiters = [asyncio.ensure_future(loader.load(id_)) for id_ in range(3)]
+
+    await started.wait()
+    assert len(loader._tasks) == 1, "the batch is not referenced"
+    loader._tasks.pop().cancel()
+
+    done, pending = await asyncio.wait(waiters, timeout=1)
+    assert not pending, "waiters of a cancelled batch hang"
+    assert all(waiter.cancelled() for waiter in done)
+
+
+@pytest.mark.asyncio
+async def test_batch_context() -> None:
+    lanes = []
+
+    async def fetch_one(id_: int) -> SimpleNamespace:
+        lanes.append((id_, current_priority()))
+        return SimpleNamespace(id=id_)
+
+    async def fetch_all() -> list:
+        lanes.append(("all", current_priority()))
+        return [SimpleNamespace(id=id_) for id_ in range(4)]
+
+    async def load(id_: int, lane: str) -> SimpleNamespace:
+        with priority(lane):
+            return await loader.load(id_)
+
+    loader = BatchLoader(fetch_one, fetch_all, threshold=2)
+    await asyncio.gather(load(0, "bulk"), load(1, "interactive"), load(2, "bulk"))
+
+    assert sorted(lanes, key=str) == [
+        ("all", "bulk"),
+        (1, "interactive"),
+    ], "a lookup was sent in the lane of another one"
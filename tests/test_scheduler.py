@@ -0,0 +1,56 @@
+# Standard library imports
+
+import asyncio
+
+# Related third party imports
+
+import pytest
+
+# Local application/library specific imports
+
+from pyaww import PriorityScheduler
+
+
+@pytest.mark.asyncio
+async def test_interactive_jumps_the_queue() -> None:
+    scheduler = PriorityScheduler(limit=1)
+    order = []
+
+    async def job(lane: str, name: str) -> None:
+        async with scheduler.slot(lane):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await scheduler.acquire()  # occupy the only slot
+
+    tasks = [asyncio.create_task(job("bulk", f"bulk{i}")) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(job("interactive", "interactive")))
+    await asyncio.sleep(0)
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order.index("interactive") <= 1
+    assert scheduler.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_frees_its_place() -> None:
+    scheduler = PriorityScheduler(limit=1)
+    await scheduler.acquire()
+
+    waiter = asyncio.create_task(scheduler.acquire("bulk"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    scheduler.release()
+    assert scheduler.stats() == {
+        "in_use": 0,
+        "waiting_interactive": 0,
+        "waiting_default": 0,
+        "waiting_bulk": 0,
+    }
@@ -0,0 +1,38 @@
+# Related third party imports
+
+import pytest
+
+# Local application/library specific imports
+
+from pyaww import StaticTree
+from pyaww.utils import plan_static_files
+
+HOME = "/home/yourname/mysite"
+
+
+def test_collapse_whole_tree() -> None:
+    tree = StaticTree(
+        "static", f"{HOME}/static", ("css/a.css", "js/b.js", "robots.txt")
+    )
+
+    assert plan_static_files([tree]) == {"/static/": f"{HOME}/static"}
+
+
+def test_shared_url_prefix() -> None:
+    trees = [
+        StaticTree("/static/", f"{HOME}/app1/static", ("app1/a.css", "app1/img/x.png")),
+        StaticTree("/static/", f"{HOME}/app2/static", ("app2/b.js", "favicon.ico")),
+    ]
+
+    assert plan_static_files(trees) == {
+        "/static/app1/": f"{HOME}/app1/static/app1",
+        "/static/app2/": f"{HOME}/app2/static/app2",
+        "/static/favicon.ico": f"{HOME}/app2/static/favicon.ico",
+    }
+
+
+def test_conflicting_trees() -> None:
+    with pytest.raises(ValueError):
+        plan_static_files(
+            [StaticTree("/s/", "/home/a", ("x",)), StaticTree("/s/", "/home/b", ("x",))]
+        )
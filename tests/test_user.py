@@ -1,18 +1,34 @@
 # Standard library imports
 
-from typing import Iterator, TYPE_CHECKING
-from types import AsyncGeneratorType
+import asyncio
+import json
+import time
+from typing import Any, Iterator, NoReturn, TYPE_CHECKING
+from types import AsyncGeneratorType, GeneratorType, SimpleNamespace
 
 # Related third party imports
 
+import aiohttp
 import pytest
 
+from aiohttp import BodyPartReader, web
+
 # Local application/library specific imports
 
-from pyaww import User, InvalidInfo
+from pyaww import (
+    User,
+    ConsoleLimit,
+    InvalidInfo,
+    NotFound,
+    PythonAnywhereError,
+    RequestHook,
+    RequestTimeout,
+    SyncUser,
+    UnitOfWork,
+)
 
 if TYPE_CHECKING:
-    from pyaww import SchedTask
+    from pyaww import Console, SchedTask
 
 
 def test_bad_client_token() -> None:
@@ -20,6 +36,21 @@ def test_bad_client_token() -> None:
         User(username="bad username", auth="bad info")
 
 
+@pytest.mark.asyncio
+async def test_not_found_context(client: User) -> None:
+    errors = []
+
+    for _ in range(2):
+        with pytest.raises(NotFound) as e:
+            await client.get_webapp_by_domain_name("pyaww-not-a-domain.example")
+        errors.append(e.value)
+
+    assert errors[0] is not errors[1], "errors must not be shared instances"
+    assert errors[0].status == 404
+    assert errors[0].method == "GET"
+    assert errors[0].route == "/api/v0/user/{username}/webapps/{domain_name}/"
+
+
 @pytest.mark.asyncio
 async def test_get_cpu_info(client) -> None:
     assert isinstance(await client.get_cpu_info(), dict)
@@ -61,6 +92,151 @@ async def test_get_sched_task_by_id(client: User, scheduled_task: "SchedTask") -
     ), "IDs between two instances do not match (__eq__)"
 
 
+@pytest.mark.asyncio
+async def test_batched_sched_task_lookups(
+    client: User, scheduled_task: "SchedTask"
+) -> None:
+    others = [
+        await client.create_sched_task(command=f"echo batch {i}", hour="5", minute="5")
+        for i in range(2)
+    ]
+    expected = [scheduled_task, *others]
+    routes = []
+
+    class Hook(RequestHook):
+        def before_request(self, ctx) -> None:
+            routes.append(ctx.route)
+
+    hook = Hook()
+
+    try:
+        for sched_task in expected:
+            await client.cache.pop("sched_task", id_=sched_task.id)
+
+        client.add_hook(hook)
+        sched_tasks = await asyncio.gather(
+            *(client.get_sched_task_by_id(sched_task.id) for sched_task in expected)
+        )
+    finally:
+        client.remove_hook(hook)
+
+        for sched_task in others:
+            await sched_task.delete()
+
+    assert sched_tasks == expected
+    assert routes == ["/api/v0/user/{username}/schedule/"], "ids were not batched"
+
+
+@pytest.mark.asyncio
+async def test_identity_map(client: User, scheduled_task: "SchedTask") -> None:
+    await client.cache.invalidate("sched_task")
+
+    assert any(
+        sched_task is scheduled_task for sched_task in await client.scheduled_tasks()
+    ), "the same task was built twice"
+
+
+@pytest.mark.asyncio
+async def test_watch(client: User, scheduled_task: "SchedTask") -> None:
+    events = client.watch(["sched_task"])
+    next_event = asyncio.ensure_future(events.__anext__())
+
+    await asyncio.sleep(3)  # first poll
+    await scheduled_task.update(description="watched")
+
+    event = await asyncio.wait_for(next_event, 30)
+    await events.aclose()
+
+    assert (event.kind, event.type, event.id) == (
+        "sched_task",
+        "updated",
+        scheduled_task.id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_watch_error() -> None:
+    user = User(username="pyaww", auth="x" * 40)
+
+    async def fetch() -> list:
+        raise TypeError("bug")
+
+    user.watcher._fetchers["console"] = fetch
+
+    with pytest.raises(TypeError):
+        await asyncio.wait_for(user.watch(["console"]).__anext__(), 1)
+    assert not user.watcher._pollers, "the failed poller is still registered"
+
+
+@pytest.mark.asyncio
+async def test_watch_bad_gateway() -> None:
+    responses = [web.Response(status=502, text="<html>Bad Gateway</html>")]
+
+    async def consoles(request: web.Request) -> web.Response:
+        return responses.pop(0) if responses else web.json_response([{"id": 1}])
+
+    app = web.Application()
+    app.router.add_get("/api/v0/user/pyaww/consoles//", consoles)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+
+    async with User(username="pyaww", auth="x" * 40) as user:
+        user.request_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        user.watcher.min_interval = 0.01
+
+        try:
+            with pytest.raises(PythonAnywhereError) as error:
+                await user._fetch_consoles()
+            assert error.value.status == 502
+
+            # a failed poll, one recording an empty list, then the console appears
+            responses.append(web.Response(status=503, text="<html>Unavailable</html>"))
+            responses.append(web.json_response([]))
+            events = user.watch(["console"])
+            event = await asyncio.wait_for(events.__anext__(), 5)
+            await events.aclose()
+        finally:
+            await runner.cleanup()
+
+    assert (event.type, event.id) == ("created", 1)
+
+
+@pytest.mark.asyncio
+async def test_create_file_length(tmp_path) -> None:
+    received = []
+
+    async def upload(request: web.Request) -> web.Response:
+        content = await (await request.multipart()).next()
+        assert isinstance(content, BodyPartReader)
+        received.append((request.content_length, await content.read()))
+        return web.json_response({"status": "OK"}, status=201)
+
+    app = web.Application()
+    app.router.add_post("/api/v0/user/pyaww/files/path/{path:.*}", upload)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+
+    (tmp_path / "a.txt").write_text("héllo wörld", encoding="utf-8")
+
+    async with User(username="pyaww", auth="x" * 40) as user:
+        user.request_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+        try:
+            with open(tmp_path / "a.txt", encoding="utf-8") as f:
+                f.read(3)
+                await user.create_file("/home/pyaww/a.txt", f)
+        finally:
+            await runner.cleanup()
+
+    length, content = received[0]
+    assert length is not None, "text sent without a Content-Length"
+    assert content == "lo wörld".encode()
+
+
 @pytest.mark.asyncio
 async def test_set_python_version(client: User) -> None:
     assert await client.set_python_version(3.8, "python3") is None
@@ -81,6 +257,240 @@ async def test_listdir(contents_of_a_path: Iterator[str]) -> None:
     assert isinstance(contents_of_a_path, AsyncGeneratorType)
 
 
+@pytest.mark.asyncio
+async def test_export(client: User) -> None:
+    document = await client.export()
+
+    assert document["version"] == 1
+    assert len(document["webapps"]) == len(await client.webapps())
+    assert all("static_files" in webapp for webapp in document["webapps"])
+    assert json.loads(json.dumps(document)) == document
+
+    with pytest.raises(ValueError):
+        await client.restore({**document, "version": 0})
+
+
+@pytest.mark.asyncio
+async def test_restore() -> None:
+    user = User(username="new", auth="x" * 40)
+    document = {
+        "version": 1,
+        "username": "old",
+        "domain": "old.pythonanywhere.com",
+        "system_image": None,
+        "python_versions": {},
+        "webapps": [
+            {
+                "domain_name": "old.pythonanywhere.com",
+                "python_version": "3.9",
+                "source_directory": "/home/old/mysite",
+                "static_files": [
+                    {"url": "/static/", "path": "/home/old/mysite/static"}
+                ],
+                "static_headers": [],
+            },
+            {
+                "domain_name": "broken.example.com",
+                "python_version": "3.9",
+                "static_files": [{"url": "/media/", "path": "/home/old/media"}],
+                "static_headers": [],
+            },
+        ],
+        "sched_tasks": [],
+        "always_on_tasks": [
+            {"command": "python /home/old/bot.py", "description": "", "enabled": True}
+        ],
+    }
+    calls = []
+
+    async def request(method: str, url: str, data: Any = None, **kwargs):
+        calls.append((method, url.replace("/api/v0/user/new", ""), data))
+
+        if "broken.example.com" in str(data):
+            raise InvalidInfo("broken")
+
+        if url.endswith("/always_on/"):
+            return {"id": 1, "url": url + "1/", **data}
+        if url.endswith("/webapps/new.pythonanywhere.com/"):
+            return {"domain_name": "new.pythonanywhere.com", "user": "new"}
+        if url.endswith("/static_files/"):
+            return {"id": 1, **data}
+
+    user.request = request  # type: ignore
+    report = await user.restore(document)
+
+    assert report["webapps"]["created"] == 1
+    assert report["static_files"]["created"] == 1
+    assert report["always_on_tasks"]["created"] == 1
+    assert [name for name, _ in report["webapps"]["failed"]] == ["broken.example.com"]
+    assert [name for name, _ in report["static_files"]["failed"]] == ["/media/"]
+
+    webapp = [call for call in calls if "/webapps/new.pythonanywhere.com/" in call[1]]
+    assert [(method, url.rsplit("/", 2)[-2]) for method, url, _ in webapp] == [
+        ("GET", "new.pythonanywhere.com"),
+        ("PATCH", "new.pythonanywhere.com"),
+        ("POST", "static_files"),
+        ("POST", "reload"),
+    ], "mappings were not created between the webapp and its single reload"
+    assert webapp[1][2]["source_directory"] == "/home/new/mysite"
+    assert webapp[2][2]["path"] == "/home/new/mysite/static"
+    assert ("POST", "/always_on/") in [call[:2] for call in calls]
+    assert "python /home/new/bot.py" in str(calls)
+
+
 @pytest.mark.asyncio
 async def test_get_webapps(client: User) -> None:
     assert isinstance(await client.webapps(), list)
+
+
+@pytest.mark.asyncio
+async def test_request_metrics(client: User) -> None:
+    await client.get_cpu_info()
+
+    record = client.metrics.records[-1]
+
+    assert record.route == "/api/v0/user/{username}/cpu/"
+    assert record.status == 200
+    assert "GET /api/v0/user/{username}/cpu/" in client.stats()["requests"]["routes"]
+    assert "pyaww_requests_total" in client.prometheus()
+
+
+@pytest.mark.asyncio
+async def test_request_hooks(client: User) -> None:
+    events = []
+
+    class Hook(RequestHook):
+        def before_request(self, ctx) -> None:
+            events.append(("before", ctx.route))
+
+        async def after_request(self, ctx) -> None:
+            events.append(("after", ctx.status))
+
+    hook = Hook()
+    client.add_hook(hook)
+
+    try:
+        await client.get_cpu_info()
+    finally:
+        client.remove_hook(hook)
+
+    assert events == [("before", "/api/v0/user/{username}/cpu/"), ("after", 200)]
+
+
+def test_sync_user(client: User) -> None:
+    with SyncUser(username=client.username, auth=client.token) as user:
+        assert isinstance(user.get_cpu_info(), dict)
+
+        session = user.session
+        assert isinstance(session, aiohttp.ClientSession), "the session was proxied"
+        assert isinstance(user.consoles(), list)
+        assert user.session is session, "session was not reused between calls"
+
+        listing = user.listdir(f"/home/{client.username}/")
+        assert isinstance(next(listing), list)
+        listing.close()  # closes the async generator in the event loop
+
+
+def test_sync_proxies() -> None:
+    with SyncUser(username="pyaww", auth="x" * 40) as user:
+        assert user.cache is user.cache, "a new proxy was made for every read"
+        with user.unit_of_work() as unit:
+            assert isinstance(unit._obj, UnitOfWork), "the unit was not proxied"
+
+        events = user.watch(["console"])
+        assert isinstance(events, GeneratorType), "an async generator was returned"
+        events.close()
+        assert SyncUser._unwrap([user.cache]) == [user._obj.cache]
+
+    with pytest.raises(RuntimeError):  # shut down by close
+        user._obj.io_executor.submit(print)
+
+
+@pytest.mark.asyncio
+async def test_deadline(client: User) -> None:
+    with pytest.raises(RequestTimeout):
+        with client.deadline(0):
+            await client.get_cpu_info()
+
+    with client.deadline(30):
+        assert isinstance(await client.get_cpu_info(), dict)
+
+
+@pytest.mark.asyncio
+async def test_deadline_after_slot() -> None:
+    async with User(username="pyaww", auth="x" * 40) as user:
+        with pytest.raises(ValueError):
+            await user.request("GET", "/api/v0/user/pyaww/cpu/", timeout=0)
+
+        acquire = user.scheduler.acquire
+
+        async def slow_acquire(lane=None) -> None:
+            await acquire(lane)
+            time.sleep(0.05)  # the slot is handed out just after the deadline
+
+        user.scheduler.acquire = slow_acquire  # type: ignore
+
+        with pytest.raises(RequestTimeout):
+            with user.deadline(0.01):
+                await user.request("GET", "/api/v0/user/pyaww/cpu/")
+
+
+@pytest.mark.asyncio
+async def test_upload_tree(client: User, started_console: "Console", tmp_path) -> None:
+    for name in ("a.txt", "sub/b.txt", "sub/deeper/c.txt"):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(name)
+
+    remote_dir = f"/home/{client.username}/pyaww-upload-tree-test"
+
+    try:
+        assert await client.upload_tree(str(tmp_path), remote_dir, started_console) == 3
+
+        file = await client.get_file_by_path(f"{remote_dir}/sub/deeper/c.txt")
+        assert await file.read() == "sub/deeper/c.txt"
+    finally:
+        await started_console.send_input(f"rm -rf {remote_dir}")
+
+
+@pytest.mark.asyncio
+async def test_download_tree(
+    client: User, started_console: "Console", tmp_path
+) -> None:
+    remote_dir = f"/home/{client.username}/pyaww-download-tree-test"
+    setup = await started_console.run(
+        f"mkdir -p {remote_dir}/sub && echo a > {remote_dir}/a.txt && echo b > {remote_dir}/sub/b.txt"
+    )
+    assert setup.exit_code == 0, setup.output
+
+    try:
+        assert (
+            await client.download_tree(
+                remote_dir, str(tmp_path / "archive"), started_console
+            )
+            == 2
+        )
+        assert await client.download_tree(remote_dir, str(tmp_path / "files")) == 2
+
+        for directory in ("archive", "files"):
+            assert (tmp_path / directory / "sub" / "b.txt").read_text() == "b\n"
+    finally:
+        await started_console.send_input(f"rm -rf {remote_dir}")
+
+
+@pytest.mark.asyncio
+async def test_download_tree_console_limit(tmp_path) -> None:
+    async def refused(*args, **kwargs) -> NoReturn:
+        raise ConsoleLimit("Console limit reached.")
+
+    async def download_files(remote_dir: str, local_dir: str) -> int:
+        return 2
+
+    async def request(method: str, url: str, **kwargs) -> NoReturn:
+        raise NotFound("Not found.")  # the archive was never packed
+
+    async with User(username="pyaww", auth="x" * 40) as user:
+        user._download_files = download_files  # type: ignore
+        user.request = request  # type: ignore
+        console: Any = SimpleNamespace(run_many=refused)
+
+        assert await user.download_tree("/home/pyaww/a", str(tmp_path), console) == 2